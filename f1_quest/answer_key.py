@@ -4,9 +4,12 @@ import os
 
 from datetime import datetime
 from f1_quest.drivers import Driver, Drivers
-from f1_quest.entries import Entries
+from f1_quest.entries import BOOL_VALUES, FANTASY_PREFIX, Entries
+from f1_quest.entry_scorers import BingoScorer, PickScorer, RankScorer
 from f1_quest.races import Races
-from f1_quest.tables import Table
+from f1_quest.snapshot import get_snapshot_key, read_snapshot, write_snapshot
+from f1_quest.subject_ids import SubjectIds
+from f1_quest.tables import TABLE_BACKENDS, Table, aggregate_tables
 from f1_quest.teams import Teams
 from f1_quest.util import urlify_name
 
@@ -16,11 +19,70 @@ F1_POINTS = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9: 2, 10: 1,
 SPRINT_POINTS = {1: 8, 2: 7, 3: 6, 4: 5, 5: 4, 6: 3, 7: 2, 8: 1, 9: 0, 10: 0, 
              11: 0, 12: 0, 13: 0, 14: 0, 15: 0, 16: 0, 17: 0, 18: 0, 19: 0, 20: 0}
 
+# Largest single integer distance that rank_by_keys will bucket instead of sort
+COUNTING_SORT_LIMIT = 1024
+
+# Answers in scoring_single_answer.csv that must be TRUE or FALSE
+BOOL_SINGLE_ANSWERS = ['Does Theo Pourchaire have a 2022 seat']
+
+
+def rank_by_keys(keyed_entries, points=F1_POINTS):
+    """
+    Rank entries by how close they were, lowest key first, and give out 
+     points by position. Entries with equal keys share the position, and the
+     next key starts after all of them, e.g. 1, 2, 2, 4. Entries past the 
+     last position in points get 0.
+
+    Keyword arguments:
+    keyed_entries -- a list of (key, entry) pairs, the key is a tuple such as
+     (distance, tie breaker distance) compared element by element
+    points -- a dictionary mapping position to points
+
+    Returns:
+    A list of (points, position, key, entry) in ranked order, entries with 
+     equal keys stay in the order they were passed in
+    """
+    if len(keyed_entries) == 0:
+        return []
+
+    # Single small non-negative integer distances can be bucketed in one pass
+    first_key = keyed_entries[0][0]
+    counting_sort = len(first_key) == 1
+    max_distance = 0
+    if counting_sort:
+        for key, entry in keyed_entries:
+            distance = key[0]
+            if len(key) != 1 or type(distance) != int or distance < 0 or \
+                distance > COUNTING_SORT_LIMIT:
+                counting_sort = False
+                break
+            if distance > max_distance:
+                max_distance = distance
+
+    if counting_sort:
+        buckets = [[] for distance in range(max_distance + 1)]
+        for keyed_entry in keyed_entries:
+            buckets[keyed_entry[0][0]].append(keyed_entry)
+        ordered = [keyed_entry for bucket in buckets for keyed_entry in bucket]
+    else:
+        ordered = sorted(keyed_entries, key=lambda keyed_entry: keyed_entry[0])
+
+    ranked = []
+    pos = 1
+    prev_key = None
+    for abs_pos, (key, entry) in enumerate(ordered, start=1):
+        if key != prev_key:
+            pos = abs_pos
+        prev_key = key
+        ranked.append((points.get(pos, 0), pos, key, entry))
+    return ranked
+
 
 class QuestionSummary():
     def __init__(self, data_dir, race, short_name, question, desc=None, answer=None, score=None, 
         entry_var=None, entry_tb=None):
         self.short_name = short_name
+        self.url_name = urlify_name(short_name)
         self.question = question
         self.desc = desc
         self.answer = answer
@@ -30,7 +92,7 @@ class QuestionSummary():
         self.results_table = {}
         self.race = race
 
-        self.results_table_path = os.path.join(data_dir, '_'.join([urlify_name(self.short_name), 'results_table.json']))
+        self.results_table_path = os.path.join(data_dir, '_'.join([self.url_name, 'results_table.json']))
         if os.path.exists(self.results_table_path):
             results_table_pointer = open(self.results_table_path, 'r')
             self.results_table = json.loads(results_table_pointer.read())
@@ -57,9 +119,9 @@ class QuestionSummary():
     def write_results_table(self):
         if self.score is not None:
             for subject in self.score.get_ordered_subjects():
-                if str(str(subject.subject)) not in self.results_table: 
-                    self.results_table[str(subject.subject)] = {}
-                self.results_table[str(subject.subject)][self.race.name] = subject.score
+                if subject.subject_str not in self.results_table: 
+                    self.results_table[subject.subject_str] = {}
+                self.results_table[subject.subject_str][self.race.name] = subject.score
         elif self.answer is not None:
             for subject in self.answer.get_ordered_subjects():
                 for entry in subject.matching_entries:
@@ -74,23 +136,63 @@ class QuestionSummary():
 
 class AnswerKey():
     def __init__(self, data_dir='data', datetime=datetime.now(), 
-        file_name='scoring_single_answer.csv'):
-        self.teams = Teams(data_dir=data_dir)
-        self.drivers = Drivers(data_dir=data_dir)
-        self.entries = Entries  (data_dir=data_dir, drivers=self.drivers)
-        self.races = Races(data_dir=data_dir)
+        file_name='scoring_single_answer.csv', table_backend='list',
+        snapshot_file_name='model_snapshot.pickle', entry_workers=1,
+        state_file_name='season_state.json', 
+        submissions_file_name='submissions.csv'):
+        """
+        Read the data and score every question
+
+        Keyword arguments:
+        data_dir -- the directory with the CSVs and results tables
+        datetime -- score the races completed before this time
+        file_name -- the CSV of answers that are set by hand
+        table_backend -- 'list' for plain Tables or 'array' to keep the 
+         per-entry score tables in NumPy arrays, for very large leagues
+        snapshot_file_name -- the name of the parsed model snapshot in 
+         data_dir, reused while none of the CSVs change and no race is run,
+         or None to always parse the CSVs
+        entry_workers -- the number of processes decoding entries.csv
+        state_file_name -- the name of the season state checkpoint in 
+         data_dir, or None to always replay every race result
+        submissions_file_name -- the name of the CSV in data_dir that 
+         EntrySubmissions watches, its rows are applied after entries.csv, 
+         or None to only read entries.csv
+        """
+        if table_backend not in TABLE_BACKENDS:
+            raise Exception(f"Unknown table backend {table_backend}, expected one of {list(TABLE_BACKENDS)}")
+        self.score_table = TABLE_BACKENDS[table_backend]
         self.datetime = datetime
         self.questions = []
-
-        # Read scoring_single_answer.csv
-        self.single_answer_dict = {}
-        file_path = os.path.join(data_dir, file_name)
-        if not os.path.exists(file_path):
-            raise Exception(f"{file_path} not found, exiting.")
-        with open(file_path, newline='') as file_pointer:
-            file_reader = csv.reader(file_pointer, delimiter=',', quotechar='\'')
-            for row in file_reader:
-                self.single_answer_dict[row[0]] = row[1]
+        # How each question scores a single entry, for EntrySubmissions
+        self.entry_scorers = []
+
+        snapshot = None
+        if snapshot_file_name is not None:
+            snapshot_path = os.path.join(data_dir, snapshot_file_name)
+            # Results are read for every race not after datetime, so the 
+            # snapshot holds until the next race is run
+            races = Races(data_dir=data_dir).list_races()
+            completed_races = [race.text_rep for race in races 
+                if race.datetime <= datetime]
+            input_file_names = ['teams.csv', 'drivers.csv', 'entries.csv', 
+                'races.csv', 'race_results.csv', file_name]
+            if submissions_file_name is not None and os.path.exists(
+                os.path.join(data_dir, submissions_file_name)):
+                input_file_names.append(submissions_file_name)
+            snapshot_key = get_snapshot_key(data_dir, input_file_names, 
+                completed_races)
+            snapshot = read_snapshot(snapshot_path, snapshot_key)
+        if snapshot is not None:
+            (self.teams, self.drivers, self.entries, self.races, 
+                self.subject_ids, self.single_answer_dict) = snapshot
+        else:
+            self.read_model(data_dir, file_name, datetime, entry_workers,
+                state_file_name, submissions_file_name)
+            if snapshot_file_name is not None:
+                write_snapshot(snapshot_path, snapshot_key, (self.teams, 
+                    self.drivers, self.entries, self.races, self.subject_ids,
+                    self.single_answer_dict))
 
         current_race = self.races.list_races_before(datetime)[-1]
         next_race = None
@@ -99,10 +201,6 @@ class AnswerKey():
                 next_race = race
                 break
 
-        # This needs to happen after the scoring_single_answer because of SPA half points
-        self.races.read_results(data_dir=data_dir, drivers=self.drivers, 
-            teams=self.teams, datetime=datetime)
-
         answer, score = self.team_fifth()
         self.questions.append(QuestionSummary(data_dir, current_race, 'Q1: Team Fifth',
             'Q1: Which team will finish fifth in the championship?',
@@ -179,7 +277,7 @@ class AnswerKey():
             'Q11: Which driver that starts the race in Saudi Arabia will be the first one out?',
             desc='Tie breaker: What WDC position will that driver start the race in?\n\nTBD after Saudi Arabian GP is run',
             answer=answer, score=score, entry_var='saudi_first_retirement_response',
-            entry_tb='saudi_first_retirement_tiebrekaer'))
+            entry_tb='saudi_first_retirement_tiebreaker'))
 
         answer, score = self.q3_appearances()
         self.questions.append(QuestionSummary(data_dir, current_race, 
@@ -188,34 +286,33 @@ class AnswerKey():
             answer=answer, score=score, entry_var='driver_q3s'))
         
         
-        fantasy_scores = {}
+        fantasy_score_tables = []
         qnum = 13
         for driver in self.drivers.list_all_drivers():
             if driver.started_season:
-                answer, score = self.driver_points_by_race(driver.name, f"fantasy_{driver.last_name}")
+                answer, score = self.driver_points_by_race(driver.name, FANTASY_PREFIX + driver.last_name)
                 self.questions.append(QuestionSummary(data_dir, current_race, 
                     f"Q{qnum}: Fantasy {driver.last_name}",
                     f"Q{qnum}: Pick a race for {driver.first_name} {driver.last_name} and get the points based on their finishing position",
-                    answer=answer, score=score, entry_var=f"fantasy_{driver.last_name}"))
-                for entry in score.subjects:
-                    if entry.subject in fantasy_scores:
-                        fantasy_scores[entry.subject] += entry.score
-                    else:
-                        fantasy_scores[entry.subject] = entry.score
+                    answer=answer, score=score, entry_var=FANTASY_PREFIX + driver.last_name))
+                fantasy_score_tables.append(score)
                 qnum = qnum + 1
         
         next_race_drivers = {}
-        for entry in self.entries.list_entries():
-            for answer in entry.__dict__:
-                  if answer.startswith('fantasy_') and entry.__dict__[answer] == str(next_race):
-                        driver_name = answer.lstrip('fantasy_')
-                        next_race_drivers[entry] = driver_name
-        fantasy_totals = Table("Final Score", "Entry", "Points", int, value_label="Next Race Driver",
+        store = self.entries.store
+        for driver_name, fantasy_var in zip(store.decoder.fantasy_names, 
+            store.fantasy_vars):
+            race_picks = store.get_column(fantasy_var)
+            for entry in self.entries.list_entries():
+                if next_race is not None and \
+                    race_picks[entry.index] == next_race.subject_id:
+                    next_race_drivers[entry] = driver_name
+        fantasy_totals = aggregate_tables(fantasy_score_tables, "Final Score", 
+            "Entry", "Points", int, value_label="Next Race Driver",
             show_values=True, show_entries=False)
-        for entry in fantasy_scores:
-            entry_row = fantasy_totals.add_subject(fantasy_scores[entry], entry)
-            if entry in next_race_drivers:
-                entry_row.set_value(next_race_drivers[entry])
+        for entry_row in fantasy_totals.subjects:
+            if entry_row.subject in next_race_drivers:
+                entry_row.set_value(next_race_drivers[entry_row.subject])
         fantasy_question = QuestionSummary(data_dir, current_race,
             'Fantasy Driver Totals', 
             'Totals for every entry across all drivers', score=fantasy_totals)
@@ -262,6 +359,53 @@ class AnswerKey():
                 'bingo_schumacher_response']))))
 
 
+    def read_model(self, data_dir, file_name, datetime, entry_workers=1,
+        state_file_name='season_state.json', 
+        submissions_file_name='submissions.csv'):
+        """
+        Parse the CSVs into teams, drivers, races and entries, numbering them 
+         all and resolving the entries' answers to those numbers, then apply
+         the race results completed before datetime
+
+        Keyword arguments:
+        data_dir -- the directory with the CSVs
+        file_name -- the CSV of answers that are set by hand
+        datetime -- read the races completed before this time
+        entry_workers -- the number of processes decoding entries.csv
+        state_file_name -- the name of the season state checkpoint in 
+         data_dir, or None to always replay every race result
+        submissions_file_name -- the name of the submissions CSV in data_dir
+         to apply after entries.csv, or None
+        """
+        self.teams = Teams(data_dir=data_dir)
+        self.drivers = Drivers(data_dir=data_dir)
+        self.races = Races(data_dir=data_dir)
+        self.subject_ids = SubjectIds()
+        self.subject_ids.add_subjects(self.drivers.list_all_drivers())
+        self.subject_ids.add_subjects(self.teams.list_all_teams())
+        self.subject_ids.add_subjects(self.races.list_races())
+        self.entries = Entries(data_dir=data_dir, drivers=self.drivers, 
+            subject_ids=self.subject_ids, workers=entry_workers, 
+            submissions_file_name=submissions_file_name)
+
+        # Read scoring_single_answer.csv
+        self.single_answer_dict = {}
+        file_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(file_path):
+            raise Exception(f"{file_path} not found, exiting.")
+        with open(file_path, newline='') as file_pointer:
+            file_reader = csv.reader(file_pointer, delimiter=',', quotechar='\'')
+            for row in file_reader:
+                if row[0] in BOOL_SINGLE_ANSWERS and row[1] not in BOOL_VALUES:
+                    raise Exception(f"{file_path}: {row[0]} is {row[1]!r}, expected TRUE or FALSE")
+                self.single_answer_dict[row[0]] = row[1]
+
+        # This needs to happen after the scoring_single_answer because of SPA half points
+        self.races.read_results(data_dir=data_dir, drivers=self.drivers, 
+            teams=self.teams, datetime=datetime, 
+            state_file_name=state_file_name)
+
+
     def __str__(self):
         """
         This aggressively long method pulls together all of the questions and 
@@ -281,11 +425,52 @@ class AnswerKey():
         return '\n'.join(strings)
 
 
+    def get_answer_points(self):
+        """
+        Returns:
+        A dict of entry_var to (points_by_key, missing_points) for the 
+         questions where an answer is worth set points, for 
+         PickCounts.to_dict
+        """
+        answer_points = {}
+        for scorer in self.entry_scorers:
+            answer_points.update(scorer.get_answer_points())
+        return answer_points
+
+
+    def add_entry_rows(self, score_table, entries, points, values=None, 
+        update_entry_score=True):
+        """
+        Add a row per entry to an entry score table in one go, labelling the
+         rows from the store's entry_name column
+
+        Keyword arguments:
+        score_table -- the Table to add the rows to
+        entries -- the Entry views, one per row
+        points -- the score of each row, in the same order as entries
+        values -- the value of each row, or None to leave them blank
+        update_entry_score -- add the points to each entry's score
+        """
+        store = self.entries.store
+        entry_indexes = [entry.index for entry in entries]
+        entry_names = store.entry_names
+        entry_ids = store.entry_ids
+        score_table.add_subjects(points, entries, [entry_names[index] for 
+            index in entry_indexes], values, [entry_ids[index] for index in 
+            entry_indexes])
+        if update_entry_score:
+            store_scores = store.scores
+            for entry, entry_points in zip(entries, points):
+                store_scores[entry.index] += entry_points
+
+
     def get_overall_standings(self):
-        score = Table("Overall Standings", "Entry", "Points", int, 
+        score = self.score_table("Overall Standings", "Entry", "Points", int, 
             show_values=False, show_entries=False)
-        for entry in self.entries.list_entries():
-            score.add_subject(entry.score, entry)
+        entries = self.entries.list_entries()
+        store_scores = self.entries.store.scores
+        self.add_entry_rows(score, entries, [store_scores[entry.index] for 
+            entry in entries], update_entry_score=False)
         return score
         
     def map_table_to_score(self, table, score_map, tie_breaker_pos=None, 
@@ -327,16 +512,51 @@ class AnswerKey():
                 if tie_breaker_pos is not None and pos == tie_breaker_pos \
                     and tie_breaker is None:
                     tie_breaker = row.score                    
-                if str(row.subject) not in answer_key:
-                    answer_key[str(row.subject)] = pts
+                if row.subject_str not in answer_key:
+                    answer_key[row.subject_str] = pts
                     if tie_breaker_pos is None:
                         row.set_value(pts)
                         if update_entry_score:
                             for entry in row.matching_entries:
                                 entry.add_points(pts)
 
+        if update_entry_score:
+            points_by_id = {}
+            for subject_str, pts in answer_key.items():
+                subject_id = self.subject_ids.get_id(subject_str)
+                if subject_id is not None:
+                    points_by_id[subject_id] = pts
+            self.entry_scorers.append(PickScorer(table.entry_var, 
+                points_by_id))
         return (answer_key, tie_breaker)
 
+
+    def score_by_rank(self, score_table, keyed_entries, get_key, 
+        value_var=None):
+        """
+        Rank entries with rank_by_keys, add them to the score table and give 
+         each entry its points
+
+        Keyword arguments:
+        score_table -- the Table to add the entries to
+        keyed_entries -- a list of (key, entry) pairs, lowest key is best
+        get_key -- a function of an Entry returning the key it was given, or 
+         None if it was left out, for scoring submitted entries
+        value_var -- the variable in the Entry to show as the row value
+
+        Returns:
+        The score table
+        """
+        self.entry_scorers.append(RankScorer(get_key, F1_POINTS))
+        ranked = rank_by_keys(keyed_entries)
+        entries = [entry for points, pos, key, entry in ranked]
+        values = None
+        if value_var is not None:
+            values = [entry.get_response(value_var) for entry in entries]
+        self.add_entry_rows(score_table, entries, [points for points, pos, key, 
+            entry in ranked], values)
+        return score_table
+
     
     def tie_breaker_scoring(self, table_name, score_map, source_table, 
         tie_breaker, tie_breaker_var):
@@ -356,38 +576,32 @@ class AnswerKey():
         Returns:
         A Table with the entries as subjects and scored values as the score
         """
-        entry_table = Table(table_name, "Entry", "Points", int, 
+        entry_table = self.score_table(table_name, "Entry", "Points", int, 
             show_values=False, show_entries=False)
 
-        # Group entries by score in the score map
-        score_dict = {}
+        # Key entries by the points their answer is worth, then tie breaker
+        keyed_entries = []
         entry_placed_dict = {}
+        points_by_answer = {}
         for pos, pts in score_map.items():
             rows = source_table.get_subjects_by_pos(pos)
             for row in rows:
+                points_by_answer.setdefault(row.subject_str, pts)
                 for entry in row.matching_entries:
                     if entry.entry_name in entry_placed_dict:
                         continue
                     entry_placed_dict[entry.entry_name] = True
-                    entry_tb_score = abs(entry.__dict__[tie_breaker_var] - tie_breaker)
-                    if pts not in score_dict:
-                        score_dict[pts] = {}
-                    if entry_tb_score not in score_dict[pts]:
-                        score_dict[pts][entry_tb_score] = [entry]
-                    else:
-                        score_dict[pts][entry_tb_score].append(entry)
-
-        # Score grouped entries by tie breaker value
-        entry_pos = 1
-        abs_pos = 1
-        for score in reversed(sorted(score_dict.keys())): 
-            for tb_score in sorted(score_dict[score].keys()):
-                for entry in score_dict[score][tb_score]:
-                    entry_table.add_subject(F1_POINTS[entry_pos], entry)
-                    entry.add_points(F1_POINTS[entry_pos])
-                    abs_pos += 1
-                entry_pos = abs_pos
-        return entry_table
+                    entry_tb_score = abs(entry.get_response(tie_breaker_var) - tie_breaker)
+                    keyed_entries.append(((-pts, entry_tb_score), entry))
+
+        def get_key(entry):
+            answer = entry.get_response(source_table.entry_var)
+            if answer not in points_by_answer:
+                return None
+            return (-points_by_answer[answer], abs(entry.get_response(
+                tie_breaker_var) - tie_breaker))
+
+        return self.score_by_rank(entry_table, keyed_entries, get_key)
 
 
     def team_fifth(self):
@@ -487,10 +701,12 @@ class AnswerKey():
         Returns:
         A list of driver names that have appeared on the podium
         """
-        podium_winners = [driver.entry_rep for driver in self.drivers.list_all_drivers() if driver.podiums > 0]
+        podiums = self.races.season_results.count_by_driver('classification',
+            1, 3)
+        podium_winners = [driver.subject_id for driver in self.drivers.list_all_drivers() if podiums[driver.name] > 0]
         podium_winners_table = Table('Podium Winners', 'Driver', 'Podium Finishes', int)
         for driver in self.drivers.list_all_drivers():
-            podium_winners_table.add_subject(driver.podiums, driver)
+            podium_winners_table.add_subject(podiums[driver.name], driver)
         score_map = {}
         for i in range(1, len(podium_winners)+1):
             score_map[i] = 5
@@ -499,27 +715,24 @@ class AnswerKey():
         podium_winners_table.add_entries(self.entries, 'driver_podium_response')
         answer_key, tie_breaker = self.map_table_to_score(podium_winners_table, score_map)
 
-        score_table = Table('Final Scores', 'Entry', 'Points', int, 
+        # Add five for each correct pick and subtract 3 for each incorrect pick
+        pick_masks = self.entries.store.get_pick_masks('driver_podium_response')
+        pick_points = pick_masks.score({driver_id: 5 for driver_id in 
+            podium_winners}, missing_points=-3)
+        # Subtract 3 for each missed podium winner
+        started_winners = [driver_id for driver_id in podium_winners if 
+            self.subject_ids.get_subject(driver_id).started_season]
+        picked_winners = pick_masks.count(pick_masks.get_mask(started_winners))
+        self.entry_scorers.append(PickScorer('driver_podium_response', {
+            driver_id: 5 for driver_id in podium_winners}, missing_points=-3,
+            missed_ids=started_winners, missed_points=-3))
+
+        score_table = self.score_table('Final Scores', 'Entry', 'Points', int, 
             show_values=False, show_entries=False)
-        for entry in self.entries.list_entries():
-            entry_points = 0
-            drivers_counted = 0
-            for driver in entry.driver_podium_response:
-                # Add five for each correct pick
-                if driver in podium_winners:
-                    entry_points += 5
-                # Subtract 3 for each incorrect pick
-                else:
-                    entry_points -= 3
-            for driver in podium_winners:
-                # Subtract 3 for each missed podium winner
-                if driver not in entry.driver_podium_response:
-                    driver_obj = self.drivers.get_driver_by_entry_rep(driver)
-                    if driver_obj.started_season:
-                        entry_points -= 3
-            
-            score_table.add_subject(entry_points, entry)
-            entry.add_points(entry_points)
+        entries = self.entries.list_entries()
+        self.add_entry_rows(score_table, entries, [pick_points[entry.index] - 
+            3 * (len(started_winners) - picked_winners[entry.index]) for 
+            entry in entries])
             
         return (podium_winners_table, score_table)
         
@@ -550,7 +763,8 @@ class AnswerKey():
         Returns:
         A dictionary mapping driver names to point value if chosen
         """
-        q3s_table = self.teams.get_q3_appearances_table(self.drivers)
+        q3s_table = self.teams.get_q3_appearances_table(self.drivers, 
+            self.races.season_results.count_by_driver('qpos', 1, 10))
         q3s_table.add_entries(self.entries, 'driver_q3s')
         score_map = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4,
             9: 2, 10: 1, 11: 0, 12: 0}
@@ -568,10 +782,10 @@ class AnswerKey():
         The table representing the points standings after the first six races
         """
         completed_races = self.races.list_races_before(self.datetime)
-        points_table = completed_races[-1].post_race_driver_points
+        points_table = self.races.get_standings_after(completed_races[-1])
         # TODO: Includes one sprint race, should calculate but later...
         if len(completed_races) >= 7:
-            points_table = completed_races[6].post_race_driver_points
+            points_table = self.races.get_standings_after(completed_races[6])
         points_table.show_values = False
         points_table.show_entries = False
 
@@ -595,37 +809,30 @@ class AnswerKey():
         for driver_list, scores in zip(results, scores):
             for driver in driver_list:
                 # In case of ties
-                if driver.subject.entry_rep in drivers_placed:
+                if driver.subject.subject_id in drivers_placed:
                     continue
-                drivers_placed.append(driver.subject.entry_rep)
-                driver_values[driver.subject.entry_rep] = scores
+                drivers_placed.append(driver.subject.subject_id)
+                driver_values[driver.subject.subject_id] = scores
 
-        score_table = Table("Final Scores", "Entry", "Points", int, 
-            show_values=False, entry_label="Picks")
-        for entry in self.entries.list_entries():
-            entry_score = 0
+        points_by_position = [{} for pos in range(6)]
+        for driver_id, scores in driver_values.items():
             for pos in range(6):
-                if entry.driver_six_after_six[pos] in driver_values:
-                    entry_score += driver_values[entry.driver_six_after_six[pos]][pos+1]
-            entry_row = score_table.add_subject(entry_score, entry)
-            entry.add_points(entry_score)
+                points_by_position[pos][driver_id] = scores[pos+1]
+        entry_scores = self.entries.store.score_picks('driver_six_after_six',
+            points_by_position)
+        self.entry_scorers.append(PickScorer('driver_six_after_six', 
+            points_by_position))
+
+        score_table = self.score_table("Final Scores", "Entry", "Points", int, 
+            show_values=False, entry_label="Picks")
+        entries = self.entries.list_entries()
+        self.add_entry_rows(score_table, entries, [entry_scores[entry.index] 
+            for entry in entries])
+        for entry_row, entry in zip(score_table.subjects, entries):
             entry_row.matching_entries = entry.driver_six_after_six
         return (points_table, score_table)
 
 
-    def break_driver_tie(self, drivers):
-        win_dict = {}
-        for driver in drivers:
-            if driver.subject.wins in win_dict:
-                win_dict[driver.subject.wins].append(driver)
-            else:
-                win_dict[driver.subject.wins] = [driver]
-        result = []
-        for win_count in reversed(sorted(win_dict.keys())):
-            result.append(win_dict[win_count])
-        return result
-
-
     def uninterrupted_leader(self):
         """
         Answer the question "At which race will the champion move to the top of
@@ -636,53 +843,12 @@ class AnswerKey():
         A set with the race at which the current leader became the leader and
          the race at which the second place driver became second place
         """
-        completed_races = self.races.list_races_before(self.datetime)
-        places_dict = {
-            1: {
-                'driver': None,
-                'race': None
-            },
-            2: {
-                'driver': None,
-                'race': None
-            }
-        }
-        for race in completed_races:
-            first_name = ''
-            second_name = ''
-            # Determine first
-            first_drivers = race.post_race_driver_points.get_subjects_by_pos(1)
-            # Use tie breaker
-            if len(first_drivers) > 1:
-                sorted_drivers = self.break_driver_tie(first_drivers)
-                if len(sorted_drivers[0]) > 1:
-                    first_name = "Tie: " + ", ".join(sorted_drivers[0])
-                    second_name = "Tie: " + ", ".join(sorted_drivers[0])
-                else:
-                    first_name = sorted_drivers[0][0].subject.name
-                    if len(sorted_drivers[1]) > 1:
-                        second_name = "Tie: " + ", ".join(sorted_drivers[1])
-                    else:
-                        second_name = sorted_drivers[1][0].subject.name
-            else:
-                first_name = first_drivers[0].subject.name
-                second_drivers = race.post_race_driver_points.get_subjects_by_pos(2)
-                # Use tie breaker
-                if len(second_drivers) > 1:
-                    sorted_drivers = self.break_driver_tie(second_drivers)
-                    if len(sorted_drivers[0]) > 1:
-                        second_name = "Tie: " + ", ".join(sorted_drivers[0])
-                    else:
-                        second_name = sorted_drivers[0][0].subject.name
-                else:
-                    second_name = second_drivers[0].subject.name
-
-            if places_dict[1]['driver'] != first_name:
-                places_dict[1]['driver'] = first_name
-                places_dict[1]['race'] = race
-            if places_dict[2]['driver'] != second_name:
-                places_dict[2]['driver'] = second_name
-                places_dict[2]['race'] = race    
+        # Championship positions already split drivers level on points by wins
+        timeline = self.races.get_timeline()
+        places_dict = {}
+        for pos in [1, 2]:
+            race_index = timeline.get_first_race_held(pos)
+            places_dict[pos] = {'race': timeline.race_list[race_index]}
 
         """
         Once the race is determined, build a dictionary of race to distance 
@@ -690,17 +856,17 @@ class AnswerKey():
         """
         #points_list = [18, 15, 12, 10, 8, 6, 4, 2, 1]
         for pos, pos_dict in places_dict.items():
-            pos_dict['values'] = {str(pos_dict['race']): 0}
+            pos_dict['values'] = {pos_dict['race'].subject_id: 0}
             before = self.races.list_races_before(pos_dict['race'].datetime)
             after = self.races.list_races_after(pos_dict['race'].datetime)
             before_count = len(before) #min(len(before), len(points_list))
             after_count = len(after) #min(len(after), len(points_list))
             for race, points in zip(list(reversed(before))[0:before_count+1], 
                 range(1, before_count+1)): #points_list[0:before_count]):
-                pos_dict['values'][str(race)] = points
+                pos_dict['values'][race.subject_id] = points
             for race, points in zip(after[0:after_count+1], 
                 range(1, after_count+1)): #points_list[0:after_count]):
-                pos_dict['values'][str(race)] = points
+                pos_dict['values'][race.subject_id] = points
 
         table = Table('Uninterupted Leader', 'Race', 'Position Locked', str, 
             show_values=False, sort=None)
@@ -714,28 +880,25 @@ class AnswerKey():
         table.add_entries(self.entries, 'driver_unbroken_lead_response', 
             'driver_unbroken_lead_tiebreaker')
 
-        # Build a dictionary of entries by distance from leader and second
-        sorting_dict = {}
+        # Rank entries by distance from the leader's race, then second's
+        leader_picks = self.entries.store.get_column(
+            'driver_unbroken_lead_response')
+        second_picks = self.entries.store.get_column(
+            'driver_unbroken_lead_tiebreaker')
+        keyed_entries = []
         for entry in self.entries.list_entries():
-            off_by = places_dict[1]['values'][entry.driver_unbroken_lead_response]
-            tie_breaker = places_dict[2]['values'][entry.driver_unbroken_lead_tiebreaker]
-            if off_by not in sorting_dict:
-                sorting_dict[off_by] = {}
-            if tie_breaker not in sorting_dict[off_by]:
-                sorting_dict[off_by][tie_breaker] = [entry]
-            else:
-                sorting_dict[off_by][tie_breaker].append(entry)
+            off_by = places_dict[1]['values'][leader_picks[entry.index]]
+            tie_breaker = places_dict[2]['values'][second_picks[entry.index]]
+            keyed_entries.append(((off_by, tie_breaker), entry))
+
+        def get_key(entry):
+            return (places_dict[1]['values'][entry.get_response_ids(
+                'driver_unbroken_lead_response')], places_dict[2]['values'][
+                entry.get_response_ids('driver_unbroken_lead_tiebreaker')])
 
-        # Assign scores based on distance from answer for leader and second
-        scores_assigned = 1
-        scoring = Table('Final Scores', 'Entry', 'Points', int, 
+        scoring = self.score_table('Final Scores', 'Entry', 'Points', int, 
             show_values=False, show_entries=False)
-        for off_by in sorted(sorting_dict.keys()):
-            for tie_breaker in sorted(sorting_dict[off_by].keys()):
-                for entry in sorting_dict[off_by][tie_breaker]:
-                    scoring.add_subject(F1_POINTS[scores_assigned], entry)
-                    entry.add_points(F1_POINTS[scores_assigned])
-                scores_assigned += len(sorting_dict[off_by][tie_breaker])
+        self.score_by_rank(scoring, keyed_entries, get_key)
         return (table, scoring)
 
 
@@ -749,23 +912,24 @@ class AnswerKey():
         """
         race_dict = {}
         for race in self.races.race_list:
-            race_dict[str(race)] = race.retirements * -5
+            race_dict[race.subject_id] = race.retirements * -5
 
         table = Table('Retirements', 'Race', 'Retirements', int, sort=None)
         for race in self.races.list_races():
             race_row = table.add_subject(race.retirements, race)
-            race_row.value = race_dict[str(race)]
+            race_row.value = race_dict[race.subject_id]
         table.add_entries(self.entries, 'driver_race_retirements_response')
 
-        scores = Table('Final Score', 'Entry', 'Points', int, show_values=False, 
+        entry_scores = self.entries.store.get_pick_masks(
+            'driver_race_retirements_response').score(race_dict)
+        self.entry_scorers.append(PickScorer(
+            'driver_race_retirements_response', race_dict))
+
+        scores = self.score_table('Final Score', 'Entry', 'Points', int, show_values=False, 
             show_entries=False)
-        for entry in self.entries.list_entries():
-            entry_score = 0
-            for race in entry.driver_race_retirements_response:
-                if type(race_dict[race]) == int:
-                    entry_score += race_dict[race]
-            scores.add_subject(entry_score, entry)
-            entry.add_points(entry_score)
+        entries = self.entries.list_entries()
+        self.add_entry_rows(scores, entries, [entry_scores[entry.index] for 
+            entry in entries])
         return (table, scores)
 
 
@@ -795,23 +959,23 @@ class AnswerKey():
         
         table = Table(f"{driver_short_name} Points", "Race", "Points", int, 
             show_values=False, sort=None)
+        points_by_race_id = {}
         for race in self.races.list_races():
             if race.name in race_dict:
                 table.add_subject(race_dict[race.name], race)
+                points_by_race_id[race.subject_id] = race_dict[race.name]
             else:
                 table.add_subject(0, race)
         table.add_entries(self.entries, entry_var)
+        entry_scores = self.entries.store.score_picks(entry_var, 
+            points_by_race_id)
+        self.entry_scorers.append(PickScorer(entry_var, points_by_race_id))
 
-        scores = Table("Final Score", "Entry", "Points", int, 
+        scores = self.score_table("Final Score", "Entry", "Points", int, 
             show_values=False, show_entries=False)
-        for entry in self.entries.list_entries():
-            entry_score = 0
-            race_name = str(entry.__dict__[entry_var])
-            race = self.races.get_race_by_str(race_name)
-            if race.name in race_dict:
-                entry_score = race_dict[race.name]
-            scores.add_subject(entry_score, entry)
-            entry.add_points(entry_score)
+        entries = self.entries.list_entries()
+        self.add_entry_rows(scores, entries, [entry_scores[entry.index] for 
+            entry in entries])
         
         return (table, scores)
 
@@ -829,33 +993,25 @@ class AnswerKey():
         table = Table("Fewest on lead lap", 'Race', 'On Lead Lap', int, 
             show_values=False, show_entries=False, sort=None)
         for race in self.races.list_races_before(self.datetime):
-            drivers_on_lead_lap = 0
-            for driver in self.drivers.driver_list:
-                if race.name in driver.races:
-                    driver_race_result = driver.races[race.name]
-                    if driver_race_result.laps == race.laps:
-                        drivers_on_lead_lap += 1
+            drivers_on_lead_lap = self.races.season_results.count_on_lead_lap(
+                race)
             table.add_subject(drivers_on_lead_lap, race)
             if drivers_on_lead_lap < fewest_on_lead_lap:
                 fewest_on_lead_lap = drivers_on_lead_lap
         
-        entry_scores = {}
+        guesses = self.entries.store.get_column(
+            'race_fewest_on_lead_lap_response')
+        keyed_entries = []
         for entry in self.entries.list_entries():
-            entry_val = abs(fewest_on_lead_lap - entry.race_fewest_on_lead_lap_response)
-            if entry_val not in entry_scores:
-                entry_scores[entry_val] = [entry]
-            else:
-                entry_scores[entry_val].append(entry)
+            entry_val = abs(fewest_on_lead_lap - guesses[entry.index])
+            keyed_entries.append(((entry_val,), entry))
         
-        score = Table(f"Final Scores: Correct Answer {fewest_on_lead_lap}", 
+        score = self.score_table(f"Final Scores: Correct Answer {fewest_on_lead_lap}", 
             'Entry', 'Points', int, show_entries=False, value_label="Guess")
-        pos = 1
-        for entry_score in sorted(entry_scores.keys()):
-            for entry in entry_scores[entry_score]:
-                entry_row = score.add_subject(F1_POINTS[pos], entry)
-                entry.add_points(F1_POINTS[pos])
-                entry_row.value = entry.race_fewest_on_lead_lap_response
-            pos += len(entry_scores[entry_score])
+        self.score_by_rank(score, keyed_entries, lambda entry: (abs(
+            fewest_on_lead_lap - entry.get_response(
+            'race_fewest_on_lead_lap_response')),), 
+            value_var='race_fewest_on_lead_lap_response')
         
         return (table, score)
 
@@ -878,7 +1034,7 @@ class AnswerKey():
         driver_order = json.loads(first_retirement)
         race = self.races.get_race_by_name('Saudi Arabia')
         # Race has not occurred yet
-        if race is None or race.post_race_driver_points is None:
+        if race is None or self.races.get_timeline().get_race_index(race) is None:
             return (None, None)
         wdc_pos = 16
         
@@ -893,51 +1049,41 @@ class AnswerKey():
         table.add_entries(self.entries, 'saudi_first_retirement_response',
                           'saudi_first_retirement_tiebreaker')
         
-        entry_scores = {}
+        tie_breakers = self.entries.store.get_column(
+            'saudi_first_retirement_tiebreaker')
+        keyed_entries = []
         for entry in self.entries.list_entries():
-            entry_val = driver_scores[entry.saudi_first_retirement_response]
-            if entry_val not in entry_scores:
-                entry_scores[entry_val] = {}
-            tie_breaker_val = abs(wdc_pos-entry.saudi_first_retirement_tiebreaker)
-            if tie_breaker_val not in entry_scores[entry_val]:
-                entry_scores[entry_val][tie_breaker_val] = [entry]
-            else:
-                 entry_scores[entry_val][tie_breaker_val].append(entry)
+            entry_val = driver_scores[entry.get_response(
+                'saudi_first_retirement_response')]
+            tie_breaker_val = abs(wdc_pos-tie_breakers[entry.index])
+            keyed_entries.append(((entry_val, tie_breaker_val), entry))
         
-        score = Table(f"Final Scores: Correct Answer Nicholas Latifi (tiebreaker: {wdc_pos})", 
+        score = self.score_table(f"Final Scores: Correct Answer Nicholas Latifi (tiebreaker: {wdc_pos})", 
             'Entry', 'Points', int, show_values=False, show_entries=False, value_label="Tiebreaker Guess")
-        pos = 1
-        for entry_score in sorted(entry_scores.keys()):
-            for tie_breaker in sorted(entry_scores[entry_score]):
-                for entry in entry_scores[entry_score][tie_breaker]:
-                    entry_row = score.add_subject(F1_POINTS[pos], entry)
-                    entry.add_points(F1_POINTS[pos])
-                    entry_row.value = entry.saudi_first_retirement_tiebreaker
-                pos += len(entry_scores[entry_score][tie_breaker])
+        self.score_by_rank(score, keyed_entries, lambda entry: (driver_scores[
+            entry.get_response('saudi_first_retirement_response')], abs(
+            wdc_pos - entry.get_response('saudi_first_retirement_tiebreaker'))),
+            value_var='saudi_first_retirement_tiebreaker')
         
         return (table, score)
 
 
     def btn_subscore_table(self, table_name, correct_score, entry_var):
-        entry_dict = {}
+        guesses = self.entries.store.get_column(entry_var)
+        keyed_entries = []
         for entry in self.entries.list_entries():
-            entry_diff = abs(correct_score - entry.__dict__[entry_var])
-            if entry_diff not in entry_dict:
-                entry_dict[entry_diff] = [entry]
-            else:
-                entry_dict[entry_diff].append(entry)
-        from pprint import pprint
+            entry_diff = abs(correct_score - guesses[entry.index])
+            keyed_entries.append(((entry_diff,), entry))
 
-        score = Table(f"{table_name} (Correct Answer: {correct_score})", 
+        score = self.score_table(f"{table_name} (Correct Answer: {correct_score})", 
             'Entry', "Score", int, value_label='Miss Amount', sort='descending',
             show_entries=False)
-        pos = 1
-        for entry_diff in sorted(entry_dict.keys()):
-            for entry in entry_dict[entry_diff]:
-                entry_row = score.add_subject(F1_POINTS[pos], entry)
-                entry.add_points(F1_POINTS[pos])
-                entry_row.value = entry_diff
-            pos += len(entry_dict[entry_diff])
+        ranked = rank_by_keys(keyed_entries)
+        self.add_entry_rows(score, [entry for points, pos, key, entry in 
+            ranked], [points for points, pos, key, entry in ranked], 
+            [key[0] for points, pos, key, entry in ranked])
+        self.entry_scorers.append(RankScorer(lambda entry: (abs(
+            correct_score - entry.get_response(entry_var)),), F1_POINTS))
         return score
 
     def unique_race_winners(self):
@@ -989,33 +1135,47 @@ class AnswerKey():
 
 
     def mini_bingo_sub(self, table_name, correct_answer, entry_var):
+        """
+        Score one Mini-Bingo question
+
+        Keyword arguments:
+        table_name -- the question, for the table name
+        correct_answer -- 'TRUE' or 'FALSE'
+        entry_var -- the variable in the Entry with the guess
+
+        Returns:
+        A tuple of the correct answer and the score Table
+        """
+        if correct_answer not in BOOL_VALUES:
+            raise Exception(f"Mini Bingo answer for {entry_var} is {correct_answer!r}, expected TRUE or FALSE")
         correct_val = 1
         incorrect_val = -3
         if correct_answer == 'TRUE':
             correct_val = 5
 
-        score = Table(f"Mini Bingo, {table_name} Correct Answer {correct_answer}", 
+        score = self.score_table(f"Mini Bingo, {table_name} Correct Answer {correct_answer}", 
             'Entry', 'Guess', str, value_label="Points", sort='ascending',
             show_entries=False)
-        for entry in self.entries.list_entries():
-            entry_row = score.add_subject(entry.__dict__[entry_var], entry)
-            if entry.__dict__[entry_var] == correct_answer:
-                entry_row.value = correct_val
-            else:
-                entry_row.value = incorrect_val
-        return score
+        guesses = self.entries.store.get_column(entry_var)
+        correct_guess = BOOL_VALUES.get(correct_answer)
+        entries = self.entries.list_entries()
+        self.add_entry_rows(score, entries, [entry.get_response(entry_var) for 
+            entry in entries], [correct_val if guesses[entry.index] == 
+            correct_guess else incorrect_val for entry in entries], 
+            update_entry_score=False)
+        return (correct_answer, score)
 
     def pourchaire_seat(self):
         """
         Answer the question "Theo Pourchaire gets a 2022 F1 seat."
 
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         answer = self.single_answer_dict['Does Theo Pourchaire have a 2022 seat']
-        score = self.mini_bingo_sub('Theo Pourchaire gets a 2022 F1 seat.', answer, 
+        return self.mini_bingo_sub('Theo Pourchaire gets a 2022 F1 seat.', answer, 
             'bingo_pourchaire_response')
-        return score
 
 
     def yuki_gets_a_podium(self):
@@ -1023,7 +1183,8 @@ class AnswerKey():
         Answer the qeustion "Yuki Norris gets a podium."
 
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         yuki = self.drivers.get_driver_by_short_name('Tsunoda, Yuki')
         if yuki is None:
@@ -1031,9 +1192,8 @@ class AnswerKey():
         answer = 'FALSE'
         if yuki.podiums > 0:
             answer = 'TRUE'
-        score = self.mini_bingo_sub('Yuki Tsunoda gets a podium.', answer, 
+        return self.mini_bingo_sub('Yuki Tsunoda gets a podium.', answer, 
             'bingo_yuki_response')
-        return score
 
 
     def haas_above_tenth(self):
@@ -1041,7 +1201,8 @@ class AnswerKey():
         Answer the question "Haas do not finish 10th."
 
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         table = self.teams.get_points_table()
         tenth = table.get_subjects_by_pos(10)
@@ -1049,9 +1210,8 @@ class AnswerKey():
         for row in tenth:
             if row.subject.name == 'Haas':
                 answer = 'FALSE'
-        score = self.mini_bingo_sub('Haas do not finish 10th.', answer, 
+        return self.mini_bingo_sub('Haas do not finish 10th.', answer, 
             'bingo_haas_response')
-        return score
 
 
     def all_20_finished(self):
@@ -1059,15 +1219,15 @@ class AnswerKey():
         Answer the question "At least one race has 20 classified finishers."
 
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         answer = 'FALSE'
         for race in self.races.list_races_before(self.datetime):
             if race.retirements == 0:
                 answer = 'TRUE'
-        score = self.mini_bingo_sub('At least one race has 20 classified finishers.', answer, 
+        return self.mini_bingo_sub('At least one race has 20 classified finishers.', answer, 
             'bingo_twenty_classifieds_response')
-        return score
 
 
     def down_to_the_wire(self):
@@ -1076,23 +1236,22 @@ class AnswerKey():
          final race."
         
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         answer = 'FALSE'
+        timeline = self.races.get_timeline()
         next_to_last = self.races.list_races_before(self.datetime)[-1]
-        first = next_to_last.post_race_driver_points.get_subjects_by_pos(1)
-        if len(first) > 1:
-            answer = 'TRUE'
-        second = next_to_last.post_race_driver_points.get_subjects_by_pos(2)
+        points = sorted(timeline.get_points_after(
+            timeline.get_race_index(next_to_last)), reverse=True)
         remaining_races = self.races.list_races_after(self.datetime)
-        if first[0].score - second[0].score <= (26 * len(remaining_races)):
+        if points[0] - points[1] <= (26 * len(remaining_races)):
             answer = 'TRUE'
         # Hacking answer in because it was true heading into the final race and it doesn't make 
         # sense to figure out how to recognize that it was true at this point.
         answer = 'TRUE'
-        score = self.mini_bingo_sub('World Driver Championship goes all the way to the final race.', 
+        return self.mini_bingo_sub('World Driver Championship goes all the way to the final race.', 
             answer, 'bingo_down_to_the_wire_response')
-        return score
 
 
     def schumacher_outscores_someone(self):
@@ -1100,7 +1259,8 @@ class AnswerKey():
         Answer the question "Russell outscores a non-Haas driver."
 
         Returns:
-        A TRUE or FALSE (Strings due to string repr from questionaire)
+        A tuple of the correct answer, TRUE or FALSE (Strings due to string 
+         repr from questionaire), and the score Table
         """
         answer = 'FALSE'
         schumacher = self.drivers.get_driver_by_short_name("Schumacher, Mick")
@@ -1108,29 +1268,44 @@ class AnswerKey():
             if driver.team_name != 'Haas' and schumacher.points > \
                 driver.points:
                 answer = 'TRUE'
-        score = self.mini_bingo_sub('Schumacher outscores a non-Haas driver.', 
+        return self.mini_bingo_sub('Schumacher outscores a non-Haas driver.', 
             answer, 'bingo_schumacher_response')
-        return score
 
 
     def mini_bingo(self):
+        bingo_answers = {}
         tables = []
-        tables.append(self.pourchaire_seat())
-        tables.append(self.yuki_gets_a_podium())
-        tables.append(self.haas_above_tenth())
-        tables.append(self.all_20_finished())
-        tables.append(self.down_to_the_wire())
-        tables.append(self.schumacher_outscores_someone())
-        totals = {}
-        for table in tables:
-            for table_row in table.get_ordered_subjects():
-                if table_row.subject in totals:
-                    totals[table_row.subject] += table_row.value
-                else:
-                    totals[table_row.subject] = table_row.value
-        score = Table("Mini-Bingo Totals", 'Entry', 'Points', int, 
+        for entry_var, bingo_question in [
+            ('bingo_pourchaire_response', self.pourchaire_seat),
+            ('bingo_yuki_response', self.yuki_gets_a_podium),
+            ('bingo_haas_response', self.haas_above_tenth),
+            ('bingo_twenty_classifieds_response', self.all_20_finished),
+            ('bingo_down_to_the_wire_response', self.down_to_the_wire),
+            ('bingo_schumacher_response', self.schumacher_outscores_someone)]:
+            answer, score = bingo_question()
+            bingo_answers[entry_var] = answer
+            tables.append(score)
+
+        # Each entry's TRUE guesses are one mask, so the totals are popcounts
+        # against the questions that came out TRUE and FALSE
+        bool_masks = self.entries.store.get_bool_masks(list(bingo_answers))
+        true_mask = bool_masks.get_mask([entry_var for entry_var, answer in 
+            bingo_answers.items() if answer == 'TRUE'])
+        false_mask = bool_masks.get_mask([entry_var for entry_var, answer in 
+            bingo_answers.items() if answer == 'FALSE'])
+        true_count = true_mask.bit_count()
+        false_count = false_mask.bit_count()
+        correct_trues = bool_masks.count(true_mask)
+        wrong_trues = bool_masks.count(false_mask)
+        score = self.score_table("Mini-Bingo Totals", 'Entry', 'Points', int,
             show_entries=False, show_values=False)
-        for entry in self.entries.list_entries():
-            entry_row = score.add_subject(totals[entry], entry)
-            entry.add_points(entry_row.score)
+        entries = self.entries.list_entries()
+        entry_points = []
+        for entry in entries:
+            correct_true = correct_trues[entry.index]
+            correct_false = false_count - wrong_trues[entry.index]
+            wrong = (true_count - correct_true) + wrong_trues[entry.index]
+            entry_points.append(5 * correct_true + correct_false - 3 * wrong)
+        self.add_entry_rows(score, entries, entry_points)
+        self.entry_scorers.append(BingoScorer(bingo_answers))
         return(tables, score)
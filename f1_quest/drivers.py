@@ -2,13 +2,20 @@ import csv
 import os
 
 from f1_quest.tables import Table
+from f1_quest.util import VersionedList, urlify_name
 
 
 REGULAR_POINTS = {1: 25, 2: 18, 3: 15, 4: 12, 5: 10, 6: 8, 7: 6, 8: 4, 9:2, 10: 1}
 SPRINT_POINTS = {1: 8, 2: 7, 3: 6, 4: 5, 5: 4, 6: 3, 7: 2, 8: 1}
+# The running totals updated by Driver.add_race
+DRIVER_STATE_VARS = ['points', 'podiums', 'poles', 'driver_of_the_day', 
+    'fastest_laps', 'wins', 'q3s']
 
 
 class DriverRaceResult():
+    __slots__ = ['race', 'points', 'classification', 'qpos', 'laps', 
+        'fastest_lap', 'driver_of_the_day']
+
     def __init__(self, race, points, classification, qpos, laps, fastest_lap=False, driver_of_the_day=False):
         self.race = race
         self.points = points
@@ -19,14 +26,30 @@ class DriverRaceResult():
         self.driver_of_the_day = driver_of_the_day
 
 
+    def to_dict(self):
+        race_result = {}
+        for var in self.__slots__:
+            race_result[var] = getattr(self, var)
+        return race_result
+
+
 class Driver:
+    __slots__ = ['first_name', 'last_name', 'team_name', 'name', 'entry_rep', 
+        'url_name', 'started_season', 'team', 'points', 'races', 'podiums', 
+        'poles', 'driver_of_the_day', 'fastest_laps', 'wins', 'q3s', 'subject_id']
+
     def __init__(self, first_name, last_name, team_name, started_season):
         self.first_name = first_name
         self.last_name = last_name
         self.team_name = team_name
         self.name = f"{self.last_name}, {self.first_name}"
         self.entry_rep = f"{self.first_name} {self.last_name}, {self.team_name}"
+        self.url_name = urlify_name(self.entry_rep)
+        # Set by SubjectIds when the model is loaded
+        self.subject_id = None
         self.started_season = started_season == 'yes'
+        # Set by Team.add_driver so race points reach the team's totals
+        self.team = None
         self.points = 0
         self.races = {}
         self.podiums = 0
@@ -49,6 +72,10 @@ class Driver:
         return self.name == other.name
 
 
+    def __hash__(self):
+        return hash(self.name)
+
+
     def add_race(self, race, classification, qpos, laps, 
         fastest_lap=False, driver_of_the_day=False):
 
@@ -71,12 +98,45 @@ class Driver:
         if fastest_lap:
             self.fastest_laps += 1
             self.points += 1
+        if self.team is not None:
+            self.team.add_driver_points(race.text_rep, 
+                race_points + (1 if fastest_lap else 0))
         
         self.races[race.name] = DriverRaceResult(race=race.name, points=race_points,
             qpos=qpos, laps=laps, fastest_lap=fastest_lap, 
             driver_of_the_day=driver_of_the_day, classification=classification)
 
 
+    def get_state(self):
+        """
+        Get the driver's results so far, for the season state checkpoint
+
+        Returns:
+        A dict of the driver's totals and race results that can be saved as 
+         JSON
+        """
+        state = {}
+        for var in DRIVER_STATE_VARS:
+            state[var] = getattr(self, var)
+        state['races'] = {}
+        for race_name, race_result in self.races.items():
+            state['races'][race_name] = race_result.to_dict()
+        return state
+
+
+    def load_state(self, state):
+        """
+        Restore the driver's results from a season state checkpoint
+
+        Keyword arguments:
+        state -- a dict from get_state
+        """
+        for var in DRIVER_STATE_VARS:
+            setattr(self, var, state[var])
+        for race_name, race_result in state['races'].items():
+            self.races[race_name] = DriverRaceResult(**race_result)
+
+
     def get_avg_laps(self):
         races = 0
         total_laps = 0
@@ -99,7 +159,8 @@ class Drivers:
         data_dir -- The directory to find the csv, will read $F1_DATA or default to data
         file_name -- The name of the csv in data_dir, defaults to drivers.csv
         """
-        self.driver_list = []
+        self.driver_list = VersionedList()
+        self.invalidate_indexes()
         file_path = os.path.join(data_dir, file_name)
         if not os.path.exists(file_path):
             raise Exception(f"{file_path} not found, exiting.")
@@ -114,35 +175,85 @@ class Drivers:
                     team_name=row[2], started_season=row[5]))
 
 
+    def add_driver(self, driver):
+        """
+        Add a driver to the roster
+
+        Keyword arguments:
+        driver -- the Driver to add
+        """
+        self.driver_list.append(driver)
+
+
+    def invalidate_indexes(self):
+        """
+        Throw away the lookup indexes and sorted lists so they are rebuilt on
+         next use. Any change to driver_list is noticed automatically, a 
+         change to a Driver's names or team needs to call this.
+        """
+        self.indexed_version = None
+
+
+    def get_indexes(self):
+        """
+        Build the lookup indexes and sorted lists of drivers if the roster has
+         changed since they were last built
+        """
+        if self.indexed_version == self.driver_list.version:
+            return
+        self.drivers_by_name = {}
+        self.drivers_by_entry_rep = {}
+        self.drivers_by_full_name = {}
+        self.drivers_by_first_name = {}
+        self.drivers_by_last_name = {}
+        self.drivers_by_team_name = {}
+        for driver in self.driver_list:
+            # Lookups by a single name return the first match, like a scan
+            self.drivers_by_name.setdefault(driver.name, driver)
+            self.drivers_by_entry_rep.setdefault(driver.entry_rep, driver)
+            self.drivers_by_full_name.setdefault((driver.first_name, 
+                driver.last_name, driver.team_name), []).append(driver)
+            self.drivers_by_first_name.setdefault(driver.first_name, 
+                []).append(driver)
+            self.drivers_by_last_name.setdefault(driver.last_name, 
+                []).append(driver)
+            self.drivers_by_team_name.setdefault(driver.team_name, 
+                []).append(driver)
+        self.sorted_drivers = sorted(self.driver_list)
+        self.sorted_drivers_that_started_season = [driver for driver in 
+            self.sorted_drivers if driver.started_season]
+        self.sorted_team_names = sorted(self.drivers_by_team_name.keys())
+        self.indexed_version = self.driver_list.version
+
+
     def list_all_drivers(self):
         """
-        Get a sorted list of all drivers that have driven this season
+        Get a sorted list of all drivers that have driven this season. The 
+         list is shared between calls and should not be modified.
 
         Returns:
         A sorted list of drivers
         """
-        return sorted(self.driver_list)
+        self.get_indexes()
+        return self.sorted_drivers
 
 
     
     def list_drivers_that_started_season(self):
         """
         Get a sorted list of all drivers that started the season as a full-time
-        driver
+        driver. The list is shared between calls and should not be modified.
 
         Returns:
         A sorted list of drivers that started the season as a full-time driver
         """
-        driver_list = [driver for driver in self.driver_list if 
-            driver.started_season]
-        return sorted(driver_list)
+        self.get_indexes()
+        return self.sorted_drivers_that_started_season
 
 
     def list_teams(self):
-        team_set = set()
-        for driver in self.driver_list:
-            team_set.add(driver.team_name)
-        return sorted(team_set)
+        self.get_indexes()
+        return self.sorted_team_names
 
 
     def get_driver_by_name(self, first_name=None, last_name=None, team_name=None):
@@ -157,8 +268,27 @@ class Drivers:
         Returns:
         A list of drivers match the provided names or an empty list
         """ 
+        self.get_indexes()
+        if first_name is not None and last_name is not None and \
+            team_name is not None:
+            return list(self.drivers_by_full_name.get((first_name, last_name, 
+                team_name), []))
+
+        # Start from the smallest index that applies and filter the rest
+        candidate_lists = []
+        if first_name is not None:
+            candidate_lists.append(self.drivers_by_first_name.get(first_name, 
+                []))
+        if last_name is not None:
+            candidate_lists.append(self.drivers_by_last_name.get(last_name, []))
+        if team_name is not None:
+            candidate_lists.append(self.drivers_by_team_name.get(team_name, []))
+        if len(candidate_lists) == 0:
+            return list(self.driver_list)
+        candidates = min(candidate_lists, key=len)
+
         drivers = []
-        for driver in self.driver_list:
+        for driver in candidates:
             if first_name is not None and first_name != driver.first_name:
                 continue
             if last_name is not None and last_name != driver.last_name:
@@ -179,10 +309,8 @@ class Drivers:
         Returns:
         A list of all driver objects with a matching short name
         """
-        for driver in self.driver_list:
-            if driver.name == short_name:
-                return driver
-        return None
+        self.get_indexes()
+        return self.drivers_by_name.get(short_name)
 
     
     def get_driver_by_entry_rep(self, entry_rep):
@@ -195,10 +323,8 @@ class Drivers:
         Returns:
         The driver objects with a matching entry rep
         """
-        for driver in self.driver_list:
-            if driver.entry_rep == entry_rep:
-                return driver
-        return None
+        self.get_indexes()
+        return self.drivers_by_entry_rep.get(entry_rep)
 
     
     def get_points_table(self):
@@ -1,85 +1,1467 @@
+import array
+import collections
 import csv
+import io
+import operator
 import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from f1_quest.subject_ids import SubjectIds
+from f1_quest.util import urlify_name
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def split_list(val):
+    return val.split(', ')
+
+
+def split_driver_pairs(val):
+    # Driver reps are "Name, Team" so rejoin every other item after splitting
+    driver_split = val.split(', ')
+    return [', '.join([driver_split[i], driver_split[i+1]]) for i in 
+        range(0, len(driver_split), 2)]
+
+
+# (attribute, start of the question's header, parser) for every column read 
+# from entries.csv. Columns sharing an attribute are collected into a list.
+ENTRY_COLUMNS = [
+    ('timestamp', 'Timestamp', str),
+    ('entry_name', 'Who are ya?', str),
+    ('team_fifth_response', 'Which team will finish 5th', str),
+    ('team_fifth_tiebreaker', 'Tie Breaker: How many points will the 5th', 
+        int),
+    ('team_points_avg_response', 
+        'Which team will have the highest points per race increase', str),
+    ('driver_of_the_day_response', 
+        'Who will win the most official "Driver of the Day"', str),
+    ('driver_tenth_response', 'Which driver will finish 10th', str),
+    ('driver_tenth_tiebreaker', 
+        'Tie Breaker: How many points will that driver get?', int),
+    ('driver_q3s', 'Which driver from the bottom 6 teams', str),
+    ('driver_podium_response', 'Check every driver that will have a podium', 
+        split_driver_pairs),
+    ('drvier_lowest_laps_avg', 
+        'Which driver will have the lowest average race laps', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [First]', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [Second]', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [Third]', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [Fourth]', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [Fifth]', str),
+    ('driver_six_after_six', 'Who will be the top six drivers after the '
+        'first six races? [Sixth]', str),
+    ('driver_unbroken_lead_response', 'At which race will the champion move', 
+        str),
+    ('driver_unbroken_lead_tiebreaker', 'TIE BREAKER: Same question', str),
+    ('driver_race_retirements_response', 'Pick three races', split_list),
+    ('race_fewest_on_lead_lap_response', 
+        'What is the fewest number of drivers that will finish on the lead', 
+        int),
+    ('saudi_first_retirement_response', 
+        'Which driver that starts the race in Saudi Arabia', str),
+    ('saudi_first_retirement_tiebreaker', 
+        'Tie Breaker: What WDC position will that driver start', int),
+    ('btn_unique_winners_response', 'How many unique race winners', int),
+    ('btn_unique_pole_sitters_response', 'How many unique pole sitters', int),
+    ('btn_unique_fastest_lap_response', 
+        'How many unique drivers will win the fastest lap', int),
+    ('bingo_pourchaire_response', 'Theo Pourchaire gets', str),
+    ('bingo_yuki_response', 'Yuki Tsunoda gets a podium', str),
+    ('bingo_haas_response', 'Haas do not finish 10th', str),
+    ('bingo_twenty_classifieds_response', 
+        'At least one race has 20 classified finishers', str),
+    ('bingo_down_to_the_wire_response', 
+        'World Driver Championship goes all the way', str),
+    ('bingo_schumacher_response', 'Schumacher outscores', str),
+    ('color', 'Color', str),
+    ('email', 'email', str),
+]
+FANTASY_HEADER = 'Pick one race, score points based off the finishing position'
+# Questions about fantasy picks name them as this prefix plus the last name
+FANTASY_PREFIX = 'fantasy_'
+# Answers that name a driver, team or race and are resolved to subject IDs, 
+# along with every fantasy pick
+SUBJECT_RESPONSES = ['team_fifth_response', 'team_points_avg_response', 
+    'driver_of_the_day_response', 'driver_tenth_response', 'driver_q3s', 
+    'driver_podium_response', 'drvier_lowest_laps_avg', 
+    'driver_six_after_six', 'driver_unbroken_lead_response', 
+    'driver_unbroken_lead_tiebreaker', 'driver_race_retirements_response', 
+    'saudi_first_retirement_response']
+# Subject answers that pick several subjects
+PICK_LIST_RESPONSES = ['driver_podium_response', 'driver_six_after_six', 
+    'driver_race_retirements_response']
+# TRUE/FALSE answers, stored as bools
+BOOL_RESPONSES = ['bingo_pourchaire_response', 'bingo_yuki_response', 
+    'bingo_haas_response', 'bingo_twenty_classifieds_response', 
+    'bingo_down_to_the_wire_response', 'bingo_schumacher_response']
+BOOL_VALUES = {'TRUE': 1, 'FALSE': 0}
+
+
+class EntryDecoder():
+    def __init__(self, header_row, drivers):
+        """
+        Work out which column of entries.csv holds each answer from the 
+         header row, so rows can be decoded without searching for columns. 
+         Extra columns are ignored and columns may be in any order, but a 
+         missing question raises an Exception.
+
+        Keyword arguments:
+        header_row -- the list of header names from entries.csv
+        drivers -- the Drivers object, used to match the fantasy columns
+        """
+        header_names = [' '.join(header.split()) for header in header_row]
+        text_columns = []
+        self.parsed_columns = []
+        list_columns = {}
+        for attribute, header_start, parser in ENTRY_COLUMNS:
+            idx = self.find_column(header_names, header_start)
+            if attribute == 'driver_six_after_six':
+                list_columns.setdefault(attribute, []).append(idx)
+            elif parser is str:
+                text_columns.append((attribute, idx))
+            else:
+                self.parsed_columns.append((attribute, idx, parser))
+        self.list_columns = [(attribute, operator.itemgetter(*idxs)) for 
+            attribute, idxs in list_columns.items()]
+        self.fantasy_columns = self.match_fantasy_columns(header_names, 
+            drivers)
+
+        # Text answers are copied straight across with a single itemgetter
+        self.text_attributes = tuple(attribute for attribute, idx in 
+            text_columns)
+        self.get_text_values = operator.itemgetter(*[idx for attribute, idx in 
+            text_columns])
+        self.fantasy_names = tuple(last_name for last_name, idx in 
+            self.fantasy_columns)
+        self.get_fantasy_values = operator.itemgetter(*[idx for last_name, idx 
+            in self.fantasy_columns])
+
+
+    def find_column(self, header_names, header_start):
+        for idx, header_name in enumerate(header_names):
+            if header_name.startswith(header_start):
+                return idx
+        raise Exception(f"{header_start} not found in entries headers")
+
+
+    def match_fantasy_columns(self, header_names, drivers):
+        """
+        Pair each fantasy column with the driver it asks about. The question 
+         text misspells some names, so columns are matched by last name when 
+         exactly one driver's name appears and the rest are paired in order 
+         with the remaining drivers.
+
+        Returns:
+        A list of (driver last name, column index) tuples
+        """
+        fantasy_drivers = drivers.list_drivers_that_started_season()
+        fantasy_idxs = [idx for idx, header_name in enumerate(header_names) 
+            if header_name.startswith(FANTASY_HEADER)]
+        if len(fantasy_idxs) != len(fantasy_drivers):
+            raise Exception(f"Found {len(fantasy_idxs)} fantasy columns for "
+                f"{len(fantasy_drivers)} drivers")
+
+        driver_by_idx = {}
+        for idx in fantasy_idxs:
+            question = header_names[idx][len(FANTASY_HEADER):].lower()
+            named = [driver for driver in fantasy_drivers if 
+                driver.last_name.lower() in question]
+            if len(named) == 1 and named[0] not in driver_by_idx.values():
+                driver_by_idx[idx] = named[0]
+        unmatched_drivers = iter([driver for driver in fantasy_drivers if 
+            driver not in driver_by_idx.values()])
+        for idx in fantasy_idxs:
+            if idx not in driver_by_idx:
+                driver_by_idx[idx] = next(unmatched_drivers)
+        return [(driver_by_idx[idx].last_name, idx) for idx in fantasy_idxs]
+
+
+    def decode(self, row):
+        """
+        Read the answers from an entries.csv row
+
+        Returns:
+        A tuple of a dict of attribute to answer and a dict of driver last 
+         name to fantasy pick
+        """
+        answers = dict(zip(self.text_attributes, self.get_text_values(row)))
+        for attribute, idx, parser in self.parsed_columns:
+            answers[attribute] = parser(row[idx])
+        for attribute, get_values in self.list_columns:
+            answers[attribute] = list(get_values(row))
+        fantasy_picks = dict(zip(self.fantasy_names, 
+            self.get_fantasy_values(row)))
+        return (answers, fantasy_picks)
+
+
+def set_column_value(column, index, value):
+    # Writing one past the end of a column adds the value
+    if index == len(column):
+        column.append(value)
+    else:
+        column[index] = value
+
+
+def pad_picks(pick_matrix, old_width, width, row_count):
+    """
+    Returns:
+    A copy of a flat matrix of picks with every row padded with -1 out to a 
+     new width
+    """
+    padded_matrix = array.array('i')
+    padding = [-1] * (width - old_width)
+    for row_index in range(row_count):
+        start = row_index * old_width
+        padded_matrix.extend(pick_matrix[start:start + old_width])
+        padded_matrix.extend(padding)
+    return padded_matrix
+
+
+class PickMasks():
+    def __init__(self, masks, bits_by_key):
+        """
+        One bitmask per entry with a bit for each subject, or other key, the 
+         entry picked. Masks are a NumPy uint64 array when NumPy is installed
+         and there are at most 64 keys, otherwise a list of ints.
+
+        Keyword arguments:
+        masks -- the masks, in the order entries were added
+        bits_by_key -- a dict of key to its bit, keys nobody picked may have 
+         no bit
+        """
+        self.masks = masks
+        self.bits_by_key = bits_by_key
+
+
+    def get_mask(self, keys):
+        """
+        Returns:
+        The mask with the bits of keys set, leaving out keys without a bit
+        """
+        mask = 0
+        for key in keys:
+            if key in self.bits_by_key:
+                mask |= 1 << self.bits_by_key[key]
+        return mask
+
+
+    def count(self, mask=None):
+        """
+        Count the bits each entry has set, only counting the bits in mask if
+         one is given
+
+        Returns:
+        A list of each entry's count
+        """
+        counts = self.count_bits(mask)
+        if type(counts) == list:
+            return counts
+        return counts.tolist()
+
+
+    def count_bits(self, mask=None):
+        """
+        Returns:
+        The counts as for count, as a NumPy int array when the masks are one
+        """
+        if type(self.masks) == list:
+            if mask is None:
+                return [entry_mask.bit_count() for entry_mask in self.masks]
+            return [(entry_mask & mask).bit_count() for entry_mask in 
+                self.masks]
+        masks = self.masks if mask is None else self.masks & numpy.uint64(
+            mask)
+        if hasattr(numpy, 'bitwise_count'):
+            return numpy.bitwise_count(masks).astype(int)
+        return numpy.unpackbits(masks.view(numpy.uint8)).reshape(len(masks),
+            64).sum(axis=1).astype(int)
+
+
+    def score(self, points_by_key, missing_points=0):
+        """
+        Total the points each entry's picks are worth, one popcount per 
+         distinct number of points
+
+        Keyword arguments:
+        points_by_key -- a dict of key to the points for picking it
+        missing_points -- the points for picking a key not in points_by_key
+
+        Returns:
+        A list of each entry's total
+        """
+        # Every pick starts out worth missing_points and picks of known keys
+        # add the difference
+        keys_by_points = {}
+        for key, points in points_by_key.items():
+            keys_by_points.setdefault(points - missing_points, []).append(key)
+        counts_by_points = [(missing_points, self.count_bits())] if \
+            missing_points != 0 else []
+        for points, keys in keys_by_points.items():
+            counts_by_points.append((points, self.count_bits(self.get_mask(
+                keys))))
+        if type(self.masks) == list:
+            totals = [0] * len(self.masks)
+            for points, counts in counts_by_points:
+                totals = [total + points * count for total, count in zip(
+                    totals, counts)]
+            return totals
+        totals = numpy.zeros(len(self.masks), dtype=int)
+        for points, counts in counts_by_points:
+            totals += points * counts
+        return totals.tolist()
+
+
+class PickCounts():
+    def __init__(self, store):
+        """
+        How many entries gave each answer to every question, kept up to date
+         as entries are added and changed. Answers are counted by subject ID
+         for picks, 1 or 0 for TRUE/FALSE answers and by value for numeric 
+         guesses. An entry picking a subject more than once counts once.
+
+        Keyword arguments:
+        store -- the EntryStore to count, every entry already added is 
+         counted in one pass over its columns
+        """
+        self.store = store
+        self.counts = {}
+        for entry_var, column in list(store.pick_columns.items()) + \
+            list(store.bool_columns.items()) + \
+            list(store.int_columns.items()):
+            self.counts[entry_var] = collections.Counter(column)
+        for entry_var in store.pick_matrices:
+            self.counts[entry_var] = self.count_pick_matrix(entry_var)
+
+
+    def count_pick_matrix(self, entry_var):
+        """
+        Returns:
+        A Counter of subject ID to the entries picking it
+        """
+        pick_matrix = self.store.get_pick_matrix(entry_var)
+        if pick_matrix is not None:
+            # Sorting each entry's picks lines up any repeats to drop
+            sorted_picks = numpy.sort(pick_matrix, axis=1)
+            counted = sorted_picks >= 0
+            counted[:, 1:] &= sorted_picks[:, 1:] != sorted_picks[:, :-1]
+            subject_ids, counts = numpy.unique(sorted_picks[counted], 
+                return_counts=True)
+            return collections.Counter(dict(zip(subject_ids.tolist(), 
+                counts.tolist())))
+        counts = collections.Counter()
+        for entry_index in range(len(self.store.entries)):
+            counts.update(set(self.store.get_picks(entry_var, entry_index)))
+        return counts
+
+
+    def get_answers(self, entry_index):
+        """
+        Returns:
+        A list of (entry_var, answer) for every counted answer of an entry
+        """
+        store = self.store
+        answers = [(entry_var, column[entry_index]) for entry_var, column in 
+            store.pick_columns.items()]
+        answers += [(entry_var, column[entry_index]) for entry_var, column in 
+            store.bool_columns.items()]
+        answers += [(entry_var, column[entry_index]) for entry_var, column in 
+            store.int_columns.items()]
+        for entry_var in store.pick_matrices:
+            answers += [(entry_var, subject_id) for subject_id in set(
+                store.get_picks(entry_var, entry_index))]
+        return answers
+
+
+    def add_entry(self, entry_index):
+        for entry_var, answer in self.get_answers(entry_index):
+            self.counts[entry_var][answer] += 1
+
+
+    def remove_entry(self, entry_index):
+        for entry_var, answer in self.get_answers(entry_index):
+            entry_var_counts = self.counts[entry_var]
+            entry_var_counts[answer] -= 1
+            if entry_var_counts[answer] == 0:
+                del entry_var_counts[answer]
+
+
+    def get_answer_key(self, entry_var, answer):
+        """
+        Returns:
+        The key an answer is counted under: the ID of a subject or of a 
+         subject's string, 1 or 0 for 'TRUE' or 'FALSE', or a numeric guess
+        """
+        subject_id = getattr(answer, 'subject_id', None)
+        if subject_id is not None:
+            return subject_id
+        if entry_var in self.store.bool_columns:
+            return BOOL_VALUES.get(answer)
+        if type(answer) == str:
+            return self.store.subject_ids.get_id(answer)
+        return answer
+
+
+    def get_count(self, entry_var, answer):
+        """
+        Count the entries that gave an answer
+
+        Keyword arguments:
+        entry_var -- the question's answer
+        answer -- a subject, the string of one, 'TRUE' or 'FALSE', or a 
+         numeric guess
+
+        Returns:
+        The number of entries
+        """
+        if entry_var not in self.counts:
+            return 0
+        return self.counts[entry_var].get(self.get_answer_key(entry_var, 
+            answer), 0)
+
+
+    def get_answer_str(self, entry_var, answer_key):
+        if entry_var in self.store.bool_columns:
+            return 'TRUE' if answer_key else 'FALSE'
+        if entry_var in self.store.int_columns:
+            return answer_key
+        return str(self.store.subject_ids.get_subject(answer_key))
+
+
+    def get_points_distribution(self, entry_var, points_by_key, 
+        missing_points=0):
+        """
+        Count the answers to a question by the points they are worth, without
+         reading the entries
+
+        Keyword arguments:
+        entry_var -- the question's answer
+        points_by_key -- a dict of answer key to the points it is worth
+        missing_points -- the points for an answer not in points_by_key
+
+        Returns:
+        A dict of points to the number of entries answering for them, or of
+         picks for answers picking several subjects
+        """
+        distribution = {}
+        for answer_key, count in self.counts[entry_var].items():
+            points = points_by_key.get(answer_key, missing_points)
+            distribution[points] = distribution.get(points, 0) + count
+        return distribution
+
+
+    def to_dict(self, answer_points={}):
+        """
+        Build the counts for a JSON export
+
+        Keyword arguments:
+        answer_points -- a dict of entry_var to (points_by_key, 
+         missing_points) for the questions whose answers are worth set points
+
+        Returns:
+        A dict of entry_var to its answers, most picked first, with the 
+         entries giving each and, where known, its points, and the points 
+         distribution
+        """
+        export = {}
+        for entry_var, entry_var_counts in self.counts.items():
+            points_by_key, missing_points = answer_points.get(entry_var, 
+                (None, 0))
+            answers = []
+            # Answers picked equally often are listed by key so the export 
+            # doesn't depend on the order they were counted in
+            for answer_key, count in sorted(entry_var_counts.items(), 
+                key=lambda item: (-item[1], item[0])):
+                answer = {'answer': self.get_answer_str(entry_var, 
+                    answer_key), 'count': count}
+                if points_by_key is not None:
+                    answer['points'] = points_by_key.get(answer_key, 
+                        missing_points)
+                answers.append(answer)
+            export[entry_var] = {'answers': answers}
+            if points_by_key is not None:
+                export[entry_var]['points'] = {str(points): count for points, 
+                    count in sorted(self.get_points_distribution(entry_var, 
+                    points_by_key, missing_points).items())}
+        return export
+
+
+class EntryStore():
+    def __init__(self, decoder, subject_ids, add_unknown_answers=False):
+        """
+        Every entry's answers as typed columns, one value per entry in the 
+         order entries were added: lists for names and other text, int 
+         arrays for numeric guesses, subject ID arrays for single and fantasy
+         picks, entries x picks ID matrices padded with -1 for answers that 
+         pick several subjects and bool arrays for TRUE/FALSE answers. 
+         Entries are handed out as Entry views that read these columns.
+
+        Keyword arguments:
+        decoder -- the EntryDecoder for the entries.csv header
+        subject_ids -- the SubjectIds answers are resolved with
+        add_unknown_answers -- give answers that name no subject an ID of 
+         their own instead of reporting them
+        """
+        self.decoder = decoder
+        self.subject_ids = subject_ids
+        self.add_unknown_answers = add_unknown_answers
+        self.text_columns = {}
+        self.int_columns = {}
+        self.bool_columns = {}
+        self.pick_columns = {}
+        self.pick_matrices = {}
+        self.pick_widths = {}
+        for attribute, header_start, parser in ENTRY_COLUMNS:
+            if attribute in PICK_LIST_RESPONSES:
+                self.pick_matrices[attribute] = array.array('i')
+                self.pick_widths[attribute] = 0
+            elif attribute in SUBJECT_RESPONSES:
+                self.pick_columns[attribute] = array.array('i')
+            elif attribute in BOOL_RESPONSES:
+                self.bool_columns[attribute] = array.array('b')
+            elif parser is int:
+                self.int_columns[attribute] = array.array('i')
+            else:
+                self.text_columns[attribute] = []
+        self.fantasy_vars = [FANTASY_PREFIX + last_name for last_name in 
+            decoder.fantasy_names]
+        for fantasy_var in self.fantasy_vars:
+            self.pick_columns[fantasy_var] = array.array('i')
+        # Score tables label a row per entry, read names without a view
+        self.entry_names = self.text_columns['entry_name']
+        # Page names are built once per entry, as for drivers, teams and races
+        self.url_names = []
+        self.scores = array.array('i')
+        # Set by SubjectIds when the entries are numbered, -1 until then
+        self.entry_ids = array.array('i')
+        self.entries = []
+        self.entry_indexes = {}
+        self.sorted_entries = None
+        # Counted once every entry has been read, then kept up to date
+        self.pick_counts = None
+
+        # The columns add_row fills, with where the answer comes from
+        self.value_columns = list(self.text_columns.items()) + \
+            list(self.int_columns.items())
+        self.single_pick_columns = [(attribute, attribute, column) for 
+            attribute, column in self.pick_columns.items() if attribute not in
+            self.fantasy_vars]
+        self.single_pick_columns += [(fantasy_var, last_name, 
+            self.pick_columns[fantasy_var]) for fantasy_var, last_name in 
+            zip(self.fantasy_vars, decoder.fantasy_names)]
+
+
+    def resolve(self, entry_var, response, unknown_responses):
+        subject_id = self.subject_ids.get_id(response)
+        if subject_id is None:
+            if self.add_unknown_answers:
+                return self.subject_ids.add_answer(response)
+            unknown_responses.append((entry_var, response))
+            return -1
+        return subject_id
+
+
+    def add_row(self, row, decoder=None):
+        """
+        Add an entry from an entries.csv row. A row with the name of an entry
+         already added replaces that entry's answers.
+
+        Keyword arguments:
+        row -- the list of values from entries.csv
+        decoder -- an EntryDecoder for a file with another header, with the 
+         same fantasy drivers, or None for the store's own decoder
+
+        Returns:
+        A tuple of the Entry and a list of (entry_var, answer) for answers 
+         that named no subject or weren't TRUE or FALSE
+        """
+        if decoder is None:
+            decoder = self.decoder
+        answers, fantasy_picks = decoder.decode(row)
+        entry_index = self.entry_indexes.get(answers['entry_name'], 
+            len(self.entries))
+        ids_by_str = self.subject_ids.ids_by_str
+        unknown_responses = []
+
+        # Work out every value first, then write them all in one pass
+        column_values = [(column, answers[attribute]) for attribute, column in
+            self.value_columns]
+        for entry_var, answer_key, column in self.single_pick_columns:
+            answer = fantasy_picks[answer_key] if entry_var != answer_key \
+                else answers[answer_key]
+            subject_id = ids_by_str.get(answer)
+            if subject_id is None:
+                subject_id = self.resolve(entry_var, answer, unknown_responses)
+            column_values.append((column, subject_id))
+        for attribute, column in self.bool_columns.items():
+            if answers[attribute] not in BOOL_VALUES:
+                unknown_responses.append((attribute, answers[attribute]))
+            column_values.append((column, BOOL_VALUES.get(answers[attribute], 
+                0)))
+        if self.pick_counts is not None and entry_index < len(self.entries):
+            self.pick_counts.remove_entry(entry_index)
+        if entry_index == len(self.entries):
+            for column, value in column_values:
+                column.append(value)
+        else:
+            for column, value in column_values:
+                column[entry_index] = value
+        for attribute in self.pick_matrices:
+            self.set_picks(attribute, entry_index, [self.resolve(attribute, 
+                response, unknown_responses) if response not in ids_by_str 
+                else ids_by_str[response] for response in answers[attribute]])
+
+        entry = self.add_entry_view(answers['entry_name'], entry_index)
+        if self.pick_counts is not None:
+            self.pick_counts.add_entry(entry_index)
+        return (entry, unknown_responses)
+
+
+    def check_row(self, row, decoder=None):
+        """
+        Find the answers add_row would report for a row, without adding it
+
+        Returns:
+        A tuple of the entry's name and a list of (entry_var, answer) for 
+         answers that named no subject or weren't TRUE or FALSE
+        """
+        if decoder is None:
+            decoder = self.decoder
+        answers, fantasy_picks = decoder.decode(row)
+        unknown_responses = []
+        if not self.add_unknown_answers:
+            ids_by_str = self.subject_ids.ids_by_str
+            for entry_var, answer_key, column in self.single_pick_columns:
+                answer = fantasy_picks[answer_key] if entry_var != \
+                    answer_key else answers[answer_key]
+                if answer not in ids_by_str:
+                    unknown_responses.append((entry_var, answer))
+            for attribute in self.pick_matrices:
+                unknown_responses.extend([(attribute, response) for response 
+                    in answers[attribute] if response not in ids_by_str])
+        for attribute in self.bool_columns:
+            if answers[attribute] not in BOOL_VALUES:
+                unknown_responses.append((attribute, answers[attribute]))
+        return (answers['entry_name'], unknown_responses)
+
+
+    def add_entry_view(self, entry_name, entry_index):
+        """
+        Hand out the Entry for a row whose answers have been written, adding
+         it if the row is new
+
+        Returns:
+        The Entry
+        """
+        if entry_index == len(self.entries):
+            self.scores.append(0)
+            self.entry_ids.append(-1)
+            self.entries.append(Entry(self, entry_index))
+            self.entry_indexes[entry_name] = entry_index
+            self.url_names.append(urlify_name(entry_name))
+        return self.entries[entry_index]
+
+
+    def get_batch(self, first_new_id):
+        """
+        Package the columns to be added to another EntryStore with add_batch,
+         e.g. when rows are decoded in a worker process
+
+        Keyword arguments:
+        first_new_id -- the first ID this store's SubjectIds gave an answer 
+         that named no subject
+
+        Returns:
+        A tuple of the columns by kind, the pick widths, first_new_id and the
+         answers given IDs from first_new_id on
+        """
+        columns = {'text': self.text_columns, 'int': self.int_columns, 
+            'bool': self.bool_columns, 'pick': self.pick_columns, 
+            'matrix': self.pick_matrices}
+        return (columns, self.pick_widths, first_new_id, 
+            self.subject_ids.subjects[first_new_id:])
+
+
+    def add_batch(self, batch):
+        """
+        Add the entries from another EntryStore's get_batch after the ones 
+         already added. Entries with the name of one already added replace its
+         answers.
+
+        Keyword arguments:
+        batch -- the tuple from get_batch
+
+        Returns:
+        A list of (Entry, entry_var, answer) for answers that named no subject
+        """
+        columns, pick_widths, first_new_id, new_answers = batch
+        batch_names = columns['text']['entry_name']
+        unknown_responses = []
+        if len(new_answers) > 0:
+            unknown_responses = self.remap_batch_ids(columns, pick_widths, 
+                first_new_id, new_answers)
+
+        if any([entry_name in self.entry_indexes for entry_name in 
+            batch_names]):
+            for batch_index in range(len(batch_names)):
+                self.copy_batch_entry(columns, pick_widths, batch_index)
+        else:
+            for kind_columns, store_columns in [
+                (columns['text'], self.text_columns), 
+                (columns['int'], self.int_columns), 
+                (columns['bool'], self.bool_columns), 
+                (columns['pick'], self.pick_columns)]:
+                for attribute, column in kind_columns.items():
+                    store_columns[attribute].extend(column)
+            for attribute, pick_matrix in columns['matrix'].items():
+                width = pick_widths[attribute]
+                if width > self.pick_widths[attribute]:
+                    self.widen_picks(attribute, width)
+                elif width < self.pick_widths[attribute]:
+                    pick_matrix = pad_picks(pick_matrix, width, 
+                        self.pick_widths[attribute], len(batch_names))
+                self.pick_matrices[attribute].extend(pick_matrix)
+            for entry_name in batch_names:
+                self.add_entry_view(entry_name, len(self.entries))
+
+        if self.pick_counts is not None:
+            self.count_picks()
+        return [(self.entries[self.entry_indexes[batch_names[batch_index]]],
+            entry_var, response) for batch_index, entry_var, response in 
+            unknown_responses]
+
+
+    def remap_batch_ids(self, columns, pick_widths, first_new_id, 
+        new_answers):
+        """
+        Swap the IDs a batch gave answers naming no subject for this store's,
+         or -1 if this store reports them
+
+        Returns:
+        A list of (batch index, entry_var, answer) for the reported answers
+        """
+        new_ids = {}
+        for offset, response in enumerate(new_answers):
+            new_id = -1
+            if self.add_unknown_answers:
+                new_id = self.subject_ids.add_answer(response)
+            new_ids[first_new_id + offset] = new_id
+        unknown_responses = []
+        for kind in ['pick', 'matrix']:
+            for entry_var, column in columns[kind].items():
+                width = pick_widths[entry_var] if kind == 'matrix' else 1
+                for position, subject_id in enumerate(column):
+                    if subject_id < first_new_id:
+                        continue
+                    column[position] = new_ids[subject_id]
+                    if not self.add_unknown_answers:
+                        unknown_responses.append((position // width, 
+                            entry_var, new_answers[subject_id - first_new_id]))
+        return unknown_responses
+
+
+    def copy_batch_entry(self, columns, pick_widths, batch_index):
+        batch_names = columns['text']['entry_name']
+        entry_index = self.entry_indexes.get(batch_names[batch_index], 
+            len(self.entries))
+        for kind_columns, store_columns in [
+            (columns['text'], self.text_columns), 
+            (columns['int'], self.int_columns), 
+            (columns['bool'], self.bool_columns), 
+            (columns['pick'], self.pick_columns)]:
+            for attribute, column in kind_columns.items():
+                set_column_value(store_columns[attribute], entry_index, 
+                    column[batch_index])
+        for attribute, pick_matrix in columns['matrix'].items():
+            width = pick_widths[attribute]
+            self.set_picks(attribute, entry_index, [subject_id for subject_id 
+                in pick_matrix[batch_index * width:(batch_index + 1) * width] 
+                if subject_id >= 0])
+        self.add_entry_view(batch_names[batch_index], entry_index)
+
+
+    def set_picks(self, entry_var, entry_index, pick_ids):
+        width = self.pick_widths[entry_var]
+        if len(pick_ids) > width:
+            self.widen_picks(entry_var, len(pick_ids))
+            width = len(pick_ids)
+        padded_ids = array.array('i', pick_ids + [-1] * (width - 
+            len(pick_ids)))
+        pick_matrix = self.pick_matrices[entry_var]
+        start = entry_index * width
+        if start == len(pick_matrix):
+            pick_matrix.extend(padded_ids)
+        else:
+            pick_matrix[start:start + width] = padded_ids
+
+
+    def widen_picks(self, entry_var, width):
+        """
+        Pad every entry's picks for an answer out to a new width
+        """
+        self.pick_matrices[entry_var] = pad_picks(self.pick_matrices[
+            entry_var], self.pick_widths[entry_var], width, len(self.entries))
+        self.pick_widths[entry_var] = width
+
+
+    def get_column(self, entry_var):
+        """
+        Get every entry's answer to a question, in the order entries were 
+         added. Answers picking several subjects are a flat array, see 
+         get_pick_matrix.
+
+        Returns:
+        The list or array holding the answers
+        """
+        for columns in [self.text_columns, self.int_columns, 
+            self.bool_columns, self.pick_columns, self.pick_matrices]:
+            if entry_var in columns:
+                return columns[entry_var]
+        raise KeyError(entry_var)
+
+
+    def get_pick_array(self, entry_var):
+        """
+        Returns:
+        A tuple of the flat array of picks for an answer and the number of 
+         picks each entry has in it
+        """
+        if entry_var in self.pick_columns:
+            return (self.pick_columns[entry_var], 1)
+        return (self.pick_matrices[entry_var], self.pick_widths[entry_var])
+
+
+    def get_picks(self, entry_var, entry_index):
+        """
+        Returns:
+        A list of the subject IDs an entry picked, without the padding
+        """
+        picks, width = self.get_pick_array(entry_var)
+        return [subject_id for subject_id in picks[entry_index * width:
+            (entry_index + 1) * width] if subject_id >= 0]
+
+
+    def get_pick_matrix(self, entry_var):
+        """
+        Get an answer's picks as an entries x picks NumPy array sharing the 
+         column's memory, padded with -1. Single picks have one column.
+
+        Returns:
+        The 2D array, or None if NumPy isn't installed or nothing was picked
+        """
+        picks, width = self.get_pick_array(entry_var)
+        if numpy is None or len(self.entries) == 0 or width == 0:
+            return None
+        return numpy.frombuffer(picks, dtype=numpy.intc).reshape(
+            len(self.entries), width)
+
+
+    def score_picks(self, entry_var, points_by_id, missing_points=0):
+        """
+        Total the points each entry's picks are worth
+
+        Keyword arguments:
+        entry_var -- an answer picking one or several subjects
+        points_by_id -- a dict of subject ID to the int points for picking 
+         it, or a list of them, one per pick position
+        missing_points -- the points for picking a subject not in 
+         points_by_id
+
+        Returns:
+        A list of each entry's total, in the order entries were added
+        """
+        picks, width = self.get_pick_array(entry_var)
+        if type(points_by_id) == list:
+            points_by_position = points_by_id
+        else:
+            points_by_position = [points_by_id] * width
+        pick_matrix = self.get_pick_matrix(entry_var)
+        if pick_matrix is not None:
+            # The last column is where the -1 padding lands, worth nothing
+            points = numpy.full((width, len(self.subject_ids.subjects) + 1), 
+                missing_points)
+            points[:, -1] = 0
+            for position, position_points in enumerate(points_by_position):
+                for subject_id, subject_points in position_points.items():
+                    points[position, subject_id] = subject_points
+            return points[numpy.arange(width), pick_matrix].sum(
+                axis=1).tolist()
+        totals = []
+        for entry_index in range(len(self.entries)):
+            total = 0
+            for position, subject_id in enumerate(picks[entry_index * width:
+                (entry_index + 1) * width]):
+                if subject_id >= 0:
+                    total += points_by_position[position].get(subject_id, 
+                        missing_points)
+            totals.append(total)
+        return totals
+
+
+    def count_picks(self):
+        """
+        Count every entry's answers into pick_counts, which add_row then 
+         keeps up to date
+        """
+        self.pick_counts = PickCounts(self)
+
+
+    def get_pick_masks(self, entry_var):
+        """
+        Encode every entry's picks for an answer as a bitmask, with a bit for
+         each subject anyone picked
+
+        Returns:
+        A PickMasks keyed by subject ID
+        """
+        picks, width = self.get_pick_array(entry_var)
+        pick_matrix = self.get_pick_matrix(entry_var)
+        if pick_matrix is not None:
+            picked_ids = numpy.flatnonzero(numpy.bincount(pick_matrix[
+                pick_matrix >= 0])).tolist()
+        else:
+            picked_ids = sorted(set(picks))
+        bits_by_key = {}
+        for subject_id in picked_ids:
+            if subject_id >= 0:
+                bits_by_key[subject_id] = len(bits_by_key)
+        if pick_matrix is not None and len(bits_by_key) <= 64:
+            # The last slot is where the -1 padding lands, with no bit
+            bit_values = numpy.zeros(max(bits_by_key, default=0) + 2, 
+                dtype=numpy.uint64)
+            for subject_id, bit in bits_by_key.items():
+                bit_values[subject_id] = numpy.uint64(1 << bit)
+            return PickMasks(numpy.bitwise_or.reduce(bit_values[pick_matrix], 
+                axis=1), bits_by_key)
+        masks = []
+        for entry_index in range(len(self.entries)):
+            mask = 0
+            for subject_id in picks[entry_index * width:(entry_index + 1) * 
+                width]:
+                if subject_id >= 0:
+                    mask |= 1 << bits_by_key[subject_id]
+            masks.append(mask)
+        return PickMasks(masks, bits_by_key)
+
+
+    def get_bool_masks(self, attributes):
+        """
+        Encode every entry's TRUE/FALSE answers as a bitmask, with a bit set 
+         for each answer that is TRUE
+
+        Keyword arguments:
+        attributes -- the bool answers, each gets the bit of its position
+
+        Returns:
+        A PickMasks keyed by attribute
+        """
+        bits_by_key = {attribute: bit for bit, attribute in enumerate(
+            attributes)}
+        if numpy is not None and len(attributes) <= 64:
+            masks = numpy.zeros(len(self.entries), dtype=numpy.uint64)
+            for attribute, bit in bits_by_key.items():
+                masks |= numpy.frombuffer(self.bool_columns[attribute], 
+                    dtype=numpy.int8).astype(numpy.uint64) << numpy.uint64(bit)
+            return PickMasks(masks, bits_by_key)
+        masks = [0] * len(self.entries)
+        for attribute, bit in bits_by_key.items():
+            for entry_index, value in enumerate(self.bool_columns[attribute]):
+                if value:
+                    masks[entry_index] |= 1 << bit
+        return PickMasks(masks, bits_by_key)
+
+
+    def get_response(self, entry_index, entry_var):
+        if entry_var in self.pick_columns:
+            return str(self.subject_ids.get_subject(
+                self.pick_columns[entry_var][entry_index]))
+        if entry_var in self.pick_matrices:
+            return [str(self.subject_ids.get_subject(subject_id)) for 
+                subject_id in self.get_picks(entry_var, entry_index)]
+        if entry_var in self.bool_columns:
+            return 'TRUE' if self.bool_columns[entry_var][entry_index] else \
+                'FALSE'
+        return self.get_column(entry_var)[entry_index]
+
+
+    def get_response_ids(self, entry_index, entry_var):
+        if entry_var in self.pick_columns:
+            return self.pick_columns[entry_var][entry_index]
+        if entry_var in self.pick_matrices:
+            return self.get_picks(entry_var, entry_index)
+        return None
+
+
+    def list_entries(self):
+        """
+        Get the entries sorted by name. The list is shared between calls and 
+         should not be modified.
+
+        Returns:
+        A sorted list of Entry views
+        """
+        if self.sorted_entries is None or \
+            len(self.sorted_entries) != len(self.entries):
+            self.sorted_entries = sorted(self.entries)
+        return self.sorted_entries
 
 
 class Entry():
-    def __init__(self, row, drivers):
-        self.score = 0
-        self.timestamp = row[0]
-        self.entry_name = row[1]
-        self.color = row[52]
-        self.email = row[53]
-        self.team_fifth_response = row[2]
-        self.team_fifth_tiebreaker = int(row[3])
-        self.team_points_avg_response = row[4]
-        self.driver_of_the_day_response = row[5]
-        self.driver_tenth_response = row[6]
-        self.driver_tenth_tiebreaker = int(row[7])
-        self.driver_q3s = row[8]   
-
-        # Reconstitute drivers after splitting on the comma
-        driver_split = row[9].split(', ')
-        self.driver_podium_response = []
-        for i in range(0, len(driver_split), 2):
-            self.driver_podium_response.append(', '.join([driver_split[i], driver_split[i+1]]))
-        
-        self.drvier_lowest_laps_avg = row[10]
-        self.driver_six_after_six = [row[11], row[12], row[13], row[14], 
-            row[15], row[16]]
-        self.driver_unbroken_lead_response = row[17]
-        self.driver_unbroken_lead_tiebreaker = row[18]
-        self.driver_race_retirements_response = row[19].split(', ')
-
-        self.race_fewest_on_lead_lap_response = int(row[20])
-        self.saudi_first_retirement_response = row[21]
-        self.saudi_first_retirement_tiebreaker = int(row[22])
-        self.btn_unique_winners_response = int(row[23])
-        self.btn_unique_pole_sitters_response = int(row[24])
-        self.btn_unique_fastest_lap_response = int(row[25])
-        self.bingo_pourchaire_response = row[26]
-        self.bingo_yuki_response = row[27]
-        self.bingo_haas_response = row[28]
-        self.bingo_twenty_classifieds_response = row[29]
-        self.bingo_down_to_the_wire_response = row[30]
-        self.bingo_schumacher_response = row[31]
-
-        # Get fantasy driver races
-        index = 32
-        #self.fantasy_drivers = {}
-        for driver in drivers.list_all_drivers():
-            if driver.started_season:
-                self.__dict__[f"fantasy_{driver.last_name}"] = row[index]
-                index += 1
+    __slots__ = ['store', 'index']
+
+    def __init__(self, store, index):
+        """
+        A view of one entry's answers in an EntryStore. Answers can be read 
+         with get_response or as attributes named after the answer.
+
+        Keyword arguments:
+        store -- the EntryStore with the answers
+        index -- the entry's position in the store's columns
+        """
+        self.store = store
+        self.index = index
+
+
+    @property
+    def entry_name(self):
+        return self.store.entry_names[self.index]
+
+
+    @property
+    def url_name(self):
+        return self.store.url_names[self.index]
+
+
+    @property
+    def score(self):
+        return self.store.scores[self.index]
+
+
+    @score.setter
+    def score(self, score):
+        self.store.scores[self.index] = score
+
+
+    @property
+    def subject_id(self):
+        entry_id = self.store.entry_ids[self.index]
+        return None if entry_id < 0 else entry_id
+
+
+    @subject_id.setter
+    def subject_id(self, subject_id):
+        self.store.entry_ids[self.index] = subject_id
+
+
+    @property
+    def fantasy_picks(self):
+        """
+        Returns:
+        A dict of driver last name to the race picked for them
+        """
+        return {last_name: self.get_response(fantasy_var) for last_name, 
+            fantasy_var in zip(self.store.decoder.fantasy_names, 
+            self.store.fantasy_vars)}
+
+
+    def get_response(self, entry_var):
+        """
+        Get an answer by the name questions use for it
+
+        Keyword arguments:
+        entry_var -- an attribute name, or FANTASY_PREFIX plus a driver's 
+         last name for a fantasy pick
+
+        Returns:
+        The entry's answer, a list of strings for answers picking several 
+         subjects
+        """
+        return self.store.get_response(self.index, entry_var)
+
+
+    def get_response_ids(self, entry_var):
+        """
+        Returns:
+        The subject ID or list of IDs an answer picked, or None if the answer
+         doesn't pick subjects
+        """
+        return self.store.get_response_ids(self.index, entry_var)
+
+
+    def __getattr__(self, name):
+        # Only reached for names that aren't slots or properties
+        if name.startswith('_') or name in Entry.__slots__:
+            raise AttributeError(name)
+        try:
+            return self.get_response(name)
+        except KeyError:
+            raise AttributeError(name)
 
 
     def __str__(self):
-        return self.entry_name
+        return self.store.entry_names[self.index]
 
 
     def __lt__(self, other):
-        return self.entry_name < other.entry_name
+        return (self.store.entry_names[self.index] < 
+            other.store.entry_names[other.index])
 
 
     def add_points(self, points):
-        self.score += points
+        self.store.scores[self.index] += points
         
 
+def read_row_batches(file_reader, batch_size):
+    """
+    Stream rows from a csv reader in batches, holding one batch at a time
+
+    Keyword arguments:
+    file_reader -- the csv reader
+    batch_size -- the most rows in a batch
+
+    Returns:
+    A generator of lists of rows
+    """
+    rows = []
+    for row in file_reader:
+        rows.append(row)
+        if len(rows) == batch_size:
+            yield rows
+            rows = []
+    if len(rows) > 0:
+        yield rows
+
+
+def read_row_bytes(file_pointer):
+    """
+    Read the raw bytes of one csv row without parsing it. A line only ends 
+     the row when it leaves the quotes balanced, so a quoted answer with line
+     breaks stays in one row.
+
+    Keyword arguments:
+    file_pointer -- the csv file opened in binary mode
+
+    Returns:
+    The bytes of the row, empty at the end of the file
+    """
+    row_bytes = b''
+    for line in iter(file_pointer.readline, b''):
+        row_bytes += line
+        if row_bytes.count(b'"') % 2 == 0:
+            break
+    return row_bytes
+
+
+def read_row_ranges(file_pointer, batch_size):
+    """
+    Split the rest of a csv into byte ranges of whole rows, only looking for
+     where rows end so the rows can be parsed where the range is read
+
+    Keyword arguments:
+    file_pointer -- the csv file opened in binary mode
+    batch_size -- the most rows in a range
+
+    Returns:
+    A generator of (start, end, row count) byte ranges in file order
+    """
+    start = file_pointer.tell()
+    row_count = 0
+    while len(read_row_bytes(file_pointer)) > 0:
+        row_count += 1
+        if row_count == batch_size:
+            end = file_pointer.tell()
+            yield (start, end, row_count)
+            start = end
+            row_count = 0
+    if row_count > 0:
+        yield (start, file_pointer.tell(), row_count)
+
+
+def parse_rows(row_bytes):
+    """
+    Parse csv rows read as bytes, decoded the way open() would decode them
+
+    Returns:
+    A list of rows
+    """
+    return list(csv.reader(io.TextIOWrapper(io.BytesIO(row_bytes), 
+        newline=''), delimiter=',', quotechar='"'))
+
+
+def read_complete_rows(file_path, offset):
+    """
+    Read the csv rows appended to a file after an offset, leaving a row that
+     is still being written for the next read
+
+    Keyword arguments:
+    file_path -- the csv file
+    offset -- the byte offset to read from
+
+    Returns:
+    A tuple of the list of rows and the offset after the last complete row
+    """
+    with open(file_path, 'rb') as file_pointer:
+        file_pointer.seek(offset)
+        appended = file_pointer.read()
+    complete_length = appended.rfind(b'\n') + 1
+    return (parse_rows(appended[:complete_length]), offset + complete_length)
+
+
+# The decoder and answer lookups of a worker process, set by start_entry_worker
+worker_decoder = None
+worker_subject_ids = None
+
+
+def start_entry_worker(decoder, subject_ids):
+    global worker_decoder, worker_subject_ids
+    worker_decoder = decoder
+    worker_subject_ids = subject_ids
+
+
+def decode_entry_batch(rows):
+    """
+    Decode a batch of entries.csv rows in a worker process started by 
+     start_entry_worker. Answers naming no subject are given IDs after the 
+     worker's lookups for the reading process to swap or report.
+
+    Keyword arguments:
+    rows -- the rows to decode
+
+    Returns:
+    A tuple of the batch from EntryStore.get_batch and a list of (entry 
+     name, entry_var, answer) for answers that weren't TRUE or FALSE
+    """
+    store = EntryStore(worker_decoder, worker_subject_ids.get_lookup_copy(), 
+        add_unknown_answers=True)
+    unknown_responses = []
+    for row in rows:
+        entry, unknown = store.add_row(row)
+        unknown_responses.extend([(entry.entry_name, entry_var, response) for
+            entry_var, response in unknown])
+    return (store.get_batch(len(worker_subject_ids.subjects)), 
+        unknown_responses)
+
+
+def decode_entry_range(file_path, start, end):
+    """
+    Read and decode the entries.csv rows in a byte range from 
+     read_row_ranges, in a worker process started by start_entry_worker
+
+    Keyword arguments:
+    file_path -- the path of entries.csv
+    start, end -- the byte range, which holds whole rows
+
+    Returns:
+    The same as decode_entry_batch
+    """
+    with open(file_path, 'rb') as file_pointer:
+        file_pointer.seek(start)
+        row_bytes = file_pointer.read(end - start)
+    return decode_entry_batch(parse_rows(row_bytes))
+
+
+class ReadProgress():
+    def __init__(self):
+        """
+        Count the rows read so far and how quickly they were read
+        """
+        self.rows = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+
+    def add_batch(self, row_count):
+        self.rows += row_count
+        self.batches += 1
+        self.seconds = time.perf_counter() - self.started
+
+
+    def get_rows_per_second(self):
+        if self.seconds == 0:
+            return 0.0
+        return self.rows / self.seconds
+
+
+    def __str__(self):
+        return f"{self.rows} rows in {self.batches} batches, " \
+            f"{self.seconds:.1f}s ({self.get_rows_per_second():.0f} rows/s)"
+
+
+# Rows decoded together, and batches queued per worker process
+ENTRY_BATCH_SIZE = 10000
+BATCHES_PER_WORKER = 2
+
+
 class Entries():
-    def __init__(self, drivers, data_dir=os.getenv('F1_DATA', 'data'), file_name="entries.csv"):
-        self.entries = {}
+    def __init__(self, drivers, data_dir=os.getenv('F1_DATA', 'data'), file_name="entries.csv",
+        subject_ids=None, batch_size=ENTRY_BATCH_SIZE, workers=1, 
+        progress_callback=None, submissions_file_name=None):
+        """
+        Stream entries.csv into an EntryStore in batches, so only a few 
+         batches of raw rows are held at once
+
+        Keyword arguments:
+        drivers -- the Drivers object, used to match the fantasy columns
+        data_dir -- The directory to find the csv, will read $F1_DATA or default to data
+        file_name -- The name of the csv in data_dir, defaults to entries.csv
+        subject_ids -- a SubjectIds with the drivers, teams and races, if 
+         given every entry is numbered and its answers resolved to IDs, and 
+         any answers naming no subject are raised together once every row 
+         has been read. Otherwise answers are given IDs of their own.
+        batch_size -- the number of rows read and decoded together
+        workers -- the number of processes decoding batches, batches are 
+         still added in file order. 1 decodes in this process.
+        progress_callback -- called with the ReadProgress after each batch
+        submissions_file_name -- the name of the submissions CSV in data_dir
+         to apply after entries.csv, see read_submissions, or None
+        """
         file_path = os.path.join(data_dir, file_name)
         if not os.path.exists(file_path):
             raise Exception(f"{file_path} not found, exiting.")
-        header_row = True
-        with open(file_path, newline='') as file_pointer:
-            file_reader = csv.reader(file_pointer, delimiter=',', quotechar='"')
-            for row in file_reader:
-                if header_row:
-                    header_row = False
-                    continue
-                self.entries[row[1]] = Entry(row, drivers)
+        self.read_progress = ReadProgress()
+        with open(file_path, 'rb') as file_pointer:
+            header_rows = parse_rows(read_row_bytes(file_pointer))
+            if len(header_rows) == 0:
+                raise Exception(f"{file_path} has no header row")
+            header_row = header_rows[0]
+            if subject_ids is None:
+                self.store = EntryStore(EntryDecoder(header_row, drivers), 
+                    SubjectIds(), add_unknown_answers=True)
+            else:
+                self.store = EntryStore(EntryDecoder(header_row, drivers), 
+                    subject_ids)
+            unknown_responses = self.read_batches(file_path, file_pointer, 
+                batch_size, workers, progress_callback)
+        self.submissions_path = None
+        self.submissions_offset = 0
+        self.submissions_decoder = None
+        if submissions_file_name is not None:
+            self.read_submissions(os.path.join(data_dir, 
+                submissions_file_name), drivers)
+
+        self.store.count_picks()
+        if subject_ids is not None:
+            for entry in self.store.entries:
+                if entry.subject_id is None:
+                    subject_ids.add_subject(entry, answerable=False)
+        if len(unknown_responses) > 0:
+            raise Exception(f"Answers in {file_path} that name no driver, "
+                f"team or race or aren't TRUE or FALSE: " + '; '.join([
+                f"{entry}: {entry_var} {response!r}" for entry, entry_var, 
+                response in unknown_responses]))
+
+
+    def read_batches(self, file_path, file_pointer, batch_size, workers, 
+        progress_callback):
+        """
+        Add the rows after the header to the store in batches. With more than
+         one worker this process only finds where each batch of rows starts 
+         and ends, and a pool of worker processes read, parse and decode 
+         their own byte ranges.
+
+        Keyword arguments:
+        file_path -- the path of entries.csv, for the workers to open
+        file_pointer -- entries.csv opened in binary mode, after the header
+        batch_size -- the number of rows read and decoded together
+        workers -- the number of processes decoding batches
+        progress_callback -- called with the ReadProgress after each batch
+
+        Returns:
+        A list of (entry, entry_var, answer) for the answers that couldn't be 
+         read
+        """
+        unknown_responses = []
+        if workers <= 1:
+            file_reader = csv.reader(io.TextIOWrapper(file_pointer, 
+                newline=''), delimiter=',', quotechar='"')
+            for rows in read_row_batches(file_reader, batch_size):
+                for row in rows:
+                    entry, unknown = self.store.add_row(row)
+                    unknown_responses.extend([(entry, entry_var, response) for
+                        entry_var, response in unknown])
+                self.read_progress.add_batch(len(rows))
+                if progress_callback is not None:
+                    progress_callback(self.read_progress)
+            return unknown_responses
+
+        def add_decoded_batch(decoded, row_count):
+            batch, batch_unknown = decoded.result()
+            unknown_responses.extend(batch_unknown)
+            unknown_responses.extend(self.store.add_batch(batch))
+            self.read_progress.add_batch(row_count)
+            if progress_callback is not None:
+                progress_callback(self.read_progress)
+
+        # Batches are added in the order they were read, with only a few per
+        # worker waiting so the reader never runs far ahead
+        with ProcessPoolExecutor(max_workers=workers, 
+            initializer=start_entry_worker, initargs=(self.store.decoder, 
+            self.store.subject_ids.get_lookup_copy())) as executor:
+            pending = collections.deque()
+            for start, end, row_count in read_row_ranges(file_pointer, 
+                batch_size):
+                pending.append((executor.submit(decode_entry_range, file_path,
+                    start, end), row_count))
+                if len(pending) >= workers * BATCHES_PER_WORKER:
+                    add_decoded_batch(*pending.popleft())
+            while len(pending) > 0:
+                add_decoded_batch(*pending.popleft())
+        return unknown_responses
+
+
+    def read_submissions(self, file_path, drivers):
+        """
+        Apply the complete rows of a submissions CSV the way 
+         EntrySubmissions.poll does, so a row with the name of an entry 
+         replaces its answers and rows poll would reject are skipped. Where 
+         the rows stopped is kept for EntrySubmissions to poll from.
+
+        Keyword arguments:
+        file_path -- the path of the submissions CSV, it may not exist yet
+        drivers -- the Drivers object, used to match the fantasy columns
+        """
+        self.submissions_path = file_path
+        if not os.path.exists(file_path):
+            return
+        rows, self.submissions_offset = read_complete_rows(file_path, 0)
+        if len(rows) == 0:
+            return
+        self.submissions_decoder = EntryDecoder(rows[0], drivers)
+        if self.submissions_decoder.fantasy_names != \
+            self.store.decoder.fantasy_names:
+            raise Exception(f"{file_path} has other fantasy drivers than "
+                f"entries.csv")
+        for row in rows[1:]:
+            if len(row) == 0:
+                continue
+            try:
+                entry_name, unknown_responses = self.store.check_row(row, 
+                    self.submissions_decoder)
+            except Exception:
+                continue
+            if len(unknown_responses) == 0:
+                self.store.add_row(row, self.submissions_decoder)
 
 
     def list_entries(self):
-        return sorted(self.entries.values())
-    
+        return self.store.list_entries()
+
+
+    def get_entry_by_name(self, entry_name):
+        """
+        Returns:
+        The Entry with the name or None if there isn't one
+        """
+        if entry_name not in self.store.entry_indexes:
+            return None
+        return self.store.entries[self.store.entry_indexes[entry_name]]
@@ -0,0 +1,233 @@
+import array
+import bisect
+
+
+class PickScorer():
+    def __init__(self, entry_var, points_by_id, missing_points=0,
+        missed_ids=[], missed_points=0):
+        """
+        Score a single entry on a question whose points come from the
+         subjects it picked, giving the same points as the question's whole
+         column scoring. Picking a subject more than once counts it once.
+
+        Keyword arguments:
+        entry_var -- an answer picking one or several subjects
+        points_by_id -- a dict of subject ID to the points for picking it, or
+         a list of them, one per pick position
+        missing_points -- the points for picking a subject not in
+         points_by_id
+        missed_ids -- subject IDs that cost missed_points each when not picked
+        missed_points -- the points for each of missed_ids not picked
+        """
+        self.entry_var = entry_var
+        self.points_by_id = points_by_id
+        self.missing_points = missing_points
+        self.missed_ids = missed_ids
+        self.missed_points = missed_points
+
+
+    def score(self, entry):
+        """
+        Returns:
+        The points the entry's answer is worth
+        """
+        picks = entry.get_response_ids(self.entry_var)
+        if type(picks) != list:
+            return self.points_by_id.get(picks, self.missing_points)
+        if type(self.points_by_id) == list:
+            return sum([position_points.get(subject_id, self.missing_points)
+                for position_points, subject_id in zip(self.points_by_id,
+                picks)])
+        picked = set(picks)
+        points = sum([self.points_by_id.get(subject_id, self.missing_points)
+            for subject_id in picked])
+        return points + self.missed_points * len([subject_id for subject_id
+            in self.missed_ids if subject_id not in picked])
+
+
+    def get_answer_points(self):
+        """
+        Returns:
+        A dict of entry_var to (points_by_id, missing_points) if every pick 
+         is worth set points wherever it is picked, otherwise an empty dict
+        """
+        if type(self.points_by_id) == list:
+            return {}
+        return {self.entry_var: (self.points_by_id, self.missing_points)}
+
+
+    def start(self, entries):
+        pass
+
+
+    def remove_entry(self, entry):
+        """
+        Take an entry out of the question before its answers change
+
+        Returns:
+        A dict of entry index to the change in that entry's points
+        """
+        return {entry.index: -self.score(entry)}
+
+
+    def add_entry(self, entry):
+        """
+        Score an entry that was added or had its answers changed
+
+        Returns:
+        A dict of entry index to the change in that entry's points
+        """
+        return {entry.index: self.score(entry)}
+
+
+class BingoScorer():
+    def __init__(self, answers):
+        """
+        Score a single entry's TRUE/FALSE answers: +5 for correctly TRUE, +1
+         for correctly FALSE and -3 for anything else
+
+        Keyword arguments:
+        answers -- a dict of entry_var to the correct 'TRUE' or 'FALSE'
+        """
+        self.answers = answers
+
+
+    def score(self, entry):
+        points = 0
+        for entry_var, correct_answer in self.answers.items():
+            if entry.get_response(entry_var) != correct_answer:
+                points -= 3
+            elif correct_answer == 'TRUE':
+                points += 5
+            else:
+                points += 1
+        return points
+
+
+    def get_answer_points(self):
+        # TRUE answers are counted as 1 and FALSE as 0
+        answer_points = {}
+        for entry_var, correct_answer in self.answers.items():
+            if correct_answer == 'TRUE':
+                answer_points[entry_var] = ({1: 5, 0: -3}, 0)
+            else:
+                answer_points[entry_var] = ({1: -3, 0: 1}, 0)
+        return answer_points
+
+
+    def start(self, entries):
+        pass
+
+
+    def remove_entry(self, entry):
+        return {entry.index: -self.score(entry)}
+
+
+    def add_entry(self, entry):
+        return {entry.index: self.score(entry)}
+
+
+class RankScorer():
+    def __init__(self, get_key, points):
+        """
+        Keep the entries of a question scored with rank_by_keys in key order,
+         so adding or changing one entry only re-scores the entries in the
+         positions that earn points. Entries with equal keys share a
+         position, as in rank_by_keys.
+
+        Keyword arguments:
+        get_key -- a function of an Entry returning its key, lowest is best,
+         or None if the entry isn't ranked on the question
+        points -- a dictionary mapping position to points
+        """
+        self.get_key = get_key
+        self.points = points
+        self.scoring_positions = max([position for position, position_points
+            in points.items() if position_points != 0], default=0)
+        # The distinct keys in order, with the indexes of the entries on each
+        self.keys = []
+        self.entries_by_key = {}
+
+
+    def get_answer_points(self):
+        # Points depend on how the other entries answered
+        return {}
+
+
+    def start(self, entries):
+        """
+        Rank entries that were already scored with rank_by_keys
+
+        Keyword arguments:
+        entries -- the Entry views to rank
+        """
+        for entry in entries:
+            key = self.get_key(entry)
+            if key is not None:
+                self.add_key(key, entry.index)
+
+
+    def add_key(self, key, entry_index):
+        if key not in self.entries_by_key:
+            bisect.insort(self.keys, key)
+            self.entries_by_key[key] = array.array('i')
+        self.entries_by_key[key].append(entry_index)
+
+
+    def remove_key(self, key, entry_index):
+        entry_indexes = self.entries_by_key[key]
+        entry_indexes.remove(entry_index)
+        if len(entry_indexes) == 0:
+            del self.entries_by_key[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+
+    def get_scoring_keys(self):
+        """
+        Returns:
+        A dict of key to the points of the entries on it, for the keys in 
+         positions that earn points
+        """
+        points_by_key = {}
+        position = 1
+        for key in self.keys:
+            if position > self.scoring_positions:
+                break
+            points_by_key[key] = self.points.get(position, 0)
+            position += len(self.entries_by_key[key])
+        return points_by_key
+
+
+    def change_key(self, entry, old_key, new_key):
+        """
+        Move an entry from one key to another, either may be None. Only the 
+         keys whose position now earns different points have their entries 
+         re-scored.
+
+        Returns:
+        A dict of entry index to the change in that entry's points
+        """
+        points_before = self.get_scoring_keys()
+        old_points = points_before.get(old_key, 0)
+        if old_key is not None:
+            self.remove_key(old_key, entry.index)
+        if new_key is not None:
+            self.add_key(new_key, entry.index)
+        points_after = self.get_scoring_keys()
+        point_changes = {}
+        for key in set(points_before) | set(points_after):
+            point_change = points_after.get(key, 0) - points_before.get(key, 0)
+            if point_change != 0 and key in self.entries_by_key:
+                for entry_index in self.entries_by_key[key]:
+                    point_changes[entry_index] = point_change
+        # The entry itself goes from its old key's points to its new key's
+        point_changes[entry.index] = points_after.get(new_key, 0) - old_points
+        return point_changes
+
+
+    def remove_entry(self, entry):
+        return self.change_key(entry, self.get_key(entry), None)
+
+
+    def add_entry(self, entry):
+        return self.change_key(entry, None, self.get_key(entry))
@@ -0,0 +1,111 @@
+import csv
+import os
+import sys
+import tracemalloc
+
+from f1_quest.drivers import Drivers
+from f1_quest.entries import EntryDecoder, EntryStore
+from f1_quest.subject_ids import SubjectIds
+from f1_quest.tables import TABLE_BACKENDS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+BENCHMARK_SIZES = [10000, 100000]
+
+
+def measure_bytes(build):
+    """
+    Measure the memory still held by what a function builds
+
+    Keyword arguments:
+    build -- a function taking no arguments, its return value is kept alive
+     while measuring
+
+    Returns:
+    The number of bytes allocated by build that are still in use
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return after - before
+
+
+def read_entry_rows(data_dir):
+    """
+    Returns:
+    The header and data rows of entries.csv
+    """
+    file_path = os.path.join(data_dir, 'entries.csv')
+    if not os.path.exists(file_path):
+        raise Exception(f"{file_path} not found, exiting.")
+    with open(file_path, newline='') as file_pointer:
+        rows = list(csv.reader(file_pointer, delimiter=',', quotechar='"'))
+    return (rows[0], rows[1:])
+
+
+def run_memory_benchmark(data_dir=os.getenv('F1_DATA', 'data'),
+    sizes=BENCHMARK_SIZES):
+    """
+    Build leagues of the given sizes by repeating the rows of entries.csv
+     under new names, then report the bytes held per entry in an EntryStore
+     and per score table row for each table backend
+
+    Keyword arguments:
+    data_dir -- the directory with drivers.csv and entries.csv
+    sizes -- the numbers of entries to build
+
+    Returns:
+    A list of (size, what was measured, bytes per item) tuples
+    """
+    drivers = Drivers(data_dir=data_dir)
+    header_row, entry_rows = read_entry_rows(data_dir)
+    decoder = EntryDecoder(header_row, drivers)
+    name_idx = 1
+
+    def build_store(rows):
+        store = EntryStore(decoder, SubjectIds(), add_unknown_answers=True)
+        for row in rows:
+            store.add_row(row)
+        return store
+
+    results = []
+    for size in sizes:
+        rows = []
+        for entry_number in range(size):
+            row = list(entry_rows[entry_number % len(entry_rows)])
+            row[name_idx] = f"{row[name_idx]} {entry_number}"
+            rows.append(row)
+
+        entry_bytes = measure_bytes(lambda: build_store(rows))
+        results.append((size, 'EntryStore entry', entry_bytes / size))
+
+        entries = build_store(rows).list_entries()
+        for backend_name, table_class in TABLE_BACKENDS.items():
+            if backend_name == 'array' and numpy is None:
+                continue
+
+            def build_table():
+                table = table_class("Final Score", "Entry", "Points", int)
+                for points, entry in enumerate(entries):
+                    table.add_subject(points % 100, entry)
+                return table
+
+            table_bytes = measure_bytes(build_table)
+            results.append((size, f"{backend_name} table row",
+                table_bytes / size))
+    return results
+
+
+if __name__ == '__main__':
+    sizes = BENCHMARK_SIZES
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size, measured, bytes_per_item in run_memory_benchmark(sizes=sizes):
+        print(f"{size:>8} entries  {measured:<18} {bytes_per_item:>8.1f} bytes each")
@@ -1,11 +1,24 @@
+import bisect
 import csv
+import hashlib
+import json
+import operator
 import os
 
 from datetime import datetime
-from f1_quest.util import get_type_val
+from f1_quest.season_results import ChampionshipTimeline, SeasonResults
+from f1_quest.util import VersionedList, convert_val, get_header_idx, urlify_name
+
+
+# Bump when the layout of the season state checkpoint changes
+SEASON_STATE_VERSION = '3'
 
 
 class Race():
+    __slots__ = ['datetime', 'type', 'name', 'circuit', 'retirements', 
+        'safety_cars', 'laps', 'fancy_name', 'map_link', 'text_rep', 
+        'url_name', 'subject_id']
+
     def __init__(self, datetime, type, name, circuit, laps, fancy_name, map_link):
         self.datetime = datetime
         self.type = type
@@ -14,9 +27,12 @@ class Race():
         self.retirements = 0
         self.safety_cars = 0
         self.laps = laps
-        self.post_race_driver_points = None
         self.fancy_name = fancy_name
         self.map_link = map_link
+        # The text rep is how entries and pages refer to a race
+        self.text_rep = f"{self.datetime.strftime('%m/%d/%Y')}: {self.name} @ {self.circuit}"
+        self.url_name = urlify_name(self.text_rep)
+        self.subject_id = None
 
 
     def __lt__(self, other):
@@ -26,9 +42,13 @@ class Race():
     def __eq__(self, other):
         return self.datetime == other.datetime
 
+
+    def __hash__(self):
+        return hash(self.datetime)
+
     
     def __str__(self):
-        return f"{self.datetime.strftime('%m/%d/%Y')}: {self.name} @ {self.circuit}"
+        return self.text_rep
 
     
     def add_results(self, retirements, safety_cars):
@@ -36,6 +56,80 @@ class Race():
         self.safety_cars = safety_cars
 
 
+def compile_results_header(header_row, drivers):
+    """
+    Work out which columns of race_results.csv hold each value so rows 
+     can be decoded without looking up headers, raising if any are missing
+
+    Keyword arguments:
+    header_row -- dict of header name to column index
+    drivers -- the Drivers whose columns are needed
+
+    Returns:
+    A tuple of the race-wide column indexes, a list of (driver, getter) 
+     pairs where getter pulls the driver's QPos, Laps and Class columns 
+     from a row, and the largest column index used
+    """
+    race_columns = tuple(get_header_idx(header_row, header_name) for 
+        header_name in ['Retirements', 'Safety Cars', 'Driver of the Day', 
+        'Fastest Lap Winner'])
+    driver_columns = []
+    max_idx = max(race_columns)
+    for driver in drivers.list_all_drivers():
+        idxs = [get_header_idx(header_row, ' '.join([driver.name, column])) 
+            for column in ['QPos', 'Laps', 'Class']]
+        max_idx = max(max_idx, *idxs)
+        driver_columns.append((driver, operator.itemgetter(*idxs)))
+    return (race_columns, driver_columns, max_idx)
+
+
+class RaceCalendar():
+    def __init__(self, race_list):
+        """
+        Index a list of races for lookups by name and date
+
+        Keyword arguments:
+        race_list -- the Race objects to index
+        """
+        self.sorted_races = sorted(race_list)
+        self.race_datetimes = [race.datetime for race in self.sorted_races]
+        self.races_by_text_rep = {}
+        self.races_by_name = {}
+        self.races_by_date = {}
+        for race in race_list:
+            # Lookups return the first match in file order, like a scan
+            self.races_by_text_rep.setdefault(race.text_rep, race)
+            self.races_by_name.setdefault(race.name, race)
+            self.races_by_date.setdefault(race.datetime.date(), race)
+
+
+    def races_before(self, datetime):
+        """
+        Returns:
+        Sorted list of Race objects strictly before datetime
+        """
+        return self.sorted_races[:bisect.bisect_left(self.race_datetimes, 
+            datetime)]
+
+
+    def races_after(self, datetime):
+        """
+        Returns:
+        Sorted list of Race objects strictly after datetime
+        """
+        return self.sorted_races[bisect.bisect_right(self.race_datetimes, 
+            datetime):]
+
+
+    def races_between(self, start, end):
+        """
+        Returns:
+        Sorted list of Race objects at or after start and before end
+        """
+        return self.sorted_races[bisect.bisect_left(self.race_datetimes, 
+            start):bisect.bisect_left(self.race_datetimes, end)]
+
+
 
 class Races:
     def __init__(self, data_dir=os.getenv('F1_DATA', 'data'), file_name="races.csv"):
@@ -47,7 +141,11 @@ class Races:
         race_file_name -- The name of the csv in data_dir, defaults to races.csv
         results_file_name -- The name of the csv in data_dir, defaults to race_results.csv
         """
-        self.race_list = []
+        self.race_list = VersionedList()
+        self.calendar = None
+        self.calendar_version = None
+        self.season_results = None
+        self.timeline = None
         file_path = os.path.join(data_dir, file_name)
         if not os.path.exists(file_path):
             raise Exception(f"{file_path} not found, exiting.")
@@ -63,15 +161,31 @@ class Races:
                     circuit=row[3], laps=int(row[6]), fancy_name=row[5], 
                     map_link=row[7]))
 
+
+    def get_calendar(self):
+        """
+        Get the RaceCalendar index, rebuilding it if race_list has changed 
+         since it was built
+
+        Returns:
+        The RaceCalendar for race_list
+        """
+        if self.calendar is None or \
+            self.calendar_version != self.race_list.version:
+            self.calendar = RaceCalendar(self.race_list)
+            self.calendar_version = self.race_list.version
+        return self.calendar
+
     
     def list_races(self):
         """
-        Return a sorted list of races by datetime
+        Return a sorted list of races by datetime. The list is shared between 
+         calls and should not be modified.
 
         Returns:
         Sorted list of Race objects by datetime
         """
-        return sorted(self.race_list)
+        return self.get_calendar().sorted_races
 
 
     def list_races_before(self, datetime=datetime.now()):
@@ -84,7 +198,7 @@ class Races:
         Returns:
         Sorted list of Race objects before the specfied time 
         """
-        return sorted([race for race in self.race_list if race.datetime < datetime])
+        return self.get_calendar().races_before(datetime)
 
 
     def list_races_after(self, datetime=datetime.now()):
@@ -97,7 +211,21 @@ class Races:
         Returns:
         Sorted list of Race objects after the specfied time 
         """
-        return sorted([race for race in self.race_list if race.datetime > datetime])
+        return self.get_calendar().races_after(datetime)
+
+
+    def list_races_between(self, start, end):
+        """
+        List the races from one time up to another
+
+        Keyword arguments:
+        start -- the earliest time to include
+        end -- the time to stop before
+
+        Returns:
+        Sorted list of Race objects at or after start and before end
+        """
+        return self.get_calendar().races_between(start, end)
 
     
     def get_race_by_date(self, date=datetime.now()):
@@ -110,10 +238,7 @@ class Races:
         Returns:
         A corresponding race object or None
         """
-        for race in self.race_list:
-            if date.date() == race.datetime.date():
-                return race
-        return None
+        return self.get_calendar().races_by_date.get(date.date())
 
     
     def get_race_by_str(self, string):
@@ -126,10 +251,7 @@ class Races:
         Returns:
         The Race object that matches or None
         """
-        for race in self.race_list:
-            if race.__str__() == string:
-                return race
-        return None
+        return self.get_calendar().races_by_text_rep.get(string)
 
 
     def get_race_by_name(self, name):
@@ -142,15 +264,27 @@ class Races:
         Returns:
         The Race object that matches or None
         """
-        for race in self.race_list:
-            if race.name == name:
-                return race
-        return None
+        return self.get_calendar().races_by_name.get(name)
 
 
     def read_results(self, drivers, teams, 
         data_dir=os.getenv('F1_DATA', 'data'), file_name="race_results.csv",
-        datetime=datetime.now()):
+        datetime=datetime.now(), state_file_name="season_state.json"):
+        """
+        Apply the completed races in race_results.csv to the drivers, teams 
+         and races. Results already saved in the season state checkpoint are 
+         loaded from it and only the new rows are applied. If the checkpoint 
+         doesn't match the CSV every row is replayed.
+
+        Keyword arguments:
+        drivers -- the Drivers to add results to
+        teams -- the Teams to add races to
+        data_dir -- the directory with the CSV and the checkpoint
+        file_name -- the name of the results CSV
+        datetime -- only races before this time are read
+        state_file_name -- the name of the checkpoint in data_dir, or None 
+         to always replay every row
+        """
         file_path = os.path.join(data_dir, file_name)
 
         # Ensure teams have the correct list of drivers
@@ -158,7 +292,10 @@ class Races:
 
         if not os.path.exists(file_path):
             raise Exception(f"{file_path} not found, exiting.")
+        self.season_results = SeasonResults(drivers.list_all_drivers(), 
+            self.list_races())
         self.header_row = None
+        completed_rows = []
         with open(file_path, newline='') as file_pointer:
             file_reader = csv.reader(file_pointer, delimiter=',', quotechar='"')
             for row in file_reader:
@@ -166,34 +303,168 @@ class Races:
                     self.header_row = {}
                     for header, idx in zip(row, range(0, len(row))):
                         self.header_row[header] = idx
+                    results_columns = compile_results_header(self.header_row, 
+                        drivers)
+                    # The checkpoint only applies to the same columns, roster
+                    # and races, a race's type and laps change its results
+                    schema_hash = hash_strings([SEASON_STATE_VERSION] + row + 
+                        [driver.entry_rep for driver in 
+                        drivers.list_all_drivers()] + 
+                        [f"{race.text_rep} {race.type} {race.laps}" for race 
+                        in self.list_races()])
                     continue
                 race = self.get_race_by_str(row[0])
                 # Only read races that have completed
                 if race.datetime > datetime:
                     continue
-                retirements = get_type_val(row, self.header_row, 
-                    'Retirements', int)
-                safety_cars = get_type_val(row, self.header_row, 
-                    'Safety Cars', int)
-                race.add_results(retirements=retirements, 
-                    safety_cars=safety_cars)
-                for team in teams.list_all_teams():
-                    team.add_race(row[0])
-                for driver in drivers.list_all_drivers():
-                    driver_of_the_day = driver.name == get_type_val(row, 
-                        self.header_row, 'Driver of the Day')
-                    fastest_lap_winner = driver.name == get_type_val(row,
-                        self.header_row, 'Fastest Lap Winner')
-                    qpos = get_type_val(row, self.header_row, 
-                        ' '.join([driver.name, 'QPos']), int)
-                    laps = get_type_val(row, self.header_row, 
-                        ' '.join([driver.name, 'Laps']), int)
-                    classification = get_type_val(row, self.header_row, 
-                        ' '.join([driver.name, 'Class']), int)
-                    driver.add_race(race=race, 
-                        classification=classification, qpos=qpos, laps=laps, 
-                        driver_of_the_day=driver_of_the_day,
-                        fastest_lap=fastest_lap_winner)
-                
-                # Get post-race driver points
-                race.post_race_driver_points = drivers.get_points_table()
+                completed_rows.append((race, row))
+
+        row_hashes = [hash_strings(row) for race, row in completed_rows]
+        state = None
+        if state_file_name is not None:
+            state_path = os.path.join(data_dir, state_file_name)
+            state = read_season_state(state_path, schema_hash)
+        ingested_rows = 0
+        if state is not None and \
+            state['row_hashes'] == row_hashes[:len(state['row_hashes'])]:
+            self.load_season_state(state, drivers, teams)
+            ingested_rows = len(state['row_hashes'])
+
+        for race, row in completed_rows[ingested_rows:]:
+            self.add_result_row(race, row, drivers, teams, results_columns)
+
+        if state_file_name is not None and (state is None or 
+            ingested_rows != len(state['row_hashes']) or 
+            ingested_rows != len(completed_rows)):
+            self.write_season_state(state_path, schema_hash, row_hashes, 
+                drivers, teams)
+
+
+    def add_result_row(self, race, row, drivers, teams, results_columns):
+        """
+        Apply one row of race_results.csv to the race, teams and drivers
+
+        Keyword arguments:
+        race -- the Race the row is for
+        row -- the CSV row
+        drivers -- the Drivers to add results to
+        teams -- the Teams to add the race to
+        results_columns -- the columns from compile_results_header
+        """
+        ((retirements_idx, safety_cars_idx, driver_of_the_day_idx,
+            fastest_lap_idx), driver_columns, max_idx) = results_columns
+        if max_idx >= len(row):
+            raise Exception(f"{max_idx} not found in row")
+        retirements = convert_val(row[retirements_idx], int)
+        safety_cars = convert_val(row[safety_cars_idx], int)
+        race.add_results(retirements=retirements, safety_cars=safety_cars)
+        for team in teams.list_all_teams():
+            team.add_race(row[0])
+        driver_of_the_day_name = row[driver_of_the_day_idx]
+        fastest_lap_name = row[fastest_lap_idx]
+        for driver, get_driver_columns in driver_columns:
+            (qpos, laps, classification) = get_driver_columns(row)
+            qpos = convert_val(qpos, int)
+            laps = convert_val(laps, int)
+            classification = convert_val(classification, int)
+            driver_of_the_day = driver.name == driver_of_the_day_name
+            fastest_lap_winner = driver.name == fastest_lap_name
+            driver.add_race(race=race, 
+                classification=classification, qpos=qpos, laps=laps, 
+                driver_of_the_day=driver_of_the_day,
+                fastest_lap=fastest_lap_winner)
+
+
+    def get_timeline(self):
+        """
+        Get the championship after every completed race, rebuilt only when 
+         results have been added since it was last built
+
+        Returns:
+        A ChampionshipTimeline, or None before read_results
+        """
+        if self.season_results is None:
+            return None
+        if self.timeline is None or \
+            self.timeline_version != self.season_results.version:
+            self.timeline = ChampionshipTimeline(self.season_results)
+            self.timeline_version = self.season_results.version
+        return self.timeline
+
+
+    def get_standings_after(self, race):
+        """
+        Build the driver standings as they were after a race
+
+        Keyword arguments:
+        race -- the Race
+
+        Returns:
+        A Table of drivers by points, or None if the race hasn't been run
+        """
+        timeline = self.get_timeline()
+        if timeline is None or timeline.get_race_index(race) is None:
+            return None
+        return timeline.get_standings_table(timeline.get_race_index(race))
+
+
+    def write_season_state(self, state_path, schema_hash, row_hashes, drivers, 
+        teams):
+        """
+        Save the results applied so far as a JSON checkpoint
+        """
+        state = {'schema_hash': schema_hash, 'row_hashes': row_hashes, 
+            'drivers': {}, 'teams': {}, 'races': {}}
+        for driver in drivers.driver_list:
+            state['drivers'][driver.name] = driver.get_state()
+        for team in teams.list_all_teams():
+            state['teams'][team.name] = team.get_state()
+        for race_id in self.season_results.races_added:
+            race = self.season_results.race_list[race_id]
+            state['races'][race.text_rep] = {'retirements': race.retirements,
+                'safety_cars': race.safety_cars}
+        with open(state_path, 'w') as state_out:
+            state_out.write(json.dumps(state))
+
+
+    def load_season_state(self, state, drivers, teams):
+        """
+        Restore the drivers, teams and races from a checkpoint
+        """
+        for driver in drivers.driver_list:
+            driver.load_state(state['drivers'][driver.name])
+        for team in teams.list_all_teams():
+            team.load_state(state['teams'].get(team.name, {}))
+        for race_str, race_state in state['races'].items():
+            race = self.get_race_by_str(race_str)
+            race.add_results(retirements=race_state['retirements'], 
+                safety_cars=race_state['safety_cars'])
+
+
+
+def hash_strings(strings):
+    return hashlib.sha1('\x1f'.join(strings).encode('utf-8')).hexdigest()
+
+
+def read_season_state(state_path, schema_hash):
+    """
+    Read a season state checkpoint
+
+    Keyword arguments:
+    state_path -- the path to the checkpoint
+    schema_hash -- the hash of the results columns and roster it must match
+
+    Returns:
+    The checkpoint dict or None if it is missing, unreadable or for another 
+     schema
+    """
+    if not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, 'r') as state_pointer:
+            state = json.loads(state_pointer.read())
+    except ValueError:
+        return None
+    if state.get('schema_hash') != schema_hash:
+        return None
+    return state
@@ -1,18 +1,31 @@
+import heapq
 import json
 import os
 
 from datetime import datetime
 from f1_quest.answer_key import AnswerKey
-from f1_quest.util import urlify_name
+from f1_quest.tables import Table
 from jinja2 import Environment, FileSystemLoader
 
 
+# Entries per page of the overall standings
+STANDINGS_PAGE_SIZE = 100
+# Entries shown above and below an entry on its own page
+NEIGHBOURHOOD_RADIUS = 3
+# Pages linked either side of the current page, besides the first and last
+PAGER_RADIUS = 2
+# Entries listed against one answer, the rest are only counted
+MATCHING_ENTRIES_LIMIT = 50
+# Movers shown on the index, movers.json has all of them
+MOVERS_LIMIT = 20
+
+
 def table_to_series(ak, race_list, results_table):
     series_list = []
     min_y = 1000
     max_y = 0
     for entry in results_table:
-        entry_obj = {'name': entry, 'values': [], 'color': ak.entries.entries[entry].color}
+        entry_obj = {'name': entry, 'values': [], 'color': ak.entries.get_entry_by_name(entry).color}
         for race in race_list:
             if not race in results_table[entry]:
                 continue
@@ -25,11 +38,104 @@ def table_to_series(ak, race_list, results_table):
     return (min_y, max_y, series_list)
 
 
+def pager_pages(page_number, page_count, radius=PAGER_RADIUS):
+    """
+    Pick the pages a pager links to, so it stays the same size however many
+     pages there are
+
+    Keyword arguments:
+    page_number -- the page being shown
+    page_count -- the number of pages
+    radius -- the pages linked either side of page_number
+
+    Returns:
+    A list of the first page, the pages within radius of page_number and the
+     last page in order, with None where pages are skipped
+    """
+    pages = set([1, page_count])
+    pages.update(range(max(1, page_number - radius), 
+        min(page_count, page_number + radius) + 1))
+    pager = []
+    for page in sorted(pages):
+        if len(pager) > 0 and page > pager[-1] + 1:
+            pager.append(None)
+        pager.append(page)
+    return pager
+
+
+def results_for_rows(results_table, rows):
+    """
+    Returns:
+    The part of a results table, entry name to race name to score, for the 
+     subjects of the rows
+    """
+    row_names = set([row.subject_str for row in rows])
+    return {entry_name: entry_results for entry_name, entry_results in 
+        results_table.items() if entry_name in row_names}
+
+
+def previous_standings(results_table, race_name):
+    """
+    Rebuild the overall standings after an earlier race from the saved 
+     results table
+
+    Keyword arguments:
+    results_table -- the overall results, entry name to race name to score
+    race_name -- the race to rebuild the standings after
+
+    Returns:
+    A Table of entry names and their scores after that race, or None if no
+     scores were saved for that race
+    """
+    table = Table("Previous Standings", "Entry", "Points", int, 
+        show_values=False, show_entries=False)
+    for entry_name, entry_results in results_table.items():
+        if race_name in entry_results:
+            table.add_subject(entry_results[race_name], entry_name)
+    if len(table.subjects) == 0:
+        return None
+    return table
+
+
+def top_movers(movers, k=MOVERS_LIMIT):
+    """
+    Pick the movers to show on the index
+
+    Keyword arguments:
+    movers -- TableDiffRows from Table.diff
+    k -- the most movers to return
+
+    Returns:
+    Up to k movers, the biggest changes in position first and then new and
+     dropped entries, keeping standings order between equal changes
+    """
+    def mover_key(mover):
+        if mover.pos_change is None:
+            return (1, 0)
+        return (0, -abs(mover.pos_change))
+
+    return heapq.nsmallest(k, [mover for mover in movers if 
+        mover.status != 'same'], key=mover_key)
+
+
 def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest", 
-    data_dir='data', datetime=datetime.now(), output_dir='docs'):
-    ak = AnswerKey(datetime=datetime, data_dir=data_dir)
+    data_dir='data', datetime=datetime.now(), output_dir='docs', 
+    table_backend='list', entry_workers=1, 
+    state_file_name='season_state.json', 
+    submissions_file_name='submissions.csv'):
+    ak = AnswerKey(datetime=datetime, data_dir=data_dir, 
+        table_backend=table_backend, entry_workers=entry_workers,
+        state_file_name=state_file_name, 
+        submissions_file_name=submissions_file_name)
     file_loader = FileSystemLoader('f1_quest/templates')
     env = Environment(loader=file_loader)
+    env.globals['pager_pages'] = pager_pages
+    env.globals['matching_entries_limit'] = MATCHING_ENTRIES_LIMIT
+    # Every page has the menu, so it only lists the entries of a league that
+    # fits on one standings page and links to the standings otherwise
+    env.globals['menu_entries'] = None
+    if len(ak.entries.list_entries()) <= STANDINGS_PAGE_SIZE:
+        env.globals['menu_entries'] = ak.entries.list_entries()
     race_list = [race.name for race in ak.races.list_races_before(datetime)]
 
     index = env.get_template('index.html')
@@ -43,20 +149,73 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         results_table_pointer = open(results_table_path, 'r')
         results_table = json.loads(results_table_pointer.read())
     curr_race = ak.races.list_races_before(datetime)[-1]
-    for subject in ak.get_overall_standings().get_ordered_subjects():
-        if str(subject.subject) not in results_table:
-            results_table[str(subject.subject)] = {}
-        results_table[str(subject.subject)][curr_race.name] = subject.score
+    overall_table = ak.get_overall_standings()
+    for subject in overall_table.get_ordered_subjects():
+        if subject.subject_str not in results_table:
+            results_table[subject.subject_str] = {}
+        results_table[subject.subject_str][curr_race.name] = subject.score
     with open(results_table_path, 'w') as results_table_out:
         results_table_out.write(json.dumps(results_table))
-    (min_y, max_y, series_list) = table_to_series(ak, race_list, results_table)
+
+    # Who moved since the previous race, also published as a JSON feed
+    movers = []
+    previous_table = None
+    if len(race_list) > 1:
+        # Without saved scores for the previous race every entry would look
+        # new, so there are no movers to report
+        previous_table = previous_standings(results_table, race_list[-2])
+    if previous_table is not None:
+        movers = overall_table.diff(previous_table)
+    with open(os.path.join(output_dir, 'movers.json'), 'w') as movers_out:
+        movers_out.write(json.dumps({'race': curr_race.name, 
+            'previous_race': race_list[-2] if previous_table is not None 
+                else None,
+            'movers': [mover.to_dict() for mover in movers]}))
+
+    # How many entries gave each answer, read from the counts kept as 
+    # entries are added rather than from the entries themselves
+    pick_counts = ak.entries.store.pick_counts
+    with open(os.path.join(output_dir, 'pick_counts.json'), 'w') as \
+        pick_counts_out:
+        pick_counts_out.write(json.dumps(pick_counts.to_dict(
+            ak.get_answer_points())))
+
+    # The index only shows, and plots, the first page of the standings
+    page_count = max(1, -(-len(overall_table.subjects) // STANDINGS_PAGE_SIZE))
+    first_page = overall_table.top_k(STANDINGS_PAGE_SIZE)
+    first_page_results = results_for_rows(results_table, first_page)
+    (min_y, max_y, series_list) = table_to_series(ak, race_list, 
+        first_page_results)
     with open(os.path.join(output_dir, 'index.html'), 'w') as out:
-        out.write(index.render(overall_table=ak.get_overall_standings(), 
+        out.write(index.render(overall_table=overall_table, 
+            standings_rows=first_page, page_count=page_count,
+            movers=top_movers(movers), 
+            mover_count=len([mover for mover in movers if 
+                mover.status != 'same']),
             base_url=base_url, questions=ak.questions,
             entries=ak.entries, drivers=ak.drivers,
             races=ak.races, teams=ak.teams, race_list=json.dumps(race_list), 
             series_list=json.dumps(series_list), 
-            results_table=json.dumps(results_table), min_y=min_y, max_y=max_y))
+            results_table=json.dumps(first_page_results), min_y=min_y, 
+            max_y=max_y))
+
+    standings_template = env.get_template('standings.html')
+    output_subdir = os.path.join(output_dir, "standings")
+    if not os.path.exists(output_subdir):
+        os.makedirs(output_subdir)
+    if not os.path.isdir(output_subdir):
+        raise Exception(f"{output_subdir} is not a directory")
+    for page_number in range(1, page_count + 1):
+        with open(os.path.join(output_subdir, f"page_{page_number}.html"), 
+            'w') as out:
+            out.write(standings_template.render(overall_table=overall_table,
+                standings_rows=overall_table.page(
+                    (page_number - 1) * STANDINGS_PAGE_SIZE, 
+                    STANDINGS_PAGE_SIZE), 
+                page_number=page_number, page_count=page_count,
+                base_url=base_url, questions=ak.questions,
+                entries=ak.entries, drivers=ak.drivers,
+                races=ak.races, teams=ak.teams))
     
 
     result = env.get_template('result.html')
@@ -67,16 +226,43 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         raise Exception(f"{output_subdir} is not a directory")
     for question in ak.questions:
         results_table = question.write_results_table()
-        (min_y, max_y, series_list) = table_to_series(ak, race_list, results_table)
-        with open(os.path.join(output_subdir, 
-            f"{urlify_name(question.short_name)}.html"), 'w') as out:
-            out.write(result.render(question=question, 
-                base_url=base_url, questions=ak.questions,
-                entries=ak.entries, drivers=ak.drivers,
-                races=ak.races, teams=ak.teams, race_list=json.dumps(race_list), 
-                series_list=json.dumps(series_list), 
-                results_table=json.dumps(results_table), min_y=min_y, 
-                max_y=max_y))
+        # Like the standings, the entries' final scores are split into pages
+        # and only the entries on a page are plotted
+        score_page_count = 1
+        if question.score is not None:
+            score_page_count = max(1, 
+                -(-len(question.score.subjects) // STANDINGS_PAGE_SIZE))
+        for score_page_number in range(1, score_page_count + 1):
+            score_rows = None
+            plot_rows = first_page
+            if question.score is not None:
+                score_rows = question.score.page(
+                    (score_page_number - 1) * STANDINGS_PAGE_SIZE,
+                    STANDINGS_PAGE_SIZE)
+                plot_rows = score_rows
+            page_results = results_for_rows(results_table, plot_rows)
+            (min_y, max_y, series_list) = table_to_series(ak, race_list, 
+                page_results)
+            page_names = []
+            if score_page_number == 1:
+                page_names.append(question.url_name)
+            if score_page_count > 1:
+                page_names.append(
+                    f"{question.url_name}_page_{score_page_number}")
+            for page_name in page_names:
+                with open(os.path.join(output_subdir, f"{page_name}.html"), 
+                    'w') as out:
+                    out.write(result.render(question=question, 
+                        pick_counts=pick_counts, score_rows=score_rows,
+                        score_page_number=score_page_number,
+                        score_page_count=score_page_count,
+                        base_url=base_url, questions=ak.questions,
+                        entries=ak.entries, drivers=ak.drivers,
+                        races=ak.races, teams=ak.teams, 
+                        race_list=json.dumps(race_list), 
+                        series_list=json.dumps(series_list), 
+                        results_table=json.dumps(page_results), 
+                        min_y=min_y, max_y=max_y))
 
     entry_template = env.get_template('entry.html')
     output_subdir = os.path.join(output_dir, "entries")
@@ -86,8 +272,11 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         raise Exception(f"{output_subdir} is not a directory")
     for entry in ak.entries.list_entries():
         with open(os.path.join(output_dir, "entries", 
-            f"{urlify_name(entry.entry_name)}.html"), 'w') as out:
+            f"{entry.url_name}.html"), 'w') as out:
             out.write(entry_template.render(entry=entry, 
+                overall_table=overall_table, 
+                neighbourhood_rows=overall_table.rows_around(entry, 
+                    NEIGHBOURHOOD_RADIUS),
                 base_url=base_url, questions=ak.questions,
                 entries=ak.entries, drivers=ak.drivers,
                 races=ak.races, teams=ak.teams))
@@ -100,7 +289,7 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         raise Exception(f"{output_subdir} is not a directory")
     for driver in ak.drivers.list_all_drivers():
         with open(os.path.join(output_dir, "drivers", 
-            f"{urlify_name(str(driver))}.html"), 'w') as out:
+            f"{driver.url_name}.html"), 'w') as out:
             out.write(driver_template.render(driver=driver, 
                 base_url=base_url, questions=ak.questions,
                 entries=ak.entries, drivers=ak.drivers,
@@ -114,7 +303,7 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         raise Exception(f"{output_subdir} is not a directory")
     for team in ak.teams.list_all_teams():
         with open(os.path.join(output_dir, "teams", 
-            f"{urlify_name(team.name)}.html"), 'w') as out:
+            f"{team.url_name}.html"), 'w') as out:
             out.write(team_template.render(team=team, 
                 base_url=base_url, questions=ak.questions,
                 entries=ak.entries, drivers=ak.drivers,
@@ -128,7 +317,7 @@ def render_static_pages(base_url="https://jesseerdmann.github.io/F1_quest",
         raise Exception(f"{output_subdir} is not a directory")
     for race in ak.races.list_races():
         with open(os.path.join(output_dir, "races", 
-            f"{urlify_name(str(race))}.html"), 'w') as out:
+            f"{race.url_name}.html"), 'w') as out:
             out.write(race_template.render(race=race, 
                 base_url=base_url, questions=ak.questions,
                 entries=ak.entries, drivers=ak.drivers,
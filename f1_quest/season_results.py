@@ -0,0 +1,373 @@
+import array
+
+from collections.abc import Mapping
+from f1_quest.drivers import DriverRaceResult
+from f1_quest.tables import Table
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# The per-race values kept for every driver, all stored as ints
+RESULT_COLUMNS = ['classification', 'qpos', 'laps', 'points', 'fastest_lap',
+    'driver_of_the_day']
+
+
+class DriverRaces(Mapping):
+    def __init__(self, season_results, driver_id):
+        """
+        A dict-like view of one driver's race results, keyed by race name,
+         reading and writing the columns of a SeasonResults
+
+        Keyword arguments:
+        season_results -- the SeasonResults holding the columns
+        driver_id -- the driver's row in season_results
+        """
+        self.season_results = season_results
+        self.driver_id = driver_id
+
+
+    def __getitem__(self, race_name):
+        if race_name not in self.season_results.race_ids:
+            raise KeyError(race_name)
+        result = self.season_results.get_result(self.driver_id,
+            self.season_results.race_ids[race_name])
+        if result is None:
+            raise KeyError(race_name)
+        return result
+
+
+    def __setitem__(self, race_name, race_result):
+        self.season_results.add_result(self.driver_id, race_name, race_result)
+
+
+    def __iter__(self):
+        for race_id in self.season_results.races_added:
+            if self.season_results.entered[self.season_results.get_cell(
+                self.driver_id, race_id)]:
+                yield self.season_results.race_list[race_id].name
+
+
+    def __len__(self):
+        return sum(self.season_results.get_driver_column('entered',
+            self.driver_id))
+
+
+class SeasonResults():
+    def __init__(self, drivers, races):
+        """
+        Every driver's race results in flat int arrays, one per column in
+         RESULT_COLUMNS, indexed by (driver_id, race_id). A driver's results
+         are one contiguous slice and a race's results are a strided slice.
+         Adding the drivers replaces their races dict with a DriverRaces view.
+
+        Keyword arguments:
+        drivers -- the Driver objects to keep results for
+        races -- every Race in the season
+        """
+        self.race_list = list(races)
+        self.race_count = len(self.race_list)
+        self.race_ids = {}
+        for race_id, race in enumerate(self.race_list):
+            self.race_ids[race.name] = race_id
+        self.driver_list = []
+        self.driver_ids = {}
+        self.columns = {}
+        for column in RESULT_COLUMNS:
+            self.columns[column] = array.array('i')
+        self.entered = array.array('b')
+        # Race IDs in the order results arrived, for ordering driver views, 
+        # as dict keys so checking for a race doesn't scan them
+        self.races_added = {}
+        # Bumped on every change so derived timelines know to rebuild
+        self.version = 0
+        for driver in drivers:
+            self.add_driver(driver)
+
+
+    def add_driver(self, driver):
+        """
+        Add a row for a driver and point its races at the view of that row
+
+        Keyword arguments:
+        driver -- the Driver to add
+        """
+        driver_id = len(self.driver_list)
+        self.driver_list.append(driver)
+        self.driver_ids[driver.name] = driver_id
+        for column in RESULT_COLUMNS:
+            self.columns[column].extend([0] * self.race_count)
+        self.entered.extend([0] * self.race_count)
+        driver.races = DriverRaces(self, driver_id)
+
+
+    def get_cell(self, driver_id, race_id):
+        return driver_id * self.race_count + race_id
+
+
+    def add_result(self, driver_id, race_name, race_result):
+        """
+        Record a driver's result in a race
+
+        Keyword arguments:
+        driver_id -- the driver's row
+        race_name -- the name of the race
+        race_result -- a DriverRaceResult with the values to store
+        """
+        if race_name not in self.race_ids:
+            raise Exception(f"{race_name} is not a race in this season")
+        race_id = self.race_ids[race_name]
+        cell = self.get_cell(driver_id, race_id)
+        for column in RESULT_COLUMNS:
+            self.columns[column][cell] = int(getattr(race_result, column))
+        self.entered[cell] = 1
+        self.version += 1
+        if race_id not in self.races_added:
+            self.races_added[race_id] = None
+
+
+    def get_result(self, driver_id, race_id):
+        """
+        Returns:
+        A DriverRaceResult built from the columns or None if the driver has
+         no result for the race
+        """
+        cell = self.get_cell(driver_id, race_id)
+        if not self.entered[cell]:
+            return None
+        columns = self.columns
+        return DriverRaceResult(race=self.race_list[race_id].name,
+            points=columns['points'][cell],
+            classification=columns['classification'][cell],
+            qpos=columns['qpos'][cell], laps=columns['laps'][cell],
+            fastest_lap=columns['fastest_lap'][cell] == 1,
+            driver_of_the_day=columns['driver_of_the_day'][cell] == 1)
+
+
+    def get_column_array(self, column):
+        if column == 'entered':
+            return self.entered
+        return self.columns[column]
+
+
+    def get_driver_column(self, column, driver_id):
+        """
+        Returns:
+        An array of a column's values for one driver, one per race
+        """
+        start = self.get_cell(driver_id, 0)
+        return self.get_column_array(column)[start:start + self.race_count]
+
+
+    def get_race_column(self, column, race_name):
+        """
+        Returns:
+        An array of a column's values for one race, one per driver
+        """
+        return self.get_column_array(column)[
+            self.race_ids[race_name]::self.race_count]
+
+
+    def get_matrix(self, column):
+        """
+        Get a column as a drivers x races NumPy array sharing the column's
+         memory
+
+        Returns:
+        The 2D array, or None if NumPy isn't installed
+        """
+        if numpy is None or len(self.driver_list) == 0 or self.race_count == 0:
+            return None
+        column_array = self.get_column_array(column)
+        dtype = numpy.int8 if column == 'entered' else numpy.intc
+        return numpy.frombuffer(column_array, dtype=dtype).reshape(
+            len(self.driver_list), self.race_count)
+
+
+    def count_on_lead_lap(self, race):
+        """
+        Count the drivers that completed every lap of a race
+
+        Keyword arguments:
+        race -- the Race to count
+
+        Returns:
+        The number of drivers with a result whose laps equal the race's laps
+        """
+        if race.name not in self.race_ids:
+            return 0
+        laps = self.get_matrix('laps')
+        if laps is not None:
+            race_id = self.race_ids[race.name]
+            entered = self.get_matrix('entered')
+            return int(numpy.count_nonzero((laps[:, race_id] == race.laps) &
+                (entered[:, race_id] == 1)))
+        drivers_on_lead_lap = 0
+        for driver_laps, entered in zip(self.get_race_column('laps', race.name),
+            self.get_race_column('entered', race.name)):
+            if entered and driver_laps == race.laps:
+                drivers_on_lead_lap += 1
+        return drivers_on_lead_lap
+
+
+    def count_by_driver(self, column, minimum, maximum):
+        """
+        Count each driver's races where a column is in a range, like
+         classification 1 to 3 for podiums or qpos 1 to 10 for Q3s
+
+        Keyword arguments:
+        column -- the column to test
+        minimum -- the lowest value counted
+        maximum -- the highest value counted
+
+        Returns:
+        A dict of driver name to count
+        """
+        values = self.get_matrix(column)
+        if values is not None:
+            counted = (values >= minimum) & (values <= maximum) & \
+                (self.get_matrix('entered') == 1)
+            counts = counted.sum(axis=1)
+            return {driver.name: int(count) for driver, count in
+                zip(self.driver_list, counts)}
+        counts = {}
+        for driver_id, driver in enumerate(self.driver_list):
+            counts[driver.name] = 0
+            for value, entered in zip(self.get_driver_column(column, driver_id),
+                self.get_driver_column('entered', driver_id)):
+                if entered and minimum <= value <= maximum:
+                    counts[driver.name] += 1
+        return counts
+
+
+class ChampionshipTimeline():
+    def __init__(self, season_results):
+        """
+        The drivers' championship after every completed race, worked out 
+         once from a SeasonResults. points and wins hold each driver's 
+         running totals and positions their championship position, ranked on
+         points then wins with drivers level on both sharing a position. All
+         three are races x drivers, NumPy arrays when NumPy is installed and 
+         lists of lists otherwise, with races in the order they were run.
+
+        Keyword arguments:
+        season_results -- the SeasonResults to build from
+        """
+        self.driver_list = season_results.driver_list
+        self.race_list = [season_results.race_list[race_id] for race_id in 
+            season_results.races_added]
+        self.race_index = {}
+        for race_index, race in enumerate(self.race_list):
+            self.race_index[race.name] = race_index
+        race_ids = list(season_results.races_added)
+
+        if season_results.get_matrix('points') is not None and \
+            len(race_ids) > 0:
+            race_points = season_results.get_matrix('points')[:, race_ids] + \
+                season_results.get_matrix('fastest_lap')[:, race_ids]
+            race_wins = (season_results.get_matrix('classification')[:, 
+                race_ids] == 1) & \
+                (season_results.get_matrix('entered')[:, race_ids] == 1)
+            self.points = race_points.T.cumsum(axis=0)
+            self.wins = race_wins.T.cumsum(axis=0)
+            # Points count first, wins only separate drivers level on points
+            keys = self.points * (len(race_ids) + 1) + self.wins
+            self.positions = (keys[:, None, :] > keys[:, :, None]).sum(
+                axis=2) + 1
+            return
+
+        self.points = []
+        self.wins = []
+        self.positions = []
+        driver_points = [0] * len(self.driver_list)
+        driver_wins = [0] * len(self.driver_list)
+        for race_id in race_ids:
+            for driver_id in range(len(self.driver_list)):
+                cell = season_results.get_cell(driver_id, race_id)
+                driver_points[driver_id] += \
+                    season_results.columns['points'][cell] + \
+                    season_results.columns['fastest_lap'][cell]
+                if season_results.entered[cell] and \
+                    season_results.columns['classification'][cell] == 1:
+                    driver_wins[driver_id] += 1
+            keys = list(zip(driver_points, driver_wins))
+            self.points.append(list(driver_points))
+            self.wins.append(list(driver_wins))
+            self.positions.append([1 + sum([1 for other_key in keys if 
+                other_key > key]) for key in keys])
+
+
+    def get_race_index(self, race):
+        """
+        Returns:
+        The race's row in the timeline or None if it hasn't been run
+        """
+        return self.race_index.get(race.name)
+
+
+    def get_points_after(self, race_index):
+        """
+        Returns:
+        Each driver's points after a race, in driver_list order
+        """
+        return [int(points) for points in self.points[race_index]]
+
+
+    def get_drivers_at(self, race_index, position):
+        """
+        Get the drivers in a championship position after a race
+
+        Keyword arguments:
+        race_index -- the race's row in the timeline
+        position -- the championship position
+
+        Returns:
+        A list of Drivers, more than one if they are level on points and wins
+        """
+        return [driver for driver, driver_position in zip(self.driver_list, 
+            self.positions[race_index]) if driver_position == position]
+
+
+    def get_first_race_held(self, position):
+        """
+        Find the race from which the driver or drivers in a championship 
+         position after the last race have held it without a break
+
+        Keyword arguments:
+        position -- the championship position
+
+        Returns:
+        The race's row in the timeline or None if no races have been run
+        """
+        if len(self.race_list) == 0:
+            return None
+        if numpy is not None and type(self.positions) != list:
+            holders = self.positions == position
+            changed = numpy.flatnonzero((holders != holders[-1]).any(axis=1))
+            if len(changed) == 0:
+                return 0
+            return int(changed[-1]) + 1
+        last_holders = self.get_drivers_at(len(self.race_list) - 1, position)
+        for race_index in reversed(range(len(self.race_list) - 1)):
+            if self.get_drivers_at(race_index, position) != last_holders:
+                return race_index + 1
+        return 0
+
+
+    def get_standings_table(self, race_index):
+        """
+        Build the driver standings after a race
+
+        Keyword arguments:
+        race_index -- the race's row in the timeline
+
+        Returns:
+        A Table of drivers by points
+        """
+        table = Table('Driver Standings', 'Driver', 'Points', int)
+        for driver, points in zip(self.driver_list, 
+            self.get_points_after(race_index)):
+            table.add_subject(points, driver)
+        return table
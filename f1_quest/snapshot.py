@@ -0,0 +1,88 @@
+import hashlib
+import os
+import pickle
+
+
+# Bump when the classes that are saved in a snapshot change shape
+SNAPSHOT_VERSION = 13
+
+
+def hash_file(file_path):
+    """
+    Hash the contents of a file
+
+    Keyword arguments:
+    file_path -- the file to hash
+
+    Returns:
+    The hex sha1 of the file contents
+    """
+    with open(file_path, 'rb') as file_pointer:
+        return hashlib.sha1(file_pointer.read()).hexdigest()
+
+
+def get_snapshot_key(data_dir, file_names, completed_races):
+    """
+    Build the key a snapshot must match to be used: the snapshot version, the
+     races whose results were applied and the content hash of every input 
+     file. Scoring at any time between the same two races gives the same key.
+
+    Keyword arguments:
+    data_dir -- the directory with the input files
+    file_names -- the input files the snapshot is built from
+    completed_races -- the text reps of the races results were read for
+
+    Returns:
+    A tuple to compare against the saved key, or None if an input file is
+     missing
+    """
+    file_hashes = []
+    for file_name in file_names:
+        file_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(file_path):
+            return None
+        file_hashes.append((file_name, hash_file(file_path)))
+    return (SNAPSHOT_VERSION, tuple(completed_races), tuple(file_hashes))
+
+
+def read_snapshot(snapshot_path, snapshot_key):
+    """
+    Load a snapshot of the parsed model. The snapshot is a pickle, only point
+     this at files written by write_snapshot.
+
+    Keyword arguments:
+    snapshot_path -- the path of the snapshot
+    snapshot_key -- the key from get_snapshot_key
+
+    Returns:
+    The saved model or None if there is no snapshot or it is for other inputs
+    """
+    if snapshot_key is None or not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'rb') as snapshot_pointer:
+            # The key is stored first so a stale model is never unpickled
+            if pickle.load(snapshot_pointer) != snapshot_key:
+                return None
+            return pickle.load(snapshot_pointer)
+    except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def write_snapshot(snapshot_path, snapshot_key, model):
+    """
+    Save a snapshot of the parsed model
+
+    Keyword arguments:
+    snapshot_path -- the path of the snapshot
+    snapshot_key -- the key from get_snapshot_key
+    model -- the objects to save
+    """
+    if snapshot_key is None:
+        return
+    # Write beside the snapshot and swap it in so readers never see half a file
+    temp_path = f"{snapshot_path}.tmp"
+    with open(temp_path, 'wb') as snapshot_out:
+        pickle.dump(snapshot_key, snapshot_out, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(model, snapshot_out, pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, snapshot_path)
@@ -0,0 +1,80 @@
+class SubjectIds():
+    def __init__(self):
+        """
+        Give every driver, team, race and entry a small integer ID, in the
+         order they are added. The ID is stored on the subject as subject_id
+         and answers are turned into IDs by the subject's string, so scoring
+         can join on ints instead of display strings.
+        """
+        self.subjects = []
+        self.ids_by_str = {}
+
+
+    def add_subject(self, subject, answerable=True):
+        """
+        Give a subject the next ID
+
+        Keyword arguments:
+        subject -- the object to number, it must have a subject_id attribute
+        answerable -- whether entries can name the subject in an answer, if so
+         its string must not be shared with another subject
+
+        Returns:
+        The subject's ID
+        """
+        if answerable:
+            subject_str = str(subject)
+            if subject_str in self.ids_by_str:
+                raise Exception(f"{subject_str} names more than one subject")
+            self.ids_by_str[subject_str] = len(self.subjects)
+        subject.subject_id = len(self.subjects)
+        self.subjects.append(subject)
+        return subject.subject_id
+
+
+    def add_subjects(self, subjects, answerable=True):
+        for subject in subjects:
+            self.add_subject(subject, answerable)
+
+
+    def add_answer(self, response):
+        """
+        Give an answer that names no subject an ID of its own, with the
+         answer string standing in as the subject. For reading entries
+         without the drivers, teams and races they answer with.
+
+        Returns:
+        The answer's ID
+        """
+        if response not in self.ids_by_str:
+            self.ids_by_str[response] = len(self.subjects)
+            self.subjects.append(response)
+        return self.ids_by_str[response]
+
+
+    def get_lookup_copy(self):
+        """
+        Copy the answer lookups without the subjects themselves, so answers
+         can be resolved in another process. Answers added to the copy get
+         IDs after the ones already given out.
+
+        Returns:
+        A SubjectIds with None in place of every subject
+        """
+        lookup_copy = SubjectIds()
+        lookup_copy.subjects = [None] * len(self.subjects)
+        lookup_copy.ids_by_str = dict(self.ids_by_str)
+        return lookup_copy
+
+
+    def get_id(self, response):
+        """
+        Returns:
+        The ID of the subject an answer names or None if it names none
+        """
+        return self.ids_by_str.get(response)
+
+
+    def get_subject(self, subject_id):
+        return self.subjects[subject_id]
+
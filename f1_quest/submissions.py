@@ -0,0 +1,197 @@
+import bisect
+import os
+import sys
+import time
+
+from f1_quest.answer_key import AnswerKey
+from f1_quest.entries import EntryDecoder, read_complete_rows
+
+
+# Above this many entries changing score, the standings are sorted again
+STANDINGS_REBUILD_CHANGES = 256
+
+
+class Standings():
+    def __init__(self, scores):
+        """
+        The overall standings as a sorted list of scores, so an entry's
+         position can be found and a changed score moved without ranking
+         every entry again. Entries on the same score share a position.
+
+        Keyword arguments:
+        scores -- every entry's score
+        """
+        # Negated so the best score sorts first
+        self.sorted_scores = sorted([-score for score in scores])
+
+
+    def add_score(self, score):
+        bisect.insort(self.sorted_scores, -score)
+
+
+    def move_score(self, old_score, new_score):
+        del self.sorted_scores[bisect.bisect_left(self.sorted_scores,
+            -old_score)]
+        bisect.insort(self.sorted_scores, -new_score)
+
+
+    def get_position(self, score):
+        """
+        Returns:
+        The position of an entry with the score
+        """
+        return bisect.bisect_left(self.sorted_scores, -score) + 1
+
+
+class EntrySubmissions():
+    def __init__(self, answer_key, data_dir=os.getenv('F1_DATA', 'data'),
+        file_name='submissions.csv'):
+        """
+        Take new and amended entries one at a time after an AnswerKey has
+         scored the league, scoring each against the answer key with the
+         question's entry scorer and moving it in the overall standings.
+         Questions ranked against the other entries only re-score the entries
+         in positions that earn points. The question tables are not changed,
+         rendering again rebuilds them with the submitted entries.
+
+        Entries are submitted directly or appended to a CSV in data_dir with
+         the same header as entries.csv, which poll reads from where it last
+         stopped. A row with the name of an entry already in the league
+         replaces that entry's answers.
+
+        Keyword arguments:
+        answer_key -- the AnswerKey that scored the league
+        data_dir -- the directory with the submissions CSV
+        file_name -- the name of the append-only submissions CSV, polled
+         from where the answer key stopped reading it
+        """
+        self.answer_key = answer_key
+        self.store = answer_key.entries.store
+        for scorer in answer_key.entry_scorers:
+            scorer.start(self.store.entries)
+        self.standings = Standings(self.store.scores)
+        self.file_path = os.path.join(data_dir, file_name)
+        self.file_offset = 0
+        self.decoder = None
+        entries = answer_key.entries
+        if entries.submissions_path is not None and os.path.abspath(
+            entries.submissions_path) == os.path.abspath(self.file_path):
+            # The answer key already applied the rows written so far
+            self.file_offset = entries.submissions_offset
+            self.decoder = entries.submissions_decoder
+
+
+    def submit(self, row, decoder=None):
+        """
+        Add or amend one entry and score it
+
+        Keyword arguments:
+        row -- the list of values from an entries.csv row
+        decoder -- an EntryDecoder for the row's header, or None if it is the
+         header of entries.csv
+
+        Returns:
+        A tuple of the Entry and its position in the overall standings
+        """
+        entry_name, unknown_responses = self.store.check_row(row, decoder)
+        if len(unknown_responses) > 0:
+            raise Exception(f"Answers from {entry_name} that name no driver, "
+                f"team or race or aren't TRUE or FALSE: " + '; '.join([
+                f"{entry_var} {response!r}" for entry_var, response in
+                unknown_responses]))
+
+        point_changes = {}
+
+        def add_point_changes(scorer_changes):
+            for entry_index, point_change in scorer_changes.items():
+                point_changes[entry_index] = point_changes.get(entry_index,
+                    0) + point_change
+
+        entry_index = self.store.entry_indexes.get(entry_name)
+        if entry_index is not None:
+            for scorer in self.answer_key.entry_scorers:
+                add_point_changes(scorer.remove_entry(
+                    self.store.entries[entry_index]))
+        entry, unknown_responses = self.store.add_row(row, decoder)
+        if entry_index is None:
+            self.standings.add_score(entry.score)
+            if entry.subject_id is None:
+                self.answer_key.subject_ids.add_subject(entry,
+                    answerable=False)
+        for scorer in self.answer_key.entry_scorers:
+            add_point_changes(scorer.add_entry(entry))
+
+        point_changes = [(entry_index, point_change) for entry_index, 
+            point_change in point_changes.items() if point_change != 0]
+        if len(point_changes) > STANDINGS_REBUILD_CHANGES:
+            # A shared position moving re-scores every entry on it, which is 
+            # quicker to sort again than to move one at a time
+            for entry_index, point_change in point_changes:
+                self.store.entries[entry_index].add_points(point_change)
+            self.standings = Standings(self.store.scores)
+        else:
+            for entry_index, point_change in point_changes:
+                changed_entry = self.store.entries[entry_index]
+                old_score = changed_entry.score
+                changed_entry.add_points(point_change)
+                self.standings.move_score(old_score, changed_entry.score)
+        return (entry, self.standings.get_position(entry.score))
+
+
+    def poll(self):
+        """
+        Submit the complete rows appended to the submissions CSV since the
+         last poll. The first poll reads the header.
+
+        Returns:
+        A tuple of a list of (Entry, position) for the rows submitted and a
+         list of (row, reason) for the rows that couldn't be
+        """
+        submitted = []
+        rejected = []
+        if not os.path.exists(self.file_path):
+            return (submitted, rejected)
+        rows, self.file_offset = read_complete_rows(self.file_path, 
+            self.file_offset)
+        if len(rows) == 0:
+            return (submitted, rejected)
+        rows = iter(rows)
+        if self.decoder is None:
+            header_row = next(rows, None)
+            self.decoder = EntryDecoder(header_row,
+                self.answer_key.drivers)
+            if self.decoder.fantasy_names != self.store.decoder.fantasy_names:
+                raise Exception(f"{self.file_path} has other fantasy drivers "
+                    f"than entries.csv")
+        for row in rows:
+            if len(row) == 0:
+                continue
+            try:
+                submitted.append(self.submit(row, self.decoder))
+            except Exception as error:
+                rejected.append((row, str(error)))
+        return (submitted, rejected)
+
+
+    def watch(self, interval=1.0):
+        """
+        Poll the submissions CSV forever, printing each entry's new score and
+         position
+
+        Keyword arguments:
+        interval -- the seconds to wait between polls
+        """
+        while True:
+            submitted, rejected = self.poll()
+            for entry, position in submitted:
+                print(f"{entry}: {entry.score} points, position {position}")
+            for row, reason in rejected:
+                print(f"Rejected: {reason}")
+            time.sleep(interval)
+
+
+if __name__ == '__main__':
+    data_dir = os.getenv('F1_DATA', 'data')
+    if len(sys.argv) > 1:
+        data_dir = sys.argv[1]
+    EntrySubmissions(AnswerKey(data_dir=data_dir), data_dir=data_dir).watch()
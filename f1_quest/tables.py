@@ -1,27 +1,82 @@
+import bisect
+import heapq
+
+from f1_quest.util import urlify_name
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
 class TableRow():
-    def __init__(self, score, subject, value=''):
-        self.score = score
+    __slots__ = ['_score', 'subject', 'subject_str', 'value', 
+        'matching_entries', 'pos', 'table']
+
+    def __init__(self, score, subject, value='', table=None, 
+        subject_str=None):
+        self._score = score
         self.subject = subject
+        # Rows are sorted and matched by the subject's string, it is built
+        # once on first use unless the caller already has it. Most rows of an
+        # entry score table never match an entry, so that list waits too.
+        if subject_str is not None:
+            self.subject_str = subject_str
         self.value = value
-        self.matching_entries = []
         self.pos = None
+        self.table = table
+
+
+    def __getattr__(self, name):
+        # Only reached for an unset slot that is built on first use
+        if name == 'subject_str':
+            self.subject_str = str(self.subject)
+            return self.subject_str
+        if name == 'matching_entries':
+            self.matching_entries = []
+            return self.matching_entries
+        raise AttributeError(name)
+
+
+    @property
+    def score(self):
+        return self._score
+
+
+    @score.setter
+    def score(self, score):
+        """
+        Changing the score moves the row, so let the owning table know its
+         cached order is stale
+        """
+        self._score = score
+        if self.table is not None:
+            self.table.row_changed(self)
+
+    
+    @property
+    def subject_url(self):
+        """
+        The subject's page name, taken from the subject when it has one
+        """
+        return subject_url_name(self.subject, self.subject_str)
 
     
     def __lt__(self, other):
         if self.score < other.score:
             return True
         elif self.score == other.score:
-            return str(self.subject) < str(other.subject)
+            return self.subject_str < other.subject_str
         return False
 
 
     def __eq__(self, other):
         return self.score == other.score and \
-            str(self.subject) == str(other.subject)
+            self.subject_str == other.subject_str
 
 
     def __str__(self):
-        string_val = f"{self.pos} {self.score} {str(self.subject)} {self.value} {len(self.matching_entries)} entries"
+        string_val = f"{self.pos} {self.score} {self.subject_str} {self.value} {len(self.matching_entries)} entries"
         return string_val
 
 
@@ -32,10 +87,163 @@ class TableRow():
         self.value = value
 
 
+def subject_url_name(subject, subject_str):
+    """
+    Models build their url_name once, anything else is urlified on demand
+
+    Keyword arguments:
+    subject -- the subject of a row
+    subject_str -- the subject as a string
+
+    Returns:
+    The name of the subject's page without the extension
+    """
+    url_name = getattr(subject, 'url_name', None)
+    if url_name is None:
+        url_name = urlify_name(subject_str)
+    return url_name
+
+
+RANKING_MODES = ('competition', 'dense', 'ordinal')
+
+
+class RankIndex():
+    def __init__(self, ordered_rows, ranking='competition'):
+        """
+        Index an ordered list of rows by position and by subject so lookups
+         don't have to walk the table. Rows with equal scores are tied.
+
+        Keyword arguments:
+        ordered_rows -- the rows in table order
+        ranking -- how tied rows are numbered, with scores 9, 7, 7, 5:
+         'competition' gives 1, 2, 2, 4 (the F1 standings style),
+         'dense' gives 1, 2, 2, 3 and 'ordinal' gives 1, 2, 3, 4
+        """
+        self.ranking = ranking
+        self.ordered_rows = ordered_rows
+        self.positions = []
+        # Lists of tied rows, in order, and the tied list each row belongs to
+        self.groups = []
+        self.group_of_row = []
+        self.pos_by_subject = {}
+
+        prev_score = None
+        for abs_pos, row in enumerate(ordered_rows, start=1):
+            if not self.groups or row.score != prev_score:
+                self.groups.append([])
+                group_pos = abs_pos
+            self.groups[-1].append(row)
+            self.group_of_row.append(self.groups[-1])
+            prev_score = row.score
+
+            if ranking == 'competition':
+                pos = group_pos
+            elif ranking == 'dense':
+                pos = len(self.groups)
+            else:
+                pos = abs_pos
+            self.positions.append(pos)
+            if row.subject not in self.pos_by_subject:
+                self.pos_by_subject[row.subject] = pos
+
+
+    def get_rows(self, pos):
+        """
+        Return the rows at a position. For competition ranking a position 
+         inside a tie returns the whole tie, e.g. with scores 9, 7, 7, 5 both
+         positions 2 and 3 return the two rows scoring 7.
+
+        Keyword arguments:
+        pos -- the position of interest
+
+        Returns:
+        A list of rows
+        """
+        if self.ranking == 'competition':
+            return self.group_of_row[pos - 1]
+        elif self.ranking == 'dense':
+            if pos > len(self.groups):
+                raise Exception(f"Position {pos} greater than number of positions {len(self.groups)}")
+            return self.groups[pos - 1]
+        return [self.ordered_rows[pos - 1]]
+
+
+    def get_position(self, subject):
+        """
+        Return the position of a subject
+
+        Keyword arguments:
+        subject -- the subject of interest
+
+        Returns:
+        The position of the first row with the subject, or None
+        """
+        return self.pos_by_subject.get(subject)
+
+
+class TableDiffRow():
+    def __init__(self, subject_str, previous_row=None, current_row=None):
+        """
+        How one subject moved between two snapshots of a table
+
+        Keyword arguments:
+        subject_str -- the subject's string, which the snapshots are joined on
+        previous_row -- the subject's row in the earlier table, if any
+        current_row -- the subject's row in the later table, if any
+        """
+        self.subject_str = subject_str
+        self.subject = None
+        self.previous_pos = None
+        self.previous_score = None
+        self.current_pos = None
+        self.current_score = None
+        if previous_row is not None:
+            self.subject = previous_row.subject
+            self.previous_pos = previous_row.pos
+            self.previous_score = previous_row.score
+        if current_row is not None:
+            self.subject = current_row.subject
+            self.current_pos = current_row.pos
+            self.current_score = current_row.score
+
+        # Positions count down, so moving from 5th to 2nd is a change of +3
+        self.pos_change = None
+        self.score_change = None
+        if previous_row is None:
+            self.status = 'new'
+        elif current_row is None:
+            self.status = 'dropped'
+        else:
+            self.status = 'same'
+            self.pos_change = self.previous_pos - self.current_pos
+            self.score_change = self.current_score - self.previous_score
+            if self.pos_change > 0:
+                self.status = 'up'
+            elif self.pos_change < 0:
+                self.status = 'down'
+
+
+    def __str__(self):
+        return f"{self.subject_str} {self.status} {self.pos_change} {self.score_change}"
+
+
+    def to_dict(self):
+        """
+        Returns:
+        The diff as a dictionary that can be written as JSON
+        """
+        return {'subject': self.subject_str, 'status': self.status,
+            'previous_pos': self.previous_pos, 'current_pos': self.current_pos,
+            'pos_change': self.pos_change, 
+            'previous_score': self.previous_score, 
+            'current_score': self.current_score, 
+            'score_change': self.score_change}
+
+
 class Table():
     def __init__(self, name, subject_label, score_label, score_type, 
         show_values=True, show_entries=True, entry_label="Entries", 
-        value_label="Value", sort='descending'):
+        value_label="Value", sort='descending', ranking='competition'):
         """
         Initialize the table.
 
@@ -47,7 +255,10 @@ class Table():
         show_values -- if True, print values
         show_entries -- if True, print entries
         sort -- sort scores in ascending or descending order, or None to not sort
+        ranking -- how tied scores share positions, see RankIndex
         """
+        if ranking not in RANKING_MODES:
+            raise Exception(f"Unknown ranking {ranking}, expected one of {RANKING_MODES}")
         self.name = name
         self.subjects = []
         self.entries = []
@@ -59,17 +270,46 @@ class Table():
         self.show_values = show_values
         self.show_entries = show_entries
         self.sort = sort
+        self.ranking = ranking
         self.entry_label = entry_label
         self.value_label = value_label
-        self.max_row_length = len(subject_label)
-        self.max_score_length = len(score_label)
+
+        # Rows kept in ascending order as they are added, the cached output of
+        # get_ordered_subjects() and the version it was built for. The version
+        # goes up every time a row is added or a row's score changes. Rows 
+        # added before the first read are sorted in one go on that read.
+        self.sorted_rows = []
+        self.sorted_rows_stale = True
+        self.version = 0
+        self.ordered_subjects = []
+        self.ordered_version = None
+        self.rank_indexes = {}
             
 
+    def get_column_widths(self):
+        """
+        Work out how wide the subject and score columns need to be to print
+         the table, only needed by __str__
+
+        Returns:
+        A tuple of the subject column width and the score column width
+        """
+        max_row_length = len(self.subject_label)
+        max_score_length = len(self.score_label)
+        for row in self.subjects:
+            if len(row.subject_str) > max_row_length:
+                max_row_length = len(row.subject_str)
+            if len(str(row.score)) > max_score_length:
+                max_score_length = len(str(row.score))
+        return (max_row_length, max_score_length)
+
+
     def __str__(self):
         string_list = [self.name]
+        max_row_length, max_score_length = self.get_column_widths()
         
-        header_format_string = "{:3s} {:" + str(self.max_row_length) + \
-            "s} {:" + str(self.max_score_length) + "s}"
+        header_format_string = "{:3s} {:" + str(max_row_length) + \
+            "s} {:" + str(max_score_length) + "s}"
         header_string = header_format_string.format('Pos', 
             self.subject_label, self.score_label)
         if self.show_values: # and self.tie_breaker_var is None:
@@ -85,17 +325,17 @@ class Table():
         value_string = ''
         if self.show_values: # and self.tie_breaker_var is None:
             value_string = ' {:5d}'
-        base_format_string = '{:' + str(self.max_row_length) + 's} {:' + \
-            str(self.max_score_length) + score_type_str + '}' + value_string
+        base_format_string = '{:' + str(max_row_length) + 's} {:' + \
+            str(max_score_length) + score_type_str + '}' + value_string
         
         format_string = '{:3d} ' + base_format_string
         
         for row in self.get_ordered_subjects():
             row_format_string = format_string
             if self.show_values: # and self.tie_breaker_var is None:
-                row_string = row_format_string.format(row.pos, str(row.subject), row.score, row.value)
+                row_string = row_format_string.format(row.pos, row.subject_str, row.score, row.value)
             else:
-                row_string = row_format_string.format(row.pos, str(row.subject), row.score)
+                row_string = row_format_string.format(row.pos, row.subject_str, row.score)
             if self.show_entries:
                 entries_str = self.entries_string(row)
                 row_string += entries_str
@@ -113,7 +353,7 @@ class Table():
                 entries_str += ', '
             if self.show_entries:
                 if self.tie_breaker_var is not None:
-                    entries_str += f"{str(entry)} (TB: {entry.__dict__[self.tie_breaker_var]})"
+                    entries_str += f"{str(entry)} (TB: {entry.get_response(self.tie_breaker_var)})"
                 else:
                     entries_str += f"{str(entry)}"
             first_row = False
@@ -122,50 +362,112 @@ class Table():
 
     def add_subject(self, score, subject):
         """
-        Add a new row to the row list, update max string length of the 
-         score and the row for display purposes later.
+        Add a new row to the row list
 
         Keyword arguments:
         score -- the value that will be the primary sort criteria
         subject -- the object associated with the score
         """
-        new_row = TableRow(score, subject)
+        new_row = TableRow(score, subject, table=self)
         self.subjects.append(new_row)
-        if len(str(score)) > self.max_score_length:
-            self.max_score_length = len(str(score))
-        if len(str(subject)) > self.max_row_length:
-            self.max_row_length = len(str(subject))
+        if self.sort is not None and not self.sorted_rows_stale:
+            bisect.insort(self.sorted_rows, new_row)
+        self.version += 1
         return new_row
 
+
+    def add_subjects(self, scores, subjects, subject_strs=None, values=None,
+        subject_ids=None):
+        """
+        Add many rows at once, e.g. a row per entry
+
+        Keyword arguments:
+        scores -- a sequence of scores
+        subjects -- a sequence of subjects, in the same order as scores
+        subject_strs -- the subjects' strings if the caller already has them,
+         otherwise they are built when first needed
+        values -- a sequence of row values, or None to leave them blank
+        subject_ids -- the subjects' subject_ids if the caller already has 
+         them, only kept by ArrayTable
+        """
+        if subject_strs is None:
+            subject_strs = [None] * len(subjects)
+        if values is None:
+            values = [''] * len(subjects)
+        new_rows = [TableRow(score, subject, value, self, subject_str) for 
+            score, subject, subject_str, value in zip(scores, subjects, 
+            subject_strs, values)]
+        self.subjects.extend(new_rows)
+        self.sorted_rows_stale = True
+        self.version += 1
+
+
+    def row_changed(self, row):
+        """
+        Called by a TableRow when its score changes, the row can no longer be
+         trusted to be in the right spot so the sorted rows get rebuilt on the
+         next read
+
+        Keyword arguments:
+        row -- the TableRow that changed
+        """
+        self.sorted_rows_stale = True
+        self.version += 1
+
     
     def get_ordered_subjects(self):
         """
-        Return a list of sets by score
+        Return a list of sets by score. The order is only rebuilt when the
+         table has changed since the last call, so the returned list is shared
+         and should not be modified.
 
         Returns:
         A list of TableEntries
         """
+        if self.ordered_version == self.version:
+            return self.ordered_subjects
+
         order = self.subjects
         if self.sort is not None:
-            order = sorted(self.subjects)
+            if self.sorted_rows_stale:
+                self.sorted_rows = sorted(self.subjects)
+                self.sorted_rows_stale = False
+            order = self.sorted_rows
             if self.sort == 'descending':
                 order = reversed(order)
         
-        pos = 1
-        abs_pos = 1
-        prev_score = None
-        ordered_subjects = []
-        for subject in order:
-            if subject.score != prev_score:
-                pos = abs_pos
+        ordered_subjects = list(order)
+        rank_index = RankIndex(ordered_subjects, self.ranking)
+        self.rank_indexes = {self.ranking: rank_index}
+        for subject, pos in zip(ordered_subjects, rank_index.positions):
             subject.pos = pos
-            abs_pos += 1
-            prev_score = subject.score
-            ordered_subjects.append(subject)
+        self.ordered_subjects = ordered_subjects
+        self.ordered_version = self.version
         return ordered_subjects
 
 
-    def get_subjects_by_pos(self, pos, single_subject_only=False):
+    def get_rank_index(self, ranking=None):
+        """
+        Return the RankIndex for the current order of the table, it is built 
+         at most once per ranking mode for each version of the table
+
+        Keyword arguments:
+        ranking -- 'competition', 'dense' or 'ordinal', defaults to the 
+         table's ranking
+
+        Returns:
+        A RankIndex over the ordered rows
+        """
+        if ranking is None:
+            ranking = self.ranking
+        ordered_subjects = self.get_ordered_subjects()
+        if ranking not in self.rank_indexes:
+            self.rank_indexes[ranking] = RankIndex(ordered_subjects, ranking)
+        return self.rank_indexes[ranking]
+
+
+    def get_subjects_by_pos(self, pos, single_subject_only=False, 
+        ranking=None):
         """
         Return subjects that match the requested position
 
@@ -173,55 +475,119 @@ class Table():
         pos -- the desired position to report
         single_subjects_only -- rather than return all tied subjects at a position
          apply the secondary name sort and choose the specific subject
+        ranking -- the ranking mode to read pos in, defaults to the table's
 
         Returns:
         By default, the list of subjects that match, alternatively a single subject
         """
         if pos > len(self.subjects):
             raise Exception(f"Position {pos} greater than number of subjects {len(self.subjects)}")
-        curpos = 0
-        abspos = 0
-        subjects_at_pos = []
-        prev_score = None
-        ordered_subjects = self.get_ordered_subjects()
         if single_subject_only:
-            return ordered_subjects[pos - 1]
-        for subject in ordered_subjects:
-            if prev_score is None or subject.score != prev_score:
-                if abspos >= pos:
-                    return subjects_at_pos
-                curpos += 1
-                subjects_at_pos = [subject]
-            else:
-                subjects_at_pos.append(subject)
-            abspos += 1
-            prev_score = subject.score
-        # if all subjects were tied
-        if abspos >= pos:
-            return subjects_at_pos
+            return self.get_ordered_subjects()[pos - 1]
+        return self.get_rank_index(ranking).get_rows(pos)
 
 
-    def get_position_of_subject(self, subject):
+    def get_position_of_subject(self, subject, ranking=None):
         """
         Given an subject return its position
 
         Keyword arguments:
         subject -- the subject of interest
+        ranking -- the ranking mode to report in, defaults to the table's
 
         Returns:
         An integer represnting the subject's position in the table
         """
-        pos = 0
-        abs_pos = 0
-        prev_subject = None
-        for ordered_subject in self.get_ordered_subjects():
-            # Manage for tied scores
-            abs_pos += 1
-            if prev_subject is None or prev_subject.score != ordered_subject.score:
-                pos = abs_pos
-            if subject == ordered_subject.subject:
-                return pos
-            prev_subject = ordered_subject 
+        return self.get_rank_index(ranking).get_position(subject)
+
+
+    def top_k(self, k):
+        """
+        Return the first k rows in table order. If the table has not been 
+         ordered since it last changed only the top k rows are selected, with
+         a heap, rather than sorting the whole table.
+
+        Keyword arguments:
+        k -- the number of rows to return
+
+        Returns:
+        A list of up to k rows with their positions set
+        """
+        if self.ordered_version == self.version or self.sort is None:
+            return self.get_ordered_subjects()[0:k]
+        if self.sort == 'descending':
+            # Reversing the input keeps rows that compare equal in the same
+            # order get_ordered_subjects() would put them in
+            top_rows = heapq.nlargest(k, reversed(self.subjects))
+        else:
+            top_rows = heapq.nsmallest(k, self.subjects)
+        for row, pos in zip(top_rows, 
+            RankIndex(top_rows, self.ranking).positions):
+            row.pos = pos
+        return top_rows
+
+
+    def page(self, offset, limit):
+        """
+        Return a page of rows in table order
+
+        Keyword arguments:
+        offset -- the number of rows to skip
+        limit -- the most rows to return
+
+        Returns:
+        A list of rows
+        """
+        if offset == 0:
+            return self.top_k(limit)
+        return self.get_ordered_subjects()[offset:offset + limit]
+
+
+    def rows_around(self, subject, radius):
+        """
+        Return the rows near a subject, e.g. the entries either side of one
+         in the standings
+
+        Keyword arguments:
+        subject -- the subject of interest
+        radius -- the number of rows to include above and below the subject
+
+        Returns:
+        A list of rows, empty if the subject is not in the table
+        """
+        row_number = self.get_position_of_subject(subject, ranking='ordinal')
+        if row_number is None:
+            return []
+        start = max(row_number - 1 - radius, 0)
+        return self.get_ordered_subjects()[start:row_number + radius]
+
+
+    def diff(self, previous):
+        """
+        Compare this table to an earlier snapshot of it, e.g. the overall
+         standings now and after the previous race. Rows are joined on the 
+         subject string so the earlier table can be rebuilt from saved 
+         results.
+
+        Keyword arguments:
+        previous -- the earlier Table
+
+        Returns:
+        A list of TableDiffRows, one per subject in this table's order, then
+         the subjects that are only in the earlier table in its order
+        """
+        previous_rows = {}
+        for row in previous.get_ordered_subjects():
+            if row.subject_str not in previous_rows:
+                previous_rows[row.subject_str] = row
+
+        diff_rows = []
+        for row in self.get_ordered_subjects():
+            previous_row = previous_rows.pop(row.subject_str, None)
+            diff_rows.append(TableDiffRow(row.subject_str, previous_row, row))
+        for subject_str, previous_row in previous_rows.items():
+            diff_rows.append(TableDiffRow(subject_str, previous_row, None))
+        return diff_rows
 
 
     def add_entries(self, entries, entry_var, tie_breaker_var=None, 
@@ -238,21 +604,527 @@ class Table():
         self.entries = entries
         self.entry_var = entry_var
         self.tie_breaker_var = tie_breaker_var
-        
+
+        # Index the rows by the subject ID an entry's answer was resolved to,
+        # or by the string it answered with when any subject is unnumbered,
+        # keeping table order for subjects that share a key
+        table_rows = self.subjects
+        subject_ids = [getattr(subject.subject, 'subject_id', None) for 
+            subject in table_rows]
+        join_on_ids = None not in subject_ids
+        rows_by_response = {}
+        for subject, subject_id in zip(table_rows, subject_ids):
+            response_key = subject_id if join_on_ids else subject.subject_str
+            if response_key in rows_by_response:
+                rows_by_response[response_key].append(subject)
+            else:
+                rows_by_response[response_key] = [subject]
+
         for entry in self.entries.list_entries():
-            for subject in self.subjects:
-                entry_response = entry.__dict__[self.entry_var]
-                if type(entry_response) == str and entry_response == str(subject.subject):
-                    subject.add_entry(entry)
-                    if update_entry_score:
-                        entry.add_points(subject.value)
-                    break
-                elif type(entry_response) == list:
-                    for response_item in entry_response:
-                        if response_item == str(subject.subject):
-                            subject.add_entry(entry)
-                            if update_entry_score:
-                                entry.add_points(subject.value)
-                            break
-
-            
\ No newline at end of file
+            if join_on_ids:
+                entry_response = entry.get_response_ids(self.entry_var)
+            else:
+                entry_response = entry.get_response(self.entry_var)
+            if type(entry_response) in (str, int):
+                # A single answer only matches the first row
+                if entry_response in rows_by_response:
+                    matched_rows = rows_by_response[entry_response][0:1]
+                else:
+                    matched_rows = []
+            elif type(entry_response) == list:
+                # Each picked row is matched once, however often it was picked
+                matched_rows = []
+                matched_ids = set()
+                for response_item in entry_response:
+                    for subject in rows_by_response.get(response_item, []):
+                        if id(subject) not in matched_ids:
+                            matched_ids.add(id(subject))
+                            matched_rows.append(subject)
+            else:
+                continue
+            for subject in matched_rows:
+                subject.add_entry(entry)
+                if update_entry_score:
+                    entry.add_points(subject.value)
+
+
+
+class ArrayTableRow():
+    """
+    A row of an ArrayTable, it holds no data of its own and reads and writes
+     the table's arrays so templates can treat it like a TableRow
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+
+    @property
+    def score(self):
+        return self.table.scores.item(self.index)
+
+
+    @score.setter
+    def score(self, score):
+        self.table.scores[self.index] = score
+        self.table.row_changed(self)
+
+
+    @property
+    def subject(self):
+        return self.table.subject_list[self.index]
+
+
+    @property
+    def subject_str(self):
+        return self.table.subject_names[self.index]
+
+
+    @property
+    def subject_url(self):
+        return subject_url_name(self.subject, self.subject_str)
+
+
+    @property
+    def value(self):
+        return self.table.values.item(self.index)
+
+
+    @value.setter
+    def value(self, value):
+        self.table.values[self.index] = value
+
+
+    @property
+    def pos(self):
+        self.table.get_ordered_subjects()
+        return self.table.positions.item(self.index)
+
+
+    @property
+    def matching_entries(self):
+        if self.index not in self.table.row_entries:
+            self.table.row_entries[self.index] = []
+        return self.table.row_entries[self.index]
+
+
+    @matching_entries.setter
+    def matching_entries(self, matching_entries):
+        self.table.row_entries[self.index] = matching_entries
+
+
+    def __str__(self):
+        string_val = f"{self.pos} {self.score} {self.subject_str} {self.value} {len(self.matching_entries)} entries"
+        return string_val
+
+
+    def add_entry(self, entry):
+        self.matching_entries.append(entry)
+
+
+    def set_value(self, value):
+        self.value = value
+
+
+class ArrayTableRows():
+    """
+    The rows of an ArrayTable in some order, e.g. table order. It holds the
+     row indexes and only makes an ArrayTableRow for the rows that are read,
+     so slicing out a page costs the page and not the table.
+    """
+    __slots__ = ('table', 'indexes')
+
+    def __init__(self, table, indexes):
+        self.table = table
+        self.indexes = indexes
+
+
+    def __len__(self):
+        return len(self.indexes)
+
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [ArrayTableRow(self.table, index) for index in 
+                self.indexes[item].tolist()]
+        return ArrayTableRow(self.table, int(self.indexes[item]))
+
+
+    def __iter__(self):
+        for index in self.indexes.tolist():
+            yield ArrayTableRow(self.table, index)
+
+
+class ArrayTable(Table):
+    def __init__(self, *args, **kwargs):
+        """
+        A Table that keeps scores, values and subject IDs in parallel NumPy 
+         arrays and orders them with numpy.lexsort. Rows are read through 
+         ArrayTableRow views, which are only made for the rows a caller reads,
+         e.g. a page of the standings. Takes the same arguments as Table. 
+         Meant for tables with one row per entry in very large leagues, for 
+         anything else the plain Table is simpler.
+        """
+        if numpy is None:
+            raise Exception("ArrayTable requires numpy, install it or use Table")
+        super().__init__(*args, **kwargs)
+        self.subject_list = []
+        self.subject_names = []
+        self.row_entries = {}
+        self.row_count = 0
+        if self.score_type == int:
+            score_dtype = numpy.int64
+        elif self.score_type == float:
+            score_dtype = numpy.float64
+        else:
+            score_dtype = object
+        self.scores = numpy.zeros(16, dtype=score_dtype)
+        self.values = numpy.full(16, '', dtype=object)
+        # The subject's subject_id, or -1 for a subject without one
+        self.subject_ids = numpy.full(16, -1, dtype=numpy.int64)
+        # Row indexes in table order, and each row's position by ranking mode
+        self.order = numpy.zeros(0, dtype=numpy.int64)
+        self.positions = numpy.zeros(0, dtype=numpy.int64)
+        self.rank_positions = {}
+        # Row lookups by subject ID and by subject, built for row_lookup_count 
+        # rows, rows are only ever added
+        self.rows_by_id = None
+        self.rows_by_subject = None
+        self.row_lookup_count = None
+
+
+    @property
+    def subjects(self):
+        """
+        The rows in the order they were added, like Table.subjects
+        """
+        return ArrayTableRows(self, numpy.arange(self.row_count))
+
+
+    @subjects.setter
+    def subjects(self, subjects):
+        # Table.__init__ sets an empty list, the rows live in the arrays
+        pass
+
+
+    def grow(self, size):
+        """
+        Make sure the arrays have room for size rows, doubling as needed
+
+        Keyword arguments:
+        size -- the number of rows that need to fit
+        """
+        capacity = len(self.scores)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for array_name in ['scores', 'values', 'subject_ids']:
+            array = getattr(self, array_name)
+            grown = numpy.zeros(capacity, dtype=array.dtype)
+            if array.dtype == object:
+                grown[:] = ''
+            grown[:len(array)] = array
+            setattr(self, array_name, grown)
+
+
+    def add_subject(self, score, subject):
+        """
+        Add a new row to the arrays, see Table.add_subject
+
+        Keyword arguments:
+        score -- the value that will be the primary sort criteria
+        subject -- the object associated with the score
+        """
+        self.add_subjects([score], [subject])
+        return ArrayTableRow(self, self.row_count - 1)
+
+
+    def add_subjects(self, scores, subjects, subject_strs=None, values=None,
+        subject_ids=None):
+        """
+        Add many rows at once, see Table.add_subjects
+        """
+        start = self.row_count
+        self.grow(start + len(subjects))
+        self.row_count += len(subjects)
+        self.scores[start:self.row_count] = scores
+        if values is not None:
+            self.values[start:self.row_count] = values
+        if subject_ids is None:
+            subject_ids = [getattr(subject, 'subject_id', None) for subject in 
+                subjects]
+        self.subject_ids[start:self.row_count] = [-1 if subject_id is None 
+            else subject_id for subject_id in subject_ids]
+        self.subject_list.extend(subjects)
+        if subject_strs is None:
+            subject_strs = [str(subject) for subject in subjects]
+        self.subject_names.extend(subject_strs)
+        self.version += 1
+
+
+    def row_changed(self, row):
+        self.version += 1
+
+
+    def get_row_index(self, subject):
+        """
+        Find the first row of a subject, by its subject_id when the row was 
+         added with one and by the subject itself otherwise
+
+        Keyword arguments:
+        subject -- the subject of interest
+
+        Returns:
+        The row index, or None if the subject is not in the table
+        """
+        count = self.row_count
+        if self.row_lookup_count != count:
+            subject_ids = self.subject_ids[:count]
+            numbered = numpy.flatnonzero(subject_ids >= 0)
+            id_count = int(subject_ids.max()) + 1 if count > 0 else 0
+            self.rows_by_id = numpy.full(max(id_count, 0), -1, 
+                dtype=numpy.int64)
+            # Assigned last row first, so the first row of a subject wins
+            self.rows_by_id[subject_ids[numbered][::-1]] = numbered[::-1]
+            self.rows_by_subject = {}
+            for index in numpy.flatnonzero(subject_ids < 0).tolist():
+                self.rows_by_subject.setdefault(self.subject_list[index], 
+                    index)
+            self.row_lookup_count = count
+
+        subject_id = getattr(subject, 'subject_id', None)
+        if subject_id is not None and subject_id < len(self.rows_by_id):
+            index = self.rows_by_id.item(subject_id)
+            if index >= 0:
+                return index
+        # A subject numbered after its row was added is found by itself
+        return self.rows_by_subject.get(subject)
+
+
+    def count_positions(self, ranking):
+        """
+        Work out every row's position for a ranking mode from the current 
+         order, on the sorted scores without a Python loop
+
+        Returns:
+        An array of positions indexed by row
+        """
+        count = self.row_count
+        sorted_scores = self.scores[:count][self.order]
+        new_score = numpy.ones(count, dtype=bool)
+        new_score[1:] = sorted_scores[1:] != sorted_scores[:-1]
+        abs_pos = numpy.arange(1, count + 1)
+        if ranking == 'competition':
+            sorted_positions = numpy.maximum.accumulate(
+                numpy.where(new_score, abs_pos, 0))
+        elif ranking == 'dense':
+            sorted_positions = numpy.cumsum(new_score)
+        else:
+            sorted_positions = abs_pos
+        positions = numpy.zeros(count, dtype=numpy.int64)
+        positions[self.order] = sorted_positions
+        return positions
+
+
+    def get_positions(self, ranking=None):
+        """
+        Return every row's position in table order, worked out at most once
+         per ranking mode for each version of the table
+
+        Keyword arguments:
+        ranking -- 'competition', 'dense' or 'ordinal', defaults to the 
+         table's ranking
+
+        Returns:
+        An array of positions indexed by row
+        """
+        if ranking is None:
+            ranking = self.ranking
+        self.get_ordered_subjects()
+        if ranking not in self.rank_positions:
+            self.rank_positions[ranking] = self.count_positions(ranking)
+        return self.rank_positions[ranking]
+
+
+    def get_subjects_by_pos(self, pos, single_subject_only=False, 
+        ranking=None):
+        """
+        Return the rows at a position, see Table.get_subjects_by_pos. Tied 
+         rows sit next to each other in table order, so they are found by 
+         searching the sorted positions.
+        """
+        if pos > self.row_count:
+            raise Exception(f"Position {pos} greater than number of subjects {self.row_count}")
+        ordered = self.get_ordered_subjects()
+        if single_subject_only:
+            return ordered[pos - 1]
+        if ranking is None:
+            ranking = self.ranking
+        if ranking == 'ordinal':
+            return [ordered[pos - 1]]
+        sorted_positions = self.get_positions(ranking)[self.order]
+        if ranking == 'competition':
+            pos = sorted_positions.item(pos - 1)
+        elif pos > sorted_positions.item(-1):
+            raise Exception(f"Position {pos} greater than number of positions {sorted_positions.item(-1)}")
+        return ordered[numpy.searchsorted(sorted_positions, pos, 'left'):
+            numpy.searchsorted(sorted_positions, pos, 'right')]
+
+
+    def get_position_of_subject(self, subject, ranking=None):
+        """
+        Given a subject return its position, see 
+         Table.get_position_of_subject
+        """
+        index = self.get_row_index(subject)
+        if index is None:
+            return None
+        return self.get_positions(ranking).item(index)
+
+
+    def top_k(self, k):
+        # A full lexsort is already cheap, and rows have no __lt__ for heapq
+        return self.get_ordered_subjects()[0:k]
+
+
+    def get_ordered_subjects(self):
+        """
+        Return the rows in table order, see Table.get_ordered_subjects. The
+         order is a lexsort on (score, subject name).
+
+        Returns:
+        An ArrayTableRows in table order
+        """
+        if self.ordered_version == self.version:
+            return self.ordered_subjects
+
+        count = self.row_count
+        order = numpy.arange(count)
+        if self.sort is not None:
+            scores = self.scores[:count]
+            if scores.dtype == object:
+                scores = numpy.array(scores.tolist())
+            names = numpy.array(self.subject_names, dtype=str)
+            order = numpy.lexsort((names, scores))
+            if self.sort == 'descending':
+                order = order[::-1]
+        self.order = order
+        self.positions = self.count_positions(self.ranking)
+        self.rank_positions = {self.ranking: self.positions}
+        self.ordered_subjects = ArrayTableRows(self, order)
+        self.ordered_version = self.version
+        self.rank_indexes = {}
+        return self.ordered_subjects
+
+
+TABLE_BACKENDS = {'list': Table, 'array': ArrayTable}
+AGGREGATIONS = ('sum', 'mean', 'count')
+
+
+def aggregate_tables(tables, name, subject_label, score_label, score_type, 
+    how='sum', field='score', **table_kwargs):
+    """
+    Combine the rows of many tables by subject into a new table, e.g. add up 
+     each entry's score across the fantasy driver questions
+
+    Keyword arguments:
+    tables -- the Tables to combine
+    name, subject_label, score_label, score_type -- as for Table
+    how -- 'sum' or 'mean' of the field, or 'count' of rows per subject
+    field -- the row attribute to combine, 'score' or 'value'
+    table_kwargs -- any other Table arguments for the new table
+
+    Returns:
+    A Table, or an ArrayTable if every input was one, with a row per subject
+     in the order subjects were first seen and the combined value as score
+    """
+    if how not in AGGREGATIONS:
+        raise Exception(f"Unknown aggregation {how}, expected one of {AGGREGATIONS}")
+    if len(tables) == 0:
+        return Table(name, subject_label, score_label, score_type, 
+            **table_kwargs)
+
+    # Tables built from the same list of subjects line up row for row, which
+    # is the usual case for per-entry score tables, so no lookups are needed
+    first_rows = tables[0].subjects
+    aligned = True
+    for table in tables[1:]:
+        rows = table.subjects
+        if len(rows) != len(first_rows):
+            aligned = False
+            break
+        if isinstance(table, ArrayTable) and \
+            isinstance(tables[0], ArrayTable):
+            subject_ids = table.subject_ids[:table.row_count]
+            first_ids = tables[0].subject_ids[:table.row_count]
+            if (subject_ids >= 0).all() and (first_ids >= 0).all():
+                same_subjects = numpy.array_equal(subject_ids, first_ids)
+            else:
+                same_subjects = table.subject_list == tables[0].subject_list
+        else:
+            same_subjects = all([row.subject is first_row.subject for row, 
+                first_row in zip(rows, first_rows)])
+        if not same_subjects:
+            aligned = False
+            break
+
+    all_arrays = all([isinstance(table, ArrayTable) for table in tables])
+    if aligned and all_arrays:
+        row_count = tables[0].row_count
+        field_arrays = [getattr(table, field + 's')[:row_count] 
+            for table in tables]
+        if how == 'count':
+            combined = numpy.full(row_count, len(tables))
+        else:
+            combined = numpy.sum(numpy.vstack(field_arrays), axis=0)
+            if how == 'mean':
+                combined = combined / len(tables)
+        aggregate = ArrayTable(name, subject_label, score_label, score_type,
+            **table_kwargs)
+        aggregate.add_subjects(combined.astype(aggregate.scores.dtype), 
+            tables[0].subject_list[:row_count], 
+            tables[0].subject_names[:row_count], 
+            subject_ids=tables[0].subject_ids[:row_count])
+        return aggregate
+
+    if aligned:
+        subjects = [row.subject for row in first_rows]
+        subject_strs = [row.subject_str for row in first_rows]
+        totals = [0] * len(first_rows)
+        counts = [len(tables)] * len(first_rows)
+        for table in tables:
+            for row_number, row in enumerate(table.subjects):
+                totals[row_number] += getattr(row, field)
+    else:
+        # Fall back to grouping on the identity of the subject
+        row_number_by_subject = {}
+        subjects = []
+        subject_strs = []
+        totals = []
+        counts = []
+        for table in tables:
+            for row in table.subjects:
+                subject_id = id(row.subject)
+                if subject_id not in row_number_by_subject:
+                    row_number_by_subject[subject_id] = len(subjects)
+                    subjects.append(row.subject)
+                    subject_strs.append(row.subject_str)
+                    totals.append(0)
+                    counts.append(0)
+                row_number = row_number_by_subject[subject_id]
+                totals[row_number] += getattr(row, field)
+                counts[row_number] += 1
+
+    aggregate = Table(name, subject_label, score_label, score_type, 
+        **table_kwargs)
+    if how == 'sum':
+        scores = totals
+    elif how == 'mean':
+        scores = [total / count for total, count in zip(totals, counts)]
+    else:
+        scores = counts
+    aggregate.add_subjects(scores, subjects, subject_strs)
+    return aggregate
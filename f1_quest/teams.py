@@ -2,20 +2,31 @@ import csv
 import os
 
 from f1_quest.tables import Table
-from f1_quest.util import get_type_val
+from f1_quest.util import get_type_val, urlify_name
 
 class TeamRaceResult():
-    def __init__(self, race):
+    __slots__ = ['race', 'points']
+
+    def __init__(self, race, points=0):
         self.race = race
+        self.points = points
 
 
 class Team():
+    __slots__ = ['drivers', 'race_results', 'points', 'races_entered', 
+        'points_last_year', 'races_last_year', 'name', 'url_name', 'subject_id']
+
     def __init__(self, name, points_last_year):
         self.drivers = {}
         self.race_results = {}
+        # Running totals kept up to date by Driver.add_race
+        self.points = 0
+        self.races_entered = 0
         self.points_last_year = points_last_year
         self.races_last_year = 22
         self.name = name
+        self.url_name = urlify_name(name)
+        self.subject_id = None
 
 
     def __str__(self):
@@ -30,25 +41,82 @@ class Team():
         return self.name == other.name
 
 
+    def __hash__(self):
+        return hash(self.name)
+
+
     def add_driver(self, driver):
         self.drivers[driver.name] = driver
+        driver.team = self
 
 
     def add_race(self, race):
-        self.race_results[race] = TeamRaceResult(race)
+        if race not in self.race_results:
+            self.race_results[race] = TeamRaceResult(race)
+            self.races_entered += 1
+
+
+    def add_driver_points(self, race, points):
+        """
+        Add points scored by one of the team's drivers in a race
+
+        Keyword arguments:
+        race -- the race's string representation
+        points -- the points the driver scored
+        """
+        self.add_race(race)
+        self.race_results[race].points += points
+        self.points += points
 
 
     def get_points(self):
         """
-        Add the points of drivers in the team
+        Get the points of drivers in the team
 
         Returns:
         The teams total points
         """
-        points = 0
-        for driver in self.drivers.values():
-            points += driver.points
-        return points
+        return self.points
+
+
+    def get_points_by_race(self):
+        """
+        Get the team's points race by race
+
+        Returns:
+        A list of (race, points in the race, points so far) in the order the 
+         races were run
+        """
+        points_by_race = []
+        points_so_far = 0
+        for race, race_result in self.race_results.items():
+            points_so_far += race_result.points
+            points_by_race.append((race, race_result.points, points_so_far))
+        return points_by_race
+
+
+    def get_state(self):
+        """
+        Get the team's race results, for the season state checkpoint
+
+        Returns:
+        A dict of race to points scored that can be saved as JSON
+        """
+        state = {}
+        for race, race_result in self.race_results.items():
+            state[race] = race_result.points
+        return state
+
+
+    def load_state(self, state):
+        """
+        Restore the team's race results from a season state checkpoint
+
+        Keyword arguments:
+        state -- a dict from get_state
+        """
+        for race, points in state.items():
+            self.add_driver_points(race, points)
 
 
 class Teams():
@@ -137,11 +205,16 @@ class Teams():
         return table
 
 
-    def get_q3_appearances_table(self, drivers):
+    def get_q3_appearances_table(self, drivers, q3_counts=None):
         """
         Build a table based on the drivers' Q3 appearances if in the bottom
         six teams last season
 
+        Keyword arguments:
+        drivers -- the Drivers
+        q3_counts -- a dict of driver name to Q3 appearances, e.g. from 
+         SeasonResults.count_by_driver, or None to use each driver's total
+
         Returns:
         A table object with drivers and Q3 appearances
         """
@@ -151,7 +224,10 @@ class Teams():
                 for driver_name in team.drivers:
                     driver = drivers.get_driver_by_short_name(driver_name)
                     if driver.started_season:
-                        table.add_subject(driver.q3s, driver)
+                        q3s = driver.q3s
+                        if q3_counts is not None:
+                            q3s = q3_counts[driver.name]
+                        table.add_subject(q3s, driver)
         return table
 
 
@@ -165,6 +241,6 @@ class Teams():
         table = Table('Team Improvement from Last Year', 'Team', 'Average Points Difference', float)
         for team in self.team_dict.values():
             avg_last_year = team.points_last_year / team.races_last_year
-            avg = team.get_points() / len(team.race_results.keys())
+            avg = team.get_points() / team.races_entered
             table.add_subject(avg - avg_last_year, team)
         return table
\ No newline at end of file
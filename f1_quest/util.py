@@ -1,10 +1,17 @@
 def get_type_val(row, header_row, header_name, type=str):
-    if header_name not in header_row:
-        raise Exception(f"{header_name} not found in headers")
-    header_idx = header_row[header_name]
+    header_idx = get_header_idx(header_row, header_name)
     if header_idx >= len(row):
         raise Exception(f"{header_idx} not found in row")
-    val = row[header_idx]
+    return convert_val(row[header_idx], type)
+
+
+def get_header_idx(header_row, header_name):
+    if header_name not in header_row:
+        raise Exception(f"{header_name} not found in headers")
+    return header_row[header_name]
+
+
+def convert_val(val, type=str):
     if val is not None and len(val) > 0:
         return type(val)
     return val
@@ -12,3 +19,82 @@ def get_type_val(row, header_row, header_name, type=str):
 
 def urlify_name(name):
     return name.replace(', ', '_').replace('/', '_').replace(' @ ', '_').replace('M:', 'M_').replace(': ', '_').replace(':', '_').replace(' ', '_')
+
+
+class VersionedList(list):
+    """
+    A list that counts its changes, so indexes built from it can tell when
+     they are stale without comparing lengths. Changes to the items 
+     themselves are not counted.
+    """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+
+    def changed(self):
+        # Unpickling extends the list before the version is restored
+        self.version = getattr(self, 'version', 0) + 1
+
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.changed()
+
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.changed()
+
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self.changed()
+        return result
+
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self.changed()
+        return result
+
+
+    def append(self, item):
+        super().append(item)
+        self.changed()
+
+
+    def extend(self, items):
+        super().extend(items)
+        self.changed()
+
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.changed()
+
+
+    def remove(self, item):
+        super().remove(item)
+        self.changed()
+
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.changed()
+        return item
+
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.changed()
+
+
+    def reverse(self):
+        super().reverse()
+        self.changed()
@@ -1,13 +1,22 @@
+import csv
+import io
+import json
 import os
+import pytest
 import shutil
 
 from datetime import datetime
-from f1_quest.answer_key import AnswerKey
+from f1_quest import season_results
+from f1_quest.answer_key import F1_POINTS, AnswerKey, rank_by_keys
 from f1_quest.drivers import Driver, Drivers
-from f1_quest.entries import Entries
-from f1_quest.races import Races
-from f1_quest.render import render_static_pages
-from f1_quest.tables import Table
+from f1_quest.entries import ENTRY_COLUMNS, FANTASY_HEADER, Entries, EntryDecoder, EntryStore, PickCounts, read_row_bytes, read_row_ranges
+from f1_quest.entry_scorers import BingoScorer, PickScorer, RankScorer
+from f1_quest.races import Race, RaceCalendar, Races, compile_results_header
+from f1_quest.render import pager_pages, previous_standings, render_static_pages, top_movers
+from f1_quest.snapshot import get_snapshot_key, read_snapshot, write_snapshot
+from f1_quest.submissions import EntrySubmissions
+from f1_quest.subject_ids import SubjectIds
+from f1_quest.tables import ArrayTable, Table, aggregate_tables
 from f1_quest.teams import Teams
 
 
@@ -24,6 +33,310 @@ def test_tables():
 
     two = table.get_subjects_by_pos(2)
     assert(two[0].subject == 'Two')
+    assert(two[0].subject_str == 'Two')
+    assert(two[0].subject_url == 'Two')
+
+    table.show_values = False
+    table.show_entries = False
+    table_lines = str(table).split('\n')
+    assert(table_lines[1] == 'Pos Entry Score')
+    assert(table_lines[4] == '  3 Three     3')
+
+
+def test_table_order_cache():
+    table = Table('Test Table', 'Entry', 'Score', int)
+    table.add_subject(1, 'One')
+    table.add_subject(3, 'Three')
+    first_order = table.get_ordered_subjects()
+    assert(table.get_ordered_subjects() is first_order)
+    assert([row.subject for row in first_order] == ['Three', 'One'])
+
+    table.add_subject(2, 'Two')
+    assert([row.subject for row in table.get_ordered_subjects()] == 
+        ['Three', 'Two', 'One'])
+
+    one = table.get_subjects_by_pos(3, single_subject_only=True)
+    one.score = 4
+    assert([row.subject for row in table.get_ordered_subjects()] == 
+        ['One', 'Three', 'Two'])
+    assert(table.get_position_of_subject('Two') == 3)
+
+
+def test_table_add_subjects():
+    class Subject():
+        str_calls = 0
+        def __init__(self, name):
+            self.name = name
+        def __str__(self):
+            Subject.str_calls += 1
+            return self.name
+
+    subjects = [Subject('A'), Subject('B'), Subject('C')]
+    table = Table('Test Table', 'Entry', 'Score', int)
+    table.add_subjects([1, 3, 2], subjects, ['A', 'B', 'C'], ['x', 'y', 'z'])
+    assert([row.subject_str for row in table.get_ordered_subjects()] ==
+        ['B', 'C', 'A'])
+    assert([row.value for row in table.subjects] == ['x', 'y', 'z'])
+    assert(Subject.str_calls == 0)
+
+    # Without the names the string is built once, when first needed
+    table = Table('Test Table', 'Entry', 'Score', int)
+    table.add_subjects([1, 2], subjects[0:2])
+    assert(Subject.str_calls == 0)
+    assert(table.get_ordered_subjects()[0].subject_str == 'B')
+    assert(Subject.str_calls == 1)
+    assert(table.subjects[0].matching_entries == [])
+
+
+def test_table_ranking():
+    table = Table('Test Table', 'Entry', 'Score', int)
+    for score, subject in [(9, 'A'), (7, 'B'), (7, 'C'), (5, 'D')]:
+        table.add_subject(score, subject)
+    assert([row.pos for row in table.get_ordered_subjects()] == [1, 2, 2, 4])
+    assert(len(table.get_subjects_by_pos(3)) == 2)
+    assert(table.get_position_of_subject('D') == 4)
+
+    assert(table.get_position_of_subject('D', ranking='dense') == 3)
+    assert(table.get_subjects_by_pos(3, ranking='dense')[0].subject == 'D')
+    assert(table.get_position_of_subject('B', ranking='ordinal') == 3)
+    assert(table.get_subjects_by_pos(2, ranking='ordinal')[0].subject == 'C')
+
+    dense_table = Table('Test Table', 'Entry', 'Score', int, ranking='dense')
+    for score, subject in [(9, 'A'), (7, 'B'), (7, 'C'), (5, 'D')]:
+        dense_table.add_subject(score, subject)
+    assert([row.pos for row in dense_table.get_ordered_subjects()] == [1, 2, 2, 3])
+
+
+def test_table_pages():
+    table = Table('Test Table', 'Entry', 'Score', int)
+    for score, subject in [(5, 'E'), (9, 'A'), (7, 'C'), (7, 'B'), (1, 'F'), 
+        (3, 'D')]:
+        table.add_subject(score, subject)
+    top = table.top_k(3)
+    assert([(row.pos, row.subject) for row in top] == [(1, 'A'), (2, 'C'), (2, 'B')])
+    assert(table.ordered_version is None)
+
+    page = table.page(3, 2)
+    assert([(row.pos, row.subject) for row in page] == [(4, 'E'), (5, 'D')])
+    assert([row.subject for row in table.top_k(2)] == ['A', 'C'])
+
+    around = table.rows_around('E', 1)
+    assert([row.subject for row in around] == ['B', 'E', 'D'])
+    assert([row.subject for row in table.rows_around('A', 1)] == ['A', 'C'])
+    assert(table.rows_around('Z', 1) == [])
+
+
+def test_pager_pages():
+    assert(pager_pages(1, 1) == [1])
+    assert(pager_pages(2, 4) == [1, 2, 3, 4])
+    assert(pager_pages(1, 100, radius=2) == [1, 2, 3, None, 100])
+    assert(pager_pages(50, 100, radius=2) == [1, None, 48, 49, 50, 51, 52, 
+        None, 100])
+    assert(pager_pages(97, 100, radius=2) == [1, None, 95, 96, 97, 98, 99, 
+        100])
+
+
+def test_table_diff():
+    previous = Table('Previous', 'Entry', 'Score', int)
+    current = Table('Current', 'Entry', 'Score', int)
+    for score, subject in [(10, 'A'), (8, 'B'), (6, 'C')]:
+        previous.add_subject(score, subject)
+    for score, subject in [(12, 'B'), (11, 'A'), (9, 'D')]:
+        current.add_subject(score, subject)
+    diff = {row.subject_str: row for row in current.diff(previous)}
+    assert(diff['B'].status == 'up')
+    assert(diff['B'].pos_change == 1)
+    assert(diff['B'].score_change == 4)
+    assert(diff['A'].status == 'down')
+    assert(diff['D'].status == 'new')
+    assert(diff['C'].status == 'dropped')
+    assert(diff['C'].to_dict()['previous_pos'] == 3)
+
+
+def test_movers():
+    results_table = {'A': {'Bahrain': 10, 'Jeddah': 11}, 
+        'B': {'Bahrain': 8, 'Jeddah': 12}, 'C': {'Bahrain': 6}, 
+        'D': {'Jeddah': 9}, 'E': {'Bahrain': 2}}
+    assert(previous_standings(results_table, 'Melbourne') is None)
+    previous = previous_standings(results_table, 'Bahrain')
+    current = Table('Current', 'Entry', 'Score', int)
+    for score, subject in [(12, 'B'), (11, 'A'), (1, 'C'), (9, 'D'), 
+        (7, 'E')]:
+        current.add_subject(score, subject)
+    movers = current.diff(previous)
+    assert([mover.subject_str for mover in top_movers(movers)] == 
+        ['C', 'B', 'A', 'D'])
+    assert([mover.subject_str for mover in top_movers(movers, 2)] == 
+        ['C', 'B'])
+
+
+def test_array_table():
+    pytest.importorskip('numpy')
+    rows = [(7, 'B'), (9, 'A'), (7, 'C'), (5, 'D')]
+    table = Table('Test Table', 'Entry', 'Score', int)
+    array_table = ArrayTable('Test Table', 'Entry', 'Score', int)
+    for score, subject in rows:
+        table.add_subject(score, subject)
+        array_table.add_subject(score, subject)
+    assert([(row.pos, row.score, row.subject) for row in table.get_ordered_subjects()] ==
+        [(row.pos, row.score, row.subject) for row in array_table.get_ordered_subjects()])
+    assert(array_table.get_position_of_subject('D') == 4)
+    assert(len(array_table.get_subjects_by_pos(2)) == 2)
+
+    row = array_table.get_subjects_by_pos(4)[0]
+    row.set_value(12)
+    row.score = 10
+    assert(array_table.get_subjects_by_pos(1)[0].subject == 'D')
+    assert(array_table.get_subjects_by_pos(1)[0].value == 12)
+
+    # Positions and tied rows come from the arrays in every ranking mode,
+    # subjects with IDs are found by ID and the rest by themselves
+    drivers = Drivers(data_dir='test_data')
+    subject_ids = SubjectIds()
+    subject_ids.add_subjects(drivers.list_all_drivers())
+    subjects = drivers.list_all_drivers()[0:6] + ['X', 'Y']
+    scores = [9, 7, 7, 5, 5, 5, 3, 7]
+    for ranking in ['competition', 'dense', 'ordinal']:
+        table = Table('Test Table', 'Driver', 'Score', int, ranking=ranking)
+        array_table = ArrayTable('Test Table', 'Driver', 'Score', int,
+            ranking=ranking)
+        table.add_subjects(scores, subjects)
+        array_table.add_subjects(scores, subjects)
+        for subject in subjects:
+            assert(array_table.get_position_of_subject(subject) ==
+                table.get_position_of_subject(subject))
+        assert(array_table.get_position_of_subject('Z') is None)
+        for pos in range(1, 5):
+            assert([row.subject for row in array_table.get_subjects_by_pos(pos)] ==
+                [row.subject for row in table.get_subjects_by_pos(pos)])
+    assert(array_table.get_position_of_subject('X', ranking='dense') == 4)
+    assert(len(array_table.get_ordered_subjects()[2:4]) == 2)
+
+
+def test_aggregate_tables():
+    first = Table('First', 'Entry', 'Score', int)
+    second = Table('Second', 'Entry', 'Score', int)
+    for score, subject in [(1, 'A'), (2, 'B')]:
+        first.add_subject(score, subject)
+        second.add_subject(score * 10, subject)
+    totals = aggregate_tables([first, second], 'Totals', 'Entry', 'Score', int)
+    assert([(row.subject, row.score) for row in totals.get_ordered_subjects()] ==
+        [('B', 22), ('A', 11)])
+
+    third = Table('Third', 'Entry', 'Score', int)
+    third.add_subject(4, 'C')
+    third.add_subject(4, 'A')
+    means = aggregate_tables([first, third], 'Means', 'Entry', 'Score', float,
+        how='mean')
+    assert([(row.subject, row.score) for row in means.get_ordered_subjects()] ==
+        [('C', 4.0), ('A', 2.5), ('B', 2.0)])
+    counts = aggregate_tables([first, third], 'Counts', 'Entry', 'Count', int,
+        how='count')
+    assert(counts.get_position_of_subject('A') == 1)
+
+
+def test_aggregate_array_tables():
+    pytest.importorskip('numpy')
+    subjects = ['A', 'B', 'C']
+    tables = []
+    for multiplier in [1, 2, 3]:
+        table = ArrayTable('Table', 'Entry', 'Score', int)
+        table.add_subjects([multiplier, multiplier * 2, 0], subjects)
+        for row in table.subjects:
+            row.set_value(row.score + 1)
+        tables.append(table)
+    totals = aggregate_tables(tables, 'Totals', 'Entry', 'Points', int, 
+        field='value')
+    assert(isinstance(totals, ArrayTable))
+    assert([(row.subject, row.score) for row in totals.get_ordered_subjects()] ==
+        [('B', 15), ('A', 9), ('C', 3)])
+
+
+class FakeEntry():
+    def __init__(self, entry_name, response):
+        self.entry_name = entry_name
+        self.response = response
+        self.score = 0
+
+    def __str__(self):
+        return self.entry_name
+
+    def __lt__(self, other):
+        return self.entry_name < other.entry_name
+
+    def add_points(self, points):
+        self.score += points
+
+    def get_response(self, entry_var):
+        return getattr(self, entry_var)
+
+    def get_response_ids(self, entry_var):
+        return getattr(self, f"{entry_var}_ids", None)
+
+
+class FakeEntries():
+    def __init__(self, entries):
+        self.entries = {entry.entry_name: entry for entry in entries}
+
+    def list_entries(self):
+        return sorted(self.entries.values())
+
+
+def test_table_add_entries():
+    table = Table('Test Table', 'Entry', 'Score', int)
+    for score, subject in [(3, 'One'), (2, 'Two'), (1, 'Three')]:
+        table.add_subject(score, subject).set_value(score * 5)
+    single = FakeEntry('Single', 'Two')
+    multiple = FakeEntry('Multiple', ['One', 'Three', 'One', 'Four'])
+    unknown = FakeEntry('Unknown', 'Four')
+    table.add_entries(FakeEntries([single, multiple, unknown]), 'response', 
+        update_entry_score=True)
+    assert(table.get_subjects_by_pos(1)[0].matching_entries == [multiple])
+    assert(table.get_subjects_by_pos(2)[0].matching_entries == [single])
+    assert(table.get_subjects_by_pos(3)[0].matching_entries == [multiple])
+    assert(single.score == 10)
+    assert(multiple.score == 20)
+    assert(unknown.score == 0)
+
+
+def test_rank_by_keys():
+    # Small integer distances take the counting sort path
+    ranked = rank_by_keys([((2,), 'A'), ((0,), 'B'), ((2,), 'C'), ((5,), 'D')])
+    assert([(points, pos, entry) for points, pos, key, entry in ranked] == 
+        [(25, 1, 'B'), (18, 2, 'A'), (18, 2, 'C'), (12, 4, 'D')])
+
+    ranked = rank_by_keys([((1, 3), 'A'), ((1, 0), 'B'), ((0, 9), 'C'), 
+        ((1, 3), 'D')])
+    assert([(points, pos, entry) for points, pos, key, entry in ranked] == 
+        [(25, 1, 'C'), (18, 2, 'B'), (15, 3, 'A'), (15, 3, 'D')])
+
+    ranked = rank_by_keys([((pos,), pos) for pos in range(25)])
+    assert(ranked[-1][0] == 0)
+
+
+def test_rank_scorer():
+    entries = [FakeEntry(entry_name, guess) for entry_name, guess in 
+        zip('ABCDEFGHIJKL', [3, 0, 3, 7, 1, 1, 9, 4, 2, 8, 5, 6])]
+    for index, entry in enumerate(entries):
+        entry.index = index
+    get_key = lambda entry: (abs(entry.response - 2),)
+    points = [0] * len(entries)
+    for entry_points, pos, key, entry in rank_by_keys([(get_key(entry), entry) 
+        for entry in entries[:-1]]):
+        points[entry.index] = entry_points
+    scorer = RankScorer(get_key, F1_POINTS)
+    scorer.start(entries[:-1])
+
+    # Adding one entry and changing another matches ranking everyone again
+    point_changes = list(scorer.add_entry(entries[-1]).items())
+    point_changes += list(scorer.remove_entry(entries[0]).items())
+    entries[0].response = 2
+    point_changes += list(scorer.add_entry(entries[0]).items())
+    for entry_index, point_change in point_changes:
+        points[entry_index] += point_change
+    for entry_points, pos, key, entry in rank_by_keys([(get_key(entry), entry) 
+        for entry in entries]):
+        assert(points[entry.index] == entry_points)
 
 
 def test_teams():
@@ -63,6 +376,280 @@ def test_drivers():
     assert(len(drivers.list_all_drivers()) == 21)
     assert(len(drivers.list_drivers_that_started_season()) == 20)
 
+    erdmann = Driver(first_name="Jesse", last_name="Erdmann", team_name="Erdxotic Racing", started_season="no")
+    drivers.add_driver(erdmann)
+    assert(drivers.get_driver_by_short_name(erdmann.name) is not None)
+    assert(drivers.get_driver_by_entry_rep(erdmann.entry_rep) is not None)
+    assert(len(drivers.get_driver_by_name(first_name="Jesse", last_name="Erdmann", team_name="Erdxotic Racing")) == 2)
+    assert('Erdxotic Racing' in drivers.list_teams())
+
+    # Replacing a driver in place rebuilds the indexes too
+    replacement = Driver(first_name="Nyck", last_name="de Vries", team_name="Erdxotic Racing", started_season="no")
+    drivers.driver_list[drivers.driver_list.index(erdmann)] = replacement
+    assert(drivers.get_driver_by_short_name(erdmann.name) is not None)
+    assert(drivers.get_driver_by_short_name(replacement.name) is replacement)
+    assert(len(drivers.get_driver_by_name(first_name="Jesse", last_name="Erdmann")) == 1)
+
+
+def test_race_calendar():
+    race_list = []
+    for day, name in [("07/10/2022", "Austria"), ("03/20/2022", "Bahrain"), 
+        ("07/03/2022", "Britain"), ("03/27/2022", "Saudi Arabia")]:
+        race_list.append(Race(datetime=datetime.strptime(day, "%m/%d/%Y"), 
+            type="Race", name=name, circuit=name, laps=50, fancy_name=name, 
+            map_link=""))
+    calendar = RaceCalendar(race_list)
+    assert([race.name for race in calendar.sorted_races] == ["Bahrain", "Saudi Arabia", "Britain", "Austria"])
+    assert(calendar.races_by_name["Britain"].circuit == "Britain")
+    assert(calendar.races_by_text_rep[race_list[0].text_rep] is race_list[0])
+    assert(calendar.races_by_date[datetime(2022, 3, 20).date()].name == "Bahrain")
+
+    britain = datetime(2022, 7, 3)
+    assert([race.name for race in calendar.races_before(britain)] == ["Bahrain", "Saudi Arabia"])
+    assert([race.name for race in calendar.races_after(britain)] == ["Austria"])
+    assert([race.name for race in calendar.races_between(datetime(2022, 3, 27), britain)] == ["Saudi Arabia"])
+    assert(calendar.races_between(datetime(2022, 8, 1), datetime(2022, 9, 1)) == [])
+
+
+def test_races_calendar_changes(tmp_path):
+    data_dir = str(tmp_path)
+    write_season(data_dir, [])
+    races = Races(data_dir=data_dir)
+    assert([race.name for race in races.list_races()] == ['Bahrain', 'Saudi Arabia'])
+
+    # Swapping a race in place is noticed though the length is the same
+    bahrain = races.get_race_by_name('Bahrain')
+    races.race_list[races.race_list.index(bahrain)] = Race(
+        datetime=datetime(2022, 4, 10), type="Regular", name="Australia", 
+        circuit="Melbourne", laps=58, fancy_name="Australian GP", map_link="")
+    assert([race.name for race in races.list_races()] == ['Saudi Arabia', 'Australia'])
+    assert(races.get_race_by_name('Bahrain') is None)
+
+
+def test_compile_results_header():
+    drivers = Drivers(data_dir='test_data')
+    header_names = ['Race', 'Driver of the Day', 'Retirements', 'Safety Cars', 'Fastest Lap Winner']
+    for driver in drivers.list_all_drivers():
+        header_names += [f"{driver.name} {column}" for column in ['Class', 'QPos', 'Laps']]
+    header_row = dict(zip(header_names, range(0, len(header_names))))
+    (race_columns, driver_columns, max_idx) = compile_results_header(header_row, drivers)
+    assert(race_columns == (2, 3, 1, 4))
+    assert(max_idx == len(header_names) - 1)
+    row = [str(idx) for idx in range(0, len(header_names))]
+    (driver, get_driver_columns) = driver_columns[0]
+    assert(get_driver_columns(row) == (str(header_row[f"{driver.name} QPos"]), str(header_row[f"{driver.name} Laps"]), str(header_row[f"{driver.name} Class"])))
+
+    del header_row[f"{driver.name} Laps"]
+    with pytest.raises(Exception):
+        compile_results_header(header_row, drivers)
+
+
+def write_season(data_dir, result_rows):
+    with open(os.path.join(data_dir, 'races.csv'), 'w') as races_out:
+        races_out.write('Date,Type,GP,Circuit,Text Rep,Full Name,Laps,Map Link\n')
+        races_out.write('"March 20, 2022",Regular,Bahrain,Sakhir,,Bahrain GP,57,\n')
+        races_out.write('"March 27, 2022",Regular,Saudi Arabia,Jeddah,,Saudi GP,50,\n')
+    with open(os.path.join(data_dir, 'drivers.csv'), 'w') as drivers_out:
+        drivers_out.write('First Name,Last Name,Team,Text Rep,Short Text,Started Season\n')
+        drivers_out.write('Max,Verstappen,Red Bull Racing,,,yes\n')
+        drivers_out.write('Lewis,Hamilton,Mercedes,,,yes\n')
+    with open(os.path.join(data_dir, 'teams.csv'), 'w') as teams_out:
+        teams_out.write('Name,Points 2021\nMercedes,613.5\nRed Bull Racing,585.5\n')
+    with open(os.path.join(data_dir, 'race_results.csv'), 'w') as results_out:
+        results_out.write('Race,Driver of the Day,Retirements,Safety Cars,Fastest Lap Winner,'
+            '"Verstappen, Max Class","Verstappen, Max QPos","Verstappen, Max Laps",'
+            '"Hamilton, Lewis Class","Hamilton, Lewis QPos","Hamilton, Lewis Laps"\n')
+        for result_row in result_rows:
+            results_out.write(result_row + '\n')
+
+
+def read_season(data_dir):
+    drivers = Drivers(data_dir=data_dir)
+    teams = Teams(data_dir=data_dir)
+    races = Races(data_dir=data_dir)
+    races.read_results(drivers, teams, data_dir=data_dir, datetime=datetime(2022, 12, 1))
+    return (drivers, teams, races)
+
+
+def test_season_state(tmp_path):
+    data_dir = str(tmp_path)
+    bahrain = '03/20/2022: Bahrain @ Sakhir,"Hamilton, Lewis",1,2,"Verstappen, Max",1,1,57,2,2,57'
+    saudi = '03/27/2022: Saudi Arabia @ Jeddah,"Verstappen, Max",0,1,"Hamilton, Lewis",2,2,50,1,1,50'
+    write_season(data_dir, [bahrain])
+    read_season(data_dir)
+    with open(os.path.join(data_dir, 'season_state.json')) as state_in:
+        assert(len(json.loads(state_in.read())['row_hashes']) == 1)
+
+    # Only the new row is applied on top of the checkpoint
+    write_season(data_dir, [bahrain, saudi])
+    (drivers, teams, races) = read_season(data_dir)
+    max_verstappen = drivers.get_driver_by_short_name('Verstappen, Max')
+    assert(max_verstappen.points == 25 + 18 + 1)
+    assert(max_verstappen.wins == 1)
+    assert(len(max_verstappen.races) == 2)
+    assert(len(teams.get_team_by_name('Mercedes').race_results) == 2)
+    bahrain_race = races.get_race_by_name('Bahrain')
+    assert(bahrain_race.retirements == 1)
+    assert(races.get_standings_after(bahrain_race).get_position_of_subject(max_verstappen) == 1)
+    assert(len(races.get_standings_after(races.get_race_by_name('Saudi Arabia')).get_subjects_by_pos(1)) == 2)
+
+    mercedes = teams.get_team_by_name('Mercedes')
+    assert(mercedes.get_points() == 18 + 25 + 1)
+    assert(mercedes.races_entered == 2)
+    assert([points for race, points, points_so_far in mercedes.get_points_by_race()] == [18, 26])
+    assert(len(teams.get_points_table().get_subjects_by_pos(1)) == 2)
+
+    # A changed row no longer matches the checkpoint and is replayed in full
+    write_season(data_dir, [bahrain.replace(',1,1,57,2,2,57', ',2,1,57,1,2,57'), saudi])
+    (drivers, teams, races) = read_season(data_dir)
+    assert(drivers.get_driver_by_short_name('Verstappen, Max').points == 18 + 1 + 18)
+    assert(drivers.get_driver_by_short_name('Hamilton, Lewis').points == 25 + 25 + 1)
+    assert(teams.get_team_by_name('Mercedes').get_points() == 25 + 25 + 1)
+
+    # So is every row when a race in races.csv changes type
+    races_path = os.path.join(data_dir, 'races.csv')
+    with open(races_path) as races_in:
+        races_csv = races_in.read()
+    with open(races_path, 'w') as races_out:
+        races_out.write(races_csv.replace(',Regular,Bahrain,', ',Sprint,Bahrain,'))
+    (drivers, teams, races) = read_season(data_dir)
+    replayed = Drivers(data_dir=data_dir)
+    Races(data_dir=data_dir).read_results(replayed, Teams(data_dir=data_dir), 
+        data_dir=data_dir, datetime=datetime(2022, 12, 1), state_file_name=None)
+    for driver in drivers.list_all_drivers():
+        assert(driver.points == replayed.get_driver_by_short_name(driver.name).points)
+    assert(drivers.get_driver_by_short_name('Hamilton, Lewis').points != 25 + 25 + 1)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_season_results(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(season_results, 'numpy', None)
+    data_dir = str(tmp_path)
+    write_season(data_dir, ['03/20/2022: Bahrain @ Sakhir,"Hamilton, Lewis",1,2,"Verstappen, Max",1,1,57,2,2,56'])
+    (drivers, teams, races) = read_season(data_dir)
+    results = races.season_results
+    hamilton = drivers.get_driver_by_short_name('Hamilton, Lewis')
+    assert(list(hamilton.races.keys()) == ['Bahrain'])
+    assert(hamilton.races['Bahrain'].laps == 56)
+    assert(hamilton.races['Bahrain'].driver_of_the_day is True)
+    assert('Saudi Arabia' not in hamilton.races)
+    assert(list(results.get_race_column('classification', 'Bahrain')) == [2, 1])
+    assert(results.count_on_lead_lap(races.get_race_by_name('Bahrain')) == 1)
+    assert(results.count_on_lead_lap(races.get_race_by_name('Saudi Arabia')) == 0)
+    assert(results.count_by_driver('classification', 1, 1) == {'Hamilton, Lewis': 0, 'Verstappen, Max': 1})
+    assert(results.count_by_driver('qpos', 1, 10) == {'Hamilton, Lewis': hamilton.q3s, 'Verstappen, Max': 1})
+    assert(list(results.races_added) == [results.race_ids['Bahrain']])
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_championship_timeline(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(season_results, 'numpy', None)
+    data_dir = str(tmp_path)
+    # Level on points after Saudi Arabia, Verstappen ahead on wins
+    write_season(data_dir, ['03/20/2022: Bahrain @ Sakhir,"Hamilton, Lewis",1,2,"Hamilton, Lewis",1,1,57,2,2,57',
+        '03/27/2022: Saudi Arabia @ Jeddah,"Verstappen, Max",0,1,"Leclerc, Charles",4,2,50,2,1,50'])
+    (drivers, teams, races) = read_season(data_dir)
+    timeline = races.get_timeline()
+    assert([race.name for race in timeline.race_list] == ['Bahrain', 'Saudi Arabia'])
+    assert(timeline.get_points_after(0) == [19, 25])
+    assert(timeline.get_points_after(1) == [37, 37])
+    assert([driver.last_name for driver in timeline.get_drivers_at(1, 1)] == ['Verstappen'])
+    assert(timeline.get_first_race_held(1) == 0)
+    assert(timeline.get_first_race_held(2) == 0)
+    assert(timeline.get_race_index(races.get_race_by_name('Saudi Arabia')) == 1)
+    assert(races.get_standings_after(races.get_race_by_name('Bahrain')).get_subjects_by_pos(1)[0].subject.last_name == 'Verstappen')
+
+
+def test_subject_ids(tmp_path):
+    data_dir = str(tmp_path)
+    write_season(data_dir, [])
+    drivers, teams, races = read_season(data_dir)
+    subject_ids = SubjectIds()
+    subject_ids.add_subjects(drivers.list_all_drivers())
+    subject_ids.add_subjects(teams.list_all_teams())
+    subject_ids.add_subjects(races.list_races())
+    hamilton = drivers.get_driver_by_entry_rep('Lewis Hamilton, Mercedes')
+    bahrain = races.get_race_by_name('Bahrain')
+    assert(subject_ids.get_subject(hamilton.subject_id) is hamilton)
+    assert(subject_ids.get_id('Mercedes') == teams.team_dict['Mercedes'].subject_id)
+    assert(subject_ids.get_id(str(bahrain)) == bahrain.subject_id)
+    assert(subject_ids.get_id('Monaco') is None)
+    with pytest.raises(Exception):
+        subject_ids.add_subject(Driver('Lewis', 'Hamilton', 'Mercedes', 'yes'))
+
+    # Tables of numbered subjects join on the IDs answers were resolved to
+    table = Table('Retirements', 'Race', 'Retirements', int, sort=None)
+    for race in races.list_races():
+        table.add_subject(0, race)
+    picked = FakeEntry('Picked', [str(bahrain)])
+    picked.response_ids = [bahrain.subject_id]
+    unresolved = FakeEntry('Unresolved', [str(bahrain)])
+    table.add_entries(FakeEntries([picked, unresolved]), 'response')
+    assert(table.subjects[0].matching_entries == [picked])
+
+
+def test_snapshot(tmp_path):
+    data_dir = str(tmp_path)
+    write_season(data_dir, [])
+    snapshot_path = os.path.join(data_dir, 'model_snapshot.pickle')
+    file_names = ['drivers.csv', 'races.csv']
+    completed_races = ['03/20/2022: Bahrain @ Sakhir']
+    snapshot_key = get_snapshot_key(data_dir, file_names, completed_races)
+    assert(read_snapshot(snapshot_path, snapshot_key) is None)
+    write_snapshot(snapshot_path, snapshot_key, Drivers(data_dir=data_dir))
+    drivers = read_snapshot(snapshot_path, snapshot_key)
+    assert(drivers.get_driver_by_short_name('Hamilton, Lewis').team_name == 'Mercedes')
+
+    # Any change to an input file or another race being run invalidates it
+    assert(read_snapshot(snapshot_path, get_snapshot_key(data_dir, file_names, completed_races + ['03/27/2022: Saudi Arabia @ Jeddah'])) is None)
+    with open(os.path.join(data_dir, 'drivers.csv'), 'a') as drivers_out:
+        drivers_out.write('Nico,Hulkenberg,Aston Martin,,,no\n')
+    assert(read_snapshot(snapshot_path, get_snapshot_key(data_dir, file_names, completed_races)) is None)
+    assert(get_snapshot_key(data_dir, ['missing.csv'], completed_races) is None)
+
+
+def test_answer_key_snapshot(tmp_path):
+    data_dir = os.path.join(str(tmp_path), 'data')
+    shutil.copytree('data', data_dir)
+    snapshot_path = os.path.join(data_dir, 'model_snapshot.pickle')
+    first = AnswerKey(data_dir=data_dir, datetime=datetime(2022, 7, 1, 9, 0, 0))
+    written = os.stat(snapshot_path).st_mtime_ns
+
+    # A few seconds later, with no race in between, the snapshot is reused
+    second = AnswerKey(data_dir=data_dir, datetime=datetime(2022, 7, 1, 9, 0, 5))
+    assert(os.stat(snapshot_path).st_mtime_ns == written)
+    assert([(str(entry), entry.score) for entry in second.entries.list_entries()] ==
+        [(str(entry), entry.score) for entry in first.entries.list_entries()])
+
+    # After the next race it is rebuilt
+    AnswerKey(data_dir=data_dir, datetime=datetime(2022, 7, 5))
+    assert(os.stat(snapshot_path).st_mtime_ns != written)
+
+
+def test_mini_bingo(tmp_path):
+    data_dir = os.path.join(str(tmp_path), 'data')
+    shutil.copytree('data', data_dir)
+    ak = AnswerKey(data_dir=data_dir, datetime=datetime(2022, 7, 1),
+        snapshot_file_name=None, state_file_name=None)
+    bingo = [question for question in ak.questions if
+        question.short_name.endswith('Mini-Bingo')][0]
+    # The totals add up the points each question's table gave
+    for total_row in bingo.score.subjects:
+        assert(total_row.score == sum([row.value for table in bingo.answer
+            for row in table.subjects if row.subject is total_row.subject]))
+
+    with open(os.path.join(data_dir, 'scoring_single_answer.csv'), 'a') as answers_out:
+        answers_out.write('\nDoes Theo Pourchaire have a 2022 seat,Maybe')
+    with pytest.raises(Exception, match='expected TRUE or FALSE'):
+        AnswerKey(data_dir=data_dir, datetime=datetime(2022, 7, 1),
+            snapshot_file_name=None, state_file_name=None)
+
 
 def test_races():
     races = Races(data_dir='test_data')
@@ -87,7 +674,7 @@ def test_first_race():
     drivers = Drivers(data_dir='test_data')
     races = Races(data_dir='test_data')
     after_one_race_date = datetime.strptime("04/01/2021", "%m/%d/%Y")
-    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, 
+    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, state_file_name=None, 
         datetime=after_one_race_date)
 
     bahrain = races.get_race_by_name('Bahrain')
@@ -145,7 +732,7 @@ def test_seventh_race():
     drivers = Drivers(data_dir='test_data')
     races = Races(data_dir='test_data')
     after_seven_races_date = datetime.strptime("06/21/2021", "%m/%d/%Y")
-    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, 
+    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, state_file_name=None, 
         datetime=after_seven_races_date)
 
     team_standings = teams.get_points_table()
@@ -203,7 +790,7 @@ def test_final_race():
     drivers = Drivers(data_dir='test_data')
     races = Races(data_dir='test_data')
     after_all_races_date = datetime.strptime("12/13/2021", "%m/%d/%Y")
-    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, 
+    races.read_results(data_dir='test_data', drivers=drivers, teams=teams, state_file_name=None, 
         datetime=after_all_races_date)
 
     team_standings = teams.get_points_table()
@@ -258,7 +845,7 @@ def test_final_race():
 
 def test_answer_key():
     after_one_race_date = datetime.strptime("04/01/2021", "%m/%d/%Y")
-    ak = AnswerKey(data_dir='test_data', datetime=after_one_race_date)
+    ak = AnswerKey(data_dir='test_data', datetime=after_one_race_date, state_file_name=None)
     
     answer, score = ak.team_fourth()
     fourth_team = answer.get_subjects_by_pos(4)
@@ -437,7 +1024,7 @@ def test_answer_key():
     assert(first_pos[0].score == 25)
     assert(first_pos[0].value == 17)
 
-    score = ak.pourchaire_seat()
+    answer, score = ak.pourchaire_seat()
     ninth_pos = score.get_subjects_by_pos(9)
     assert(len(ninth_pos) == 1)
     assert(ninth_pos[0].subject.entry_name == 'Moksha Gren')
@@ -464,13 +1051,13 @@ def test_answer_key():
     assert(ninth_pos[0].score == 'TRUE')
     assert(ninth_pos[0].value == -3)
 
-    score = ak.all_20_finished()
+    answer, score = ak.all_20_finished()
     first_pos = score.get_subjects_by_pos(1)
     assert(len(first_pos) == 4)
     assert(first_pos[0].score == 'FALSE')
     assert(first_pos[0].value == 1)
 
-    score = ak.down_to_the_wire()
+    answer, score = ak.down_to_the_wire()
     ninth_pos = score.get_subjects_by_pos(9)
     assert(len(ninth_pos) == 1)
     assert(ninth_pos[0].subject.entry_name == 'Heidi')
@@ -485,11 +1072,291 @@ def test_answer_key():
     assert(first_pos[0].value == -3)
 
 
+def entry_header_and_row(drivers):
+    header_row = [header_start for attribute, header_start, parser in ENTRY_COLUMNS]
+    row = []
+    for attribute, header_start, parser in ENTRY_COLUMNS:
+        row.append('1' if parser is int else attribute)
+        if attribute == 'driver_podium_response':
+            row[-1] = 'Max Verstappen, Red Bull Racing, Lando Norris, McLaren'
+        if attribute.startswith('bingo_'):
+            row[-1] = 'TRUE'
+    for driver in drivers.list_drivers_that_started_season():
+        header_row.append(f"{FANTASY_HEADER} of {driver.first_name} {driver.last_name}")
+        row.append(driver.last_name)
+
+    # Reordered and extra columns still decode by header
+    header_row = ['Unused question'] + list(reversed(header_row))
+    row = ['unused'] + list(reversed(row))
+    return (header_row, row)
+
+
+def test_entry_decoder():
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    answers, fantasy_picks = EntryDecoder(header_row, drivers).decode(row)
+    assert(answers['entry_name'] == 'entry_name')
+    assert(answers['team_fifth_tiebreaker'] == 1)
+    assert(answers['driver_podium_response'] == ['Max Verstappen, Red Bull Racing', 'Lando Norris, McLaren'])
+    assert(answers['driver_six_after_six'] == ['driver_six_after_six'] * 6)
+    assert(fantasy_picks['Alonso'] == 'Alonso')
+
+    with pytest.raises(Exception):
+        EntryDecoder(header_row[:-1], drivers)
+
+
+def test_entry_store():
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    decoder = EntryDecoder(header_row, drivers)
+    verstappen = drivers.get_driver_by_entry_rep('Max Verstappen, Red Bull Racing')
+    norris = drivers.get_driver_by_entry_rep('Lando Norris, McLaren')
+
+    # Answers naming no subject are reported
+    subject_ids = SubjectIds()
+    subject_ids.add_subjects(drivers.list_all_drivers())
+    entry, unknown_responses = EntryStore(decoder, subject_ids).add_row(row)
+    assert(('team_fifth_response', 'team_fifth_response') in unknown_responses)
+    assert(('fantasy_Alonso', 'Alonso') in unknown_responses)
+    assert(('driver_podium_response', 'Lando Norris, McLaren') not in unknown_responses)
+    # and stored as -1, in place of an ID
+    assert(entry.get_response_ids('team_fifth_response') == -1)
+    assert(entry.get_response_ids('driver_podium_response') == [verstappen.subject_id, norris.subject_id])
+
+    store = EntryStore(decoder, subject_ids, add_unknown_answers=True)
+    entry, unknown_responses = store.add_row(row)
+    assert(unknown_responses == [])
+    assert(entry.entry_name == 'entry_name')
+    assert(entry.team_fifth_tiebreaker == 1)
+    assert(entry.driver_podium_response == ['Max Verstappen, Red Bull Racing', 'Lando Norris, McLaren'])
+    assert(entry.get_response_ids('driver_podium_response') == [verstappen.subject_id, norris.subject_id])
+    assert(entry.driver_six_after_six == ['driver_six_after_six'] * 6)
+    assert(entry.bingo_yuki_response == 'TRUE')
+    assert(entry.fantasy_picks['Alonso'] == 'Alonso')
+    assert(entry.get_response('fantasy_Alonso') == 'Alonso')
+    assert(not hasattr(entry, '__dict__'))
+    assert(not hasattr(entry, 'not_a_question'))
+
+    # A longer list of picks widens the matrix and a repeated name replaces
+    # the entry's answers
+    other_row = list(row)
+    other_row[row.index('entry_name')] = 'Other'
+    other_row[row.index('Max Verstappen, Red Bull Racing, Lando Norris, McLaren')] = \
+        'Lando Norris, McLaren, Max Verstappen, Red Bull Racing, Lewis Hamilton, Mercedes'
+    other, unknown_responses = store.add_row(other_row)
+    assert(store.pick_widths['driver_podium_response'] == 3)
+    assert(entry.get_response_ids('driver_podium_response') == [verstappen.subject_id, norris.subject_id])
+    assert(store.list_entries() == [other, entry])
+    row[row.index('1')] = '7'
+    assert(store.add_row(row)[0] is entry)
+    assert(len(store.entries) == 2)
+    assert(7 in [entry.get_response(attribute) for attribute in store.int_columns])
+
+    # Whole column scoring, with and without NumPy
+    for use_numpy in [True, False]:
+        if not use_numpy:
+            store.get_pick_matrix = lambda entry_var: None
+        points = {verstappen.subject_id: 5, norris.subject_id: 2}
+        assert(store.score_picks('driver_podium_response', points, missing_points=-3) == [7, 4])
+        assert(store.score_picks('driver_podium_response', [{verstappen.subject_id: 1}, {}, {}]) == [1, 0])
+        pick_masks = store.get_pick_masks('driver_podium_response')
+        assert(pick_masks.count(pick_masks.get_mask([norris.subject_id, 999])) == [1, 1])
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_pick_masks(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr('f1_quest.entries.numpy', None)
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    store = EntryStore(EntryDecoder(header_row, drivers), SubjectIds(), add_unknown_answers=True)
+    store.add_row(row)
+    other_row = list(row)
+    other_row[row.index('entry_name')] = 'Other'
+    other_row[row.index('Max Verstappen, Red Bull Racing, Lando Norris, McLaren')] = \
+        'Lando Norris, McLaren, Lewis Hamilton, Mercedes, Lewis Hamilton, Mercedes'
+    other_row[header_row.index('Yuki Tsunoda gets a podium')] = 'FALSE'
+    store.add_row(other_row)
+    verstappen = store.subject_ids.get_id('Max Verstappen, Red Bull Racing')
+    norris = store.subject_ids.get_id('Lando Norris, McLaren')
+    hamilton = store.subject_ids.get_id('Lewis Hamilton, Mercedes')
+
+    # Repeated picks set the same bit
+    pick_masks = store.get_pick_masks('driver_podium_response')
+    assert(pick_masks.count() == [2, 2])
+    assert(pick_masks.count(pick_masks.get_mask([verstappen, hamilton])) == [1, 1])
+    assert(pick_masks.score({norris: 5, hamilton: 5}, missing_points=-3) == [2, 10])
+
+    bool_masks = store.get_bool_masks(['bingo_yuki_response'])
+    assert(bool_masks.count(bool_masks.get_mask(['bingo_yuki_response'])) == [1, 0])
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_pick_counts(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr('f1_quest.entries.numpy', None)
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    store = EntryStore(EntryDecoder(header_row, drivers), SubjectIds(), add_unknown_answers=True)
+    store.add_row(row)
+    other_row = list(row)
+    other_row[row.index('entry_name')] = 'Other'
+    other_row[row.index('Max Verstappen, Red Bull Racing, Lando Norris, McLaren')] = \
+        'Lando Norris, McLaren, Lewis Hamilton, Mercedes, Lewis Hamilton, Mercedes'
+    store.add_row(other_row)
+    store.count_picks()
+    pick_counts = store.pick_counts
+    assert(pick_counts.get_count('driver_podium_response', 'Lando Norris, McLaren') == 2)
+    assert(pick_counts.get_count('driver_podium_response', 'Lewis Hamilton, Mercedes') == 1)
+    assert(pick_counts.get_count('bingo_yuki_response', 'TRUE') == 2)
+    assert(pick_counts.get_count('team_fifth_tiebreaker', 1) == 2)
+    assert(pick_counts.get_points_distribution('bingo_yuki_response', {1: 5, 0: -3}) == {5: 2})
+
+    # Adding and amending entries keeps the counts as counting again would
+    other_row[header_row.index('Yuki Tsunoda gets a podium')] = 'FALSE'
+    store.add_row(other_row)
+    third_row = list(row)
+    third_row[row.index('entry_name')] = 'Third'
+    store.add_row(third_row)
+    assert(pick_counts.get_count('bingo_yuki_response', 'FALSE') == 1)
+    assert(pick_counts.counts == PickCounts(store).counts)
+    export = pick_counts.to_dict({'bingo_yuki_response': ({1: 5, 0: -3}, 0)})
+    assert(export['bingo_yuki_response'] == {'answers': [
+        {'answer': 'TRUE', 'count': 2, 'points': 5}, 
+        {'answer': 'FALSE', 'count': 1, 'points': -3}], 
+        'points': {'-3': 1, '5': 2}})
+
+
+class FakeAnswerKey():
+    def __init__(self, entries, drivers, entry_scorers):
+        self.entries = entries
+        self.drivers = drivers
+        self.subject_ids = entries.store.subject_ids
+        self.entry_scorers = entry_scorers
+
+
+def test_entry_submissions(tmp_path):
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    headers = {attribute: header_start for attribute, header_start, parser in 
+        ENTRY_COLUMNS}
+    podium_idx = header_row.index(headers['driver_podium_response'])
+    tie_breaker_idx = header_row.index(headers['team_fifth_tiebreaker'])
+    yuki_idx = header_row.index(headers['bingo_yuki_response'])
+    with open(os.path.join(tmp_path, 'entries.csv'), 'w', newline='') as entries_out:
+        csv.writer(entries_out).writerows([header_row, row])
+    entries = Entries(drivers, data_dir=str(tmp_path))
+    entry = entries.get_entry_by_name('entry_name')
+    verstappen = entries.store.subject_ids.get_id('Max Verstappen, Red Bull Racing')
+    entry_scorers = [
+        PickScorer('driver_podium_response', {verstappen: 5}, missing_points=-3),
+        BingoScorer({'bingo_yuki_response': 'FALSE'}),
+        RankScorer(lambda entry: (abs(entry.team_fifth_tiebreaker - 3),), F1_POINTS)]
+    # Scored as the AnswerKey would have: 5 - 3 for picks, -3 for bingo, 
+    # first of one entry
+    entry.add_points(24)
+    submissions = EntrySubmissions(FakeAnswerKey(entries, drivers, entry_scorers), 
+        data_dir=str(tmp_path))
+
+    # A closer guess takes first place from the entry already in the league
+    other_row = list(row)
+    other_row[row.index('entry_name')] = 'Other'
+    other_row[podium_idx] = 'Lando Norris, McLaren, Max Verstappen, Red Bull Racing, Lewis Hamilton, Mercedes'
+    other_row[tie_breaker_idx] = '3'
+    other_row[yuki_idx] = 'FALSE'
+    submissions_path = os.path.join(tmp_path, 'submissions.csv')
+    with open(submissions_path, 'w', newline='') as submissions_out:
+        csv.writer(submissions_out).writerows([header_row, other_row])
+    submitted, rejected = submissions.poll()
+    other = entries.get_entry_by_name('Other')
+    assert(submitted == [(other, 1)])
+    assert(other.score == 25 - 1 + 1)
+    assert(entry.score == 24 - 7)
+    assert(other.subject_id is not None)
+    assert(entries.store.pick_counts.get_count('bingo_yuki_response', 'FALSE') == 1)
+
+    # Rows are only read once complete, amending an entry re-scores it and 
+    # unreadable rows are rejected
+    other_row[tie_breaker_idx] = '9'
+    bad_row = list(row)
+    bad_row[row.index('entry_name')] = 'Bad'
+    bad_row[yuki_idx] = 'MAYBE'
+    lines = io.StringIO()
+    csv.writer(lines).writerow(other_row)
+    partial_length = len(lines.getvalue()) - 1
+    csv.writer(lines).writerow(bad_row)
+    with open(submissions_path, 'a', newline='') as submissions_out:
+        submissions_out.write(lines.getvalue()[:partial_length])
+    assert(submissions.poll() == ([], []))
+    with open(submissions_path, 'a', newline='') as submissions_out:
+        submissions_out.write(lines.getvalue()[partial_length:])
+    submitted, rejected = submissions.poll()
+    assert(submitted == [(other, 2)])
+    assert(other.score == 18 - 1 + 1)
+    assert(entry.score == 24)
+    assert(entries.store.pick_counts.get_count('team_fifth_tiebreaker', 3) == 0)
+    assert(len(rejected) == 1 and 'MAYBE' in rejected[0][1])
+    assert(entries.get_entry_by_name('Bad') is None)
+
+
+def test_entries_in_batches(tmp_path):
+    drivers = Drivers(data_dir='test_data')
+    header_row, row = entry_header_and_row(drivers)
+    name_idx = row.index('entry_name')
+    podium_idx = row.index('Max Verstappen, Red Bull Racing, Lando Norris, McLaren')
+    rows = []
+    for entry_number in range(7):
+        entry_row = list(row)
+        entry_row[name_idx] = f"Entry {entry_number % 5}"
+        if entry_number == 6:
+            entry_row[podium_idx] = 'Lando Norris, McLaren, Lewis Hamilton, Mercedes, Max Verstappen, Red Bull Racing'
+        rows.append(entry_row)
+    # A quoted line break doesn't end a row when the file is split for workers
+    rows[3][name_idx] = 'Entry "3"\nsecond line'
+    with open(os.path.join(tmp_path, 'entries.csv'), 'w', newline='') as entries_out:
+        csv.writer(entries_out).writerows([header_row] + rows)
+
+    # Batches decoded in worker processes are added in file order, later 
+    # rows replace entries with the same name
+    progress = []
+    serial = Entries(drivers, data_dir=str(tmp_path), batch_size=2)
+    pooled = Entries(drivers, data_dir=str(tmp_path), batch_size=2, workers=2, 
+        progress_callback=lambda read_progress: progress.append(read_progress.rows))
+    assert(progress == [2, 4, 6, 7])
+    assert(len(pooled.list_entries()) == 5)
+    for serial_entry, pooled_entry in zip(serial.list_entries(), pooled.list_entries()):
+        assert(serial_entry.entry_name == pooled_entry.entry_name)
+        assert(serial_entry.driver_podium_response == pooled_entry.driver_podium_response)
+        assert(serial_entry.fantasy_picks == pooled_entry.fantasy_picks)
+    assert(len(pooled.get_entry_by_name('Entry 1').driver_podium_response) == 3)
+    assert(len(pooled.get_entry_by_name('Entry 2').driver_podium_response) == 2)
+    assert(pooled.get_entry_by_name('Entry "3"\nsecond line') is not None)
+    assert(pooled.get_entry_by_name('Entry 1').url_name == 'Entry_1')
+    assert(pooled.store.url_names == [entry.url_name for entry in serial.store.entries])
+
+    with open(os.path.join(tmp_path, 'entries.csv'), 'rb') as entries_in:
+        header_length = len(read_row_bytes(entries_in))
+        ranges = list(read_row_ranges(entries_in, 3))
+    assert([row_count for start, end, row_count in ranges] == [3, 3, 1])
+    assert(ranges[0][0] == header_length)
+    assert(ranges[1][0] == ranges[0][1])
+
+    subject_ids = SubjectIds()
+    subject_ids.add_subjects(drivers.list_all_drivers())
+    with pytest.raises(Exception, match='team_fifth_response'):
+        Entries(drivers, data_dir=str(tmp_path), subject_ids=subject_ids, 
+            batch_size=2, workers=2)
+
+
 def test_entries():
     entries = Entries(data_dir='test_data')
-    assert(len(entries.entries) == 9)
-    assert('Jesse' in entries.entries)
-    jesse = entries.entries['Jesse']
+    assert(len(entries.list_entries()) == 9)
+    jesse = entries.get_entry_by_name('Jesse')
+    assert(jesse is not None)
     assert(jesse.bingo_russell_response == 'TRUE')
     assert('Max Verstappen, Red Bull Racing' in jesse.driver_podium_response)
     assert('Lando Norris, McLaren' in jesse.driver_podium_response)
@@ -502,9 +1369,39 @@ def test_entries():
     assert('Charles LeClerc, Ferrari' in jesse.driver_pick_two_response)
 
 
+def test_render_after_submissions(tmp_path):
+    data_dir = os.path.join(str(tmp_path), 'data')
+    shutil.copytree('data', data_dir)
+    with open(os.path.join(data_dir, 'entries.csv'), newline='') as entries_in:
+        header_row, row = list(csv.reader(entries_in))[0:2]
+    row[1] = 'Late Entry'
+    scoring_date = datetime(2022, 7, 1)
+    ak = AnswerKey(data_dir=data_dir, datetime=scoring_date, 
+        snapshot_file_name=None, state_file_name=None)
+    submissions = EntrySubmissions(ak, data_dir=data_dir)
+    with open(os.path.join(data_dir, 'submissions.csv'), 'w', newline='') as submissions_out:
+        csv.writer(submissions_out).writerows([header_row, row])
+    submitted, rejected = submissions.poll()
+    assert(len(submitted) == 1 and len(rejected) == 0)
+
+    # Rendering reads the submissions too, and a new watcher carries on 
+    # after the rows the answer key applied
+    output_dir = os.path.join(str(tmp_path), 'docs')
+    render_static_pages(data_dir=data_dir, datetime=scoring_date, 
+        output_dir=output_dir, state_file_name=None)
+    assert(os.path.isfile(os.path.join(output_dir, 'entries', 'Late_Entry.html')))
+    with open(os.path.join(output_dir, 'index.html')) as index_in:
+        assert('Late Entry' in index_in.read())
+    ak = AnswerKey(data_dir=data_dir, datetime=scoring_date, 
+        snapshot_file_name=None, state_file_name=None)
+    late_entry = ak.entries.get_entry_by_name('Late Entry')
+    assert(late_entry.score == submitted[0][0].score)
+    assert(EntrySubmissions(ak, data_dir=data_dir).poll() == ([], []))
+
+
 def test_render():
     after_one_race_date = datetime.strptime("04/01/2021", "%m/%d/%Y")
-    render_static_pages(output_dir="test_data/out", data_dir="test_data/", datetime=after_one_race_date)
+    render_static_pages(output_dir="test_data/out", data_dir="test_data/", datetime=after_one_race_date, state_file_name=None)
     assert(os.path.isdir("test_data/out"))
     assert(os.path.isfile("test_data/out/index.html"))
     assert(os.path.isdir("test_data/out/drivers"))
@@ -513,4 +1410,6 @@ def test_render():
     assert(os.path.isdir("test_data/out/results"))
     assert(os.path.isdir("test_data/out/teams"))
     assert(os.path.isfile("test_data/out/drivers/Carlos_Sainz_Ferrari.html"))
+    assert(os.path.isfile("test_data/out/standings/page_1.html"))
+    assert(os.path.isfile("test_data/out/movers.json"))
     shutil.rmtree("test_data/out")
\ No newline at end of file